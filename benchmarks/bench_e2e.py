@@ -0,0 +1,193 @@
+"""
+Benchmark end-to-end: parsing scrape_data, transform_data dan setiap sink load_*
+pada data sintetis (benchmarks.synthetic) di beberapa skala, 10 ribu s.d. 10 juta baris.
+
+Hasil disimpan sebagai JSON (commit, versi Python, detik dan baris/detik per
+tahap per skala) agar regresi bisa dibandingkan antar commit:
+    python -m benchmarks.bench_e2e --scales 10k,100k,1M
+    python -m benchmarks.bench_e2e --scales 10k,100k,1M --compare benchmarks/results/<run-sebelumnya>.json
+
+Tanpa --dsn sink PostgreSQL diukur terhadap SQLite lokal (metode to_sql);
+sink Google Sheets memakai service stub di memori, sehingga yang diukur adalah
+biaya konversi, diff snapshot dan ukuran payload, bukan jaringan.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+from benchmarks.synthetic import synthetic_pages, write_scrape_csv
+from utils.extract import DEFAULT_PARSER, extract_page_records
+from utils.load import configure_engine, dispose_engine, load_to_csv, load_to_postgresql, sheet_values
+from utils.sheets import SheetsWriter
+from utils.storage import TRANSFORMED_DTYPES, read_frame
+from utils.transform import DEFAULT_CHUNKSIZE, transform_data
+
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+TABLE_NAME = 'bench_fashion_products'
+# Di atas batas ini transform_data dijalankan per chunk agar 10 juta baris muat di memori
+IN_MEMORY_ROW_LIMIT = 2_000_000
+SCALE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+def parse_scale(text):
+    """'10k' -> 10000, '1M' -> 1000000, '2500' -> 2500."""
+    text = text.strip().lower().replace('_', '')
+    multiplier = SCALE_SUFFIXES.get(text[-1:], 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class PayloadSheetsService:
+    """Service Sheets stub: tidak mengirim apa pun, hanya menghitung request dan byte JSON payload."""
+
+    def __init__(self):
+        self.requests = 0
+        self.payload_bytes = 0
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def _call(self, body):
+        self.requests += 1
+        self.payload_bytes += len(json.dumps(body, default=str))
+        return self
+
+    def batchUpdate(self, spreadsheetId, body):
+        return self._call(body)
+
+    def batchClear(self, spreadsheetId, body):
+        return self._call(body)
+
+    def execute(self):
+        return {}
+
+def timed(stage, rows, func, **details):
+    """Jalankan func tanpa output print-nya dan kembalikan satu record hasil."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        ok = func()
+        seconds = time.perf_counter() - start
+    if ok is False:
+        raise RuntimeError(f"Tahap {stage} gagal")
+    return {'stage': stage, 'rows': rows, 'seconds': round(seconds, 4),
+            'rows_per_second': round(rows / seconds) if seconds else None, **details}
+
+def bench_parse(rows, parser):
+    pages = list(synthetic_pages(rows))
+    parsed = []
+    result = timed('parse', 0, lambda: parsed.extend(extract_page_records(page, parser) for page in pages),
+                   pages=len(pages), parser=parser)
+    result['rows'] = sum(len(records) for records in parsed)
+    result['rows_per_second'] = round(result['rows'] / result['seconds']) if result['seconds'] else None
+    return result
+
+def bench_sheets(transformed_file, max_rows, snapshot_file):
+    df = read_frame(transformed_file, TRANSFORMED_DTYPES).head(max_rows)
+    results = []
+    for stage in ('load_to_google_sheets', 'load_to_google_sheets_unchanged'):
+        service = PayloadSheetsService()
+        writer = SheetsWriter(service, 'bench', 'Sheet1', snapshot_file=snapshot_file)
+        result = timed(stage, len(df), lambda: writer.write(sheet_values(df)) and True)
+        result.update(requests=service.requests, payload_bytes=service.payload_bytes)
+        results.append(result)
+    return results
+
+def bench_scale(rows, args, work_dir):
+    raw_file = os.path.join(work_dir, 'scrapped_data.csv')
+    transformed_file = os.path.join(work_dir, 'transformed.csv')
+    chunksize = args.chunksize or (DEFAULT_CHUNKSIZE if rows > IN_MEMORY_ROW_LIMIT else None)
+
+    results = [bench_parse(min(rows, args.max_parse_rows), args.parser)]
+    results.append(timed('generate_raw_csv', rows, lambda: write_scrape_csv(raw_file, rows, seed=args.seed) and True))
+    results.append(timed('transform_data', rows,
+                         lambda: transform_data(raw_file, transformed_file, chunksize=chunksize),
+                         chunksize=chunksize))
+
+    with open(transformed_file, encoding='utf-8') as f:
+        transformed_rows = sum(1 for _ in f) - 1
+    results.append(timed('load_to_csv', transformed_rows,
+                         lambda: load_to_csv(transformed_file, os.path.join(work_dir, 'products.csv'))))
+
+    configure_engine(args.dsn or f"sqlite:///{os.path.join(work_dir, 'bench.sqlite')}")
+    try:
+        results.append(timed('load_to_postgresql', transformed_rows,
+                             lambda: load_to_postgresql(transformed_file, TABLE_NAME, method=args.pg_method),
+                             method=args.pg_method, database='postgresql' if args.dsn else 'sqlite'))
+    finally:
+        dispose_engine()
+
+    results.extend(bench_sheets(transformed_file, args.max_sheets_rows,
+                                os.path.join(work_dir, 'sheets_snapshot.json')))
+    for result in results:
+        result['scale'] = rows
+    return results
+
+def compare(results, baseline_file):
+    with open(baseline_file, encoding='utf-8') as f:
+        baseline = {(r['scale'], r['stage']): r['seconds'] for r in json.load(f)['results']}
+    print(f"\nPerbandingan dengan {baseline_file} (>1.00x berarti lebih lambat):")
+    for result in results:
+        before = baseline.get((result['scale'], result['stage']))
+        if before:
+            print(f"{result['scale']:>10} {result['stage']:<34} {before:8.3f} s -> {result['seconds']:8.3f} s "
+                  f"({result['seconds'] / before:.2f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='10k,100k,1M', help='jumlah baris dipisah koma, mis. 10k,1M,10M')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--parser', default=DEFAULT_PARSER, help='backend parser HTML untuk tahap parse')
+    parser.add_argument('--max-parse-rows', type=int, default=20_000,
+                        help='batas produk yang di-parse dari HTML per skala (parsing jauh lebih lambat)')
+    parser.add_argument('--max-sheets-rows', type=int, default=100_000,
+                        help='batas baris sink Google Sheets (satu spreadsheet maksimal 10 juta sel)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help=f'chunksize transform_data (default: otomatis di atas {IN_MEMORY_ROW_LIMIT} baris)')
+    parser.add_argument('--dsn', default=None, help='URL SQLAlchemy PostgreSQL (default: SQLite sementara)')
+    parser.add_argument('--pg-method', default=None, choices=['copy', 'upsert', 'to_sql'],
+                        help='metode load_to_postgresql (default: copy dengan --dsn, to_sql tanpa)')
+    parser.add_argument('--output', default=None, help=f'file JSON hasil (default: di {RESULTS_DIR}/)')
+    parser.add_argument('--compare', default=None, help='file JSON hasil run sebelumnya sebagai pembanding')
+    args = parser.parse_args()
+    args.pg_method = args.pg_method or ('copy' if args.dsn else 'to_sql')
+
+    commit = git_commit()
+    results = []
+    for rows in map(parse_scale, args.scales.split(',')):
+        with tempfile.TemporaryDirectory() as work_dir:
+            for result in bench_scale(rows, args, work_dir):
+                results.append(result)
+                print(f"{rows:>10} {result['stage']:<34} {result['seconds']:8.3f} s "
+                      f"({result['rows_per_second'] or 0:>12,} baris/detik)")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit or 'nogit'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'commit': commit,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'results': results,
+        }, f, indent=2)
+    print(f"\nHasil disimpan ke {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
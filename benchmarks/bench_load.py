@@ -0,0 +1,73 @@
+"""
+Load test jalur extract (scrape_data) terhadap server stub lokal, tanpa jaringan.
+
+Server stub bisa diberi latensi, error acak dan respons 429 (lihat
+benchmarks.stub_server); scrape_data dijalankan dengan HttpClient, RetryPolicy
+dan worker paralel seperti di produksi. Dilaporkan throughput fetch dan
+latensi per halaman (p50/p95/p99/max, termasuk retry dan backoff).
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_load --pages 500 --workers 16 --latency 0.05 --jitter 0.2 \\
+        --error-rate 0.02 --rate-limit-rate 0.02
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.stub_server import base_url, serve_stub
+from utils.extract import scrape_data
+from utils.http_client import HttpClient
+from utils.metrics import get_registry
+from utils.rate_limit import RetryPolicy
+
+def percentile(values, q):
+    """Persentil q (0-100) dengan nearest-rank; None jika values kosong."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.05, help='latensi tetap per request (detik)')
+    parser.add_argument('--jitter', type=float, default=0.1, help='latensi tambahan acak maksimum (detik)')
+    parser.add_argument('--error-rate', type=float, default=0.01, help='fraksi request yang dijawab 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.01, help='fraksi request yang dijawab 429')
+    parser.add_argument('--max-rps', type=float, default=None, help='batas request per detik server')
+    parser.add_argument('--max-retries', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    metrics = get_registry()
+    metrics.reset()
+    # Retry-After 0 agar 429 dari stub tidak membuat load test menunggu satu detik penuh
+    with serve_stub(page_count=args.pages, latency=args.latency, latency_jitter=args.jitter,
+                    error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, max_rps=args.max_rps,
+                    retry_after=0, seed=args.seed) as server:
+        with HttpClient(pool_maxsize=args.workers) as client, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            data = scrape_data(base_url(server), delay=0, max_pages=args.pages, max_workers=args.workers,
+                               client=client, retry=RetryPolicy(max_retries=args.max_retries, backoff_base=0.05),
+                               skip_failed_pages=True)
+            elapsed = time.perf_counter() - start
+        server_stats = server.stats()
+
+    pages = metrics.snapshot()['pages']
+    latencies = [page['fetch_seconds'] for page in pages if 'fetch_seconds' in page]
+    ok_pages = sum(1 for page in pages if page.get('result') == 'ok')
+
+    print(f"Halaman: {ok_pages}/{args.pages} berhasil, produk: {len(data) if data is not None else 0}, "
+          f"{args.workers} worker")
+    print(f"Durasi    : {elapsed:.2f} s ({ok_pages / elapsed:.1f} halaman/detik, "
+          f"{server_stats['requests'] / elapsed:.1f} request/detik)")
+    print("Latensi halaman (termasuk retry): " + ', '.join(
+        f"p{q} {percentile(latencies, q) * 1000:.0f} ms" for q in (50, 95, 99)) +
+          f", max {max(latencies) * 1000:.0f} ms")
+    print(f"Respons server: {server_stats['requests']} request, status {dict(sorted(server_stats['statuses'].items()))}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Micro-benchmark backend parser HTML untuk scrape_data.
+
+Secara default memakai halaman katalog dari server stub; berikan --html untuk
+memakai halaman asli yang sudah disimpan, misalnya:
+    curl -s https://fashion-studio.dicoding.dev/ > page1.html
+    python -m benchmarks.bench_parse --html page1.html
+"""
+import argparse
+import timeit
+
+from utils.sample_catalog import render_page
+from utils.extract import PARSER_BACKENDS, extract_fashion_data, parse_collection_cards
+
+def extract_records(content, parser):
+    records = [extract_fashion_data(card) for card in parse_collection_cards(content, parser)]
+    return [{k: v for k, v in record.items() if k != 'Timestamp'} for record in records if record]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--html', help='file HTML halaman katalog (default: halaman stub)')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    if args.html:
+        with open(args.html, 'rb') as f:
+            content = f.read()
+    else:
+        content = render_page(1)
+
+    reference = extract_records(content, 'html.parser')
+    assert reference, "Halaman tidak berisi collection-card"
+
+    print(f"{len(content)} byte, {len(reference)} produk, {args.repeat} ulangan")
+    baseline = None
+    for backend in PARSER_BACKENDS:
+        assert extract_records(content, backend) == reference, f"Backend {backend} menghasilkan record berbeda"
+        elapsed = timeit.timeit(lambda: extract_records(content, backend), number=args.repeat) / args.repeat
+        baseline = baseline or elapsed
+        print(f"{backend:<14}: {elapsed * 1000:7.2f} ms/halaman ({baseline / elapsed:.1f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark scrape_data serial vs paralel terhadap server stub lokal.
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_scrape --pages 50 --latency 0.05 --workers 8 --parse-workers 4
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.stub_server import run_stub_server
+from utils.extract import scrape_data
+
+def timed_scrape(base_url, pages, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = scrape_data(base_url, delay=0, max_pages=pages, **kwargs)
+    return time.perf_counter() - start, data
+
+def without_timestamp(records):
+    return [{k: v for k, v in record.items() if k != 'Timestamp'} for record in records]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05, help='latensi buatan per request (detik)')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--parse-workers', type=int, default=None, help='jumlah proses parser (default: jumlah CPU)')
+    args = parser.parse_args()
+
+    with run_stub_server(page_count=args.pages, latency=args.latency) as base_url:
+        serial_time, serial_data = timed_scrape(base_url, args.pages)
+        concurrent_time, concurrent_data = timed_scrape(base_url, args.pages, max_workers=args.workers)
+        pooled_time, pooled_data = timed_scrape(base_url, args.pages, max_workers=args.workers,
+                                                process_pool=True, parse_workers=args.parse_workers)
+
+    assert without_timestamp(serial_data) == without_timestamp(concurrent_data), "Hasil paralel berbeda dari serial"
+    assert without_timestamp(serial_data) == without_timestamp(pooled_data), "Hasil process pool berbeda dari serial"
+
+    print(f"Halaman: {args.pages}, latensi: {args.latency * 1000:.0f} ms, produk: {len(serial_data)}")
+    print(f"Serial            : {serial_time:.2f} s")
+    print(f"Paralel ({args.workers} worker): {concurrent_time:.2f} s")
+    print(f"+ process pool    : {pooled_time:.2f} s")
+    print(f"Speedup           : {serial_time / concurrent_time:.1f}x (paralel), {serial_time / pooled_time:.1f}x (+ process pool)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark format data perantara: CSV vs Parquet vs Feather (Arrow IPC).
+
+Mengukur ukuran file, waktu tulis dan waktu baca data hasil transformasi
+(termasuk konversi ke skema bertipe untuk CSV).
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_storage --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import synthetic_scrape
+from utils.storage import TRANSFORMED_DTYPES, apply_dtypes, read_frame, write_frame
+from utils.transform import transform_dataframe
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    data = apply_dtypes(transform_dataframe(synthetic_scrape(args.rows)), TRANSFORMED_DTYPES)
+    print(f"Baris hasil transformasi: {len(data)}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for extension in ('csv', 'parquet', 'feather'):
+            path = os.path.join(tmp_dir, f'transformed.{extension}')
+
+            start = time.perf_counter()
+            write_frame(data, path, TRANSFORMED_DTYPES)
+            write_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            # CSV tidak membawa skema: dtype harus ditebak lalu dikonversi ulang
+            apply_dtypes(read_frame(path, TRANSFORMED_DTYPES), TRANSFORMED_DTYPES)
+            read_time = time.perf_counter() - start
+
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"{extension:<8}: {size_mb:7.1f} MB, tulis {write_time:.2f} s, baca {read_time:.2f} s")
+
+if __name__ == '__main__':
+    main()
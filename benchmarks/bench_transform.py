@@ -0,0 +1,44 @@
+"""
+Benchmark pembersihan data: apply baris-per-baris (reference) vs vectorized vs memoized
+(fungsi skalar sekali per nilai mentah berbeda).
+
+Jalankan dari root proyek:
+    python -m benchmarks.bench_transform --rows 1000000
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_scrape
+from utils.transform import clean_dataframe, clear_memo, print_memo_stats
+
+def timed(method, raw):
+    start = time.perf_counter()
+    result = clean_dataframe(raw, method=method)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    raw = synthetic_scrape(args.rows)
+    reference_time, reference = timed('reference', raw)
+    vectorized_time, vectorized = timed('vectorized', raw)
+    clear_memo()
+    memoized_time, memoized = timed('memoized', raw)
+
+    pd.testing.assert_frame_equal(vectorized, reference)
+    pd.testing.assert_frame_equal(memoized, reference)
+
+    print(f"Baris: {args.rows}, lolos pembersihan: {len(vectorized)}")
+    print(f"Reference (apply): {reference_time:.2f} s")
+    print(f"Vectorized       : {vectorized_time:.2f} s")
+    print(f"Memoized         : {memoized_time:.2f} s")
+    print(f"Speedup          : vectorized {reference_time / vectorized_time:.1f}x, "
+          f"memoized {reference_time / memoized_time:.1f}x")
+    print_memo_stats()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Server HTTP lokal yang meniru katalog fashion-studio.dicoding.dev untuk benchmark
+dan load test offline: halaman collection-card di / dan /pageN, dengan latensi,
+error acak, respons 429 (Retry-After) dan ETag yang bisa diatur.
+
+Jalankan terpisah dari root proyek:
+    python -m benchmarks.stub_server --port 8000 --pages 500 --latency 0.05 --error-rate 0.01
+"""
+import argparse
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.sample_catalog import render_page
+
+def parse_page_number(path):
+    """'/' -> 1, '/page7' -> 7, selain itu None."""
+    path = path.split('?', 1)[0].rstrip('/')
+    if path == '':
+        return 1
+    if path.startswith('/page') and path[5:].isdigit():
+        return int(path[5:])
+    return None
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.request_latency())
+        page_number = parse_page_number(self.path)
+        if page_number is None:
+            self._send_status(404)
+            return
+
+        fault = server.fault()
+        if fault == 429:
+            self._send_status(429, {'Retry-After': str(server.retry_after)})
+            return
+        if fault is not None:
+            self._send_status(fault)
+            return
+
+        body = server.render(page_number)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if server.etag and self.headers.get('If-None-Match') == etag:
+            self._send_status(304, {'ETag': etag})
+            return
+        headers = {'Content-Type': 'text/html; charset=utf-8', 'Content-Length': str(len(body))}
+        if server.etag:
+            headers['ETag'] = etag
+        self._send(200, headers, body)
+
+    def _send_status(self, status, headers=None):
+        body = b'' if status == 304 else f'{status} {self.responses[status][0]}'.encode('utf-8')
+        self._send(status, {**(headers or {}), 'Content-Length': str(len(body))}, body)
+
+    def _send(self, status, headers, body):
+        self.server.count(status)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Katalog stub dengan perilaku server yang bisa diatur untuk load test.
+
+    Args:
+        address: (host, port); port 0 memilih port bebas
+        page_count: Jumlah halaman katalog
+        products_per_page: Jumlah produk per halaman
+        latency: Latensi tetap per request (detik)
+        latency_jitter: Latensi tambahan acak 0..latency_jitter detik per request
+        error_rate: Fraksi request yang dijawab error_status
+        error_status: Status untuk error acak (default 503)
+        rate_limit_rate: Fraksi request yang dijawab 429 dengan Retry-After
+        max_rps: Batas request per detik (token bucket); kelebihannya dijawab 429
+        retry_after: Nilai header Retry-After pada respons 429 (detik)
+        etag: Kirim ETag dan jawab If-None-Match yang cocok dengan 304
+        seed: Seed untuk latensi dan error acak
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, page_count=50, products_per_page=20, latency=0.0, latency_jitter=0.0,
+                 error_rate=0.0, error_status=503, rate_limit_rate=0.0, max_rps=None, retry_after=1,
+                 etag=True, seed=0):
+        super().__init__(address, StubHandler)
+        self.page_count = page_count
+        self.products_per_page = products_per_page
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit_rate = rate_limit_rate
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.etag = etag
+        self._pages = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._statuses = Counter()
+        self._tokens = float(max_rps or 0)
+        self._refilled = time.monotonic()
+
+    def render(self, page_number):
+        if page_number not in self._pages:
+            self._pages[page_number] = render_page(page_number, self.page_count, self.products_per_page)
+        return self._pages[page_number]
+
+    def request_latency(self):
+        if not self.latency_jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._rng.uniform(0, self.latency_jitter)
+
+    def _take_token(self):
+        now = time.monotonic()
+        self._tokens = min(self.max_rps, self._tokens + (now - self._refilled) * self.max_rps)
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def fault(self):
+        """Status gangguan untuk request ini (429 atau error_status), None jika dilayani normal."""
+        with self._lock:
+            if self.max_rps and not self._take_token():
+                return 429
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return self.error_status
+        return None
+
+    def count(self, status):
+        with self._lock:
+            self._statuses[status] += 1
+
+    def stats(self):
+        """Jumlah respons per status sejak server dijalankan."""
+        with self._lock:
+            return {'requests': sum(self._statuses.values()), 'statuses': dict(self._statuses)}
+
+@contextmanager
+def serve_stub(page_count=50, products_per_page=20, latency=0.0, host='127.0.0.1', port=0, **options):
+    """Menjalankan StubServer di thread latar dan mengembalikan server-nya (lihat StubServer untuk options)."""
+    server = StubServer((host, port), page_count, products_per_page, latency, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def base_url(server):
+    host, port = server.server_address[:2]
+    return f'http://{host}:{port}/'
+
+@contextmanager
+def run_stub_server(page_count=50, products_per_page=20, latency=0.0, **options):
+    """Menjalankan StubServer di thread latar dan mengembalikan base URL-nya (diakhiri '/')."""
+    with serve_stub(page_count, products_per_page, latency, **options) as server:
+        yield base_url(server)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Server stub katalog fashion-studio untuk load test offline, mis. '
+                    'python -m benchmarks.stub_server --pages 500 --latency 0.05 --error-rate 0.01')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--products-per-page', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='latensi tetap per request (detik)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='latensi tambahan acak maksimum (detik)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraksi request yang dijawab 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='fraksi request yang dijawab 429')
+    parser.add_argument('--max-rps', type=float, default=None, help='batas request per detik, kelebihannya 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='header Retry-After pada 429 (detik)')
+    parser.add_argument('--no-etag', action='store_true', help='tanpa ETag / 304')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubServer((args.host, args.port), args.pages, args.products_per_page, args.latency,
+                        latency_jitter=args.jitter, error_rate=args.error_rate,
+                        rate_limit_rate=args.rate_limit_rate, max_rps=args.max_rps,
+                        retry_after=args.retry_after, etag=not args.no_etag, seed=args.seed)
+    print(f"Server stub berjalan di {base_url(server)} ({args.pages} halaman), Ctrl+C untuk berhenti")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Statistik: {server.stats()}")
+
+if __name__ == '__main__':
+    main()
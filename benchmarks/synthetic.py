@@ -0,0 +1,82 @@
+"""
+Generator data sintetis katalog fashion-studio untuk benchmark.
+
+Data mentah mengikuti format record extract_fashion_data (teks dengan spasi
+dan label seperti di situs aslinya), termasuk nilai kotor: 'Unknown Product',
+'Price Unavailable', 'Invalid Rating', 'Not Rated' dan baris duplikat.
+Semua fungsi deterministik untuk seed yang sama, sehingga hasil benchmark
+antar commit bisa dibandingkan.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from utils.sample_catalog import PRODUCT_TYPES, SIZES, GENDERS, render_page
+
+PRODUCTS_PER_PAGE = 20
+UNKNOWN_FRACTION = 0.05
+NOT_RATED_FRACTION = 0.03
+DUPLICATE_FRACTION = 0.02
+FIRST_TIMESTAMP = pd.Timestamp('2025-05-19 19:04:47.835')
+
+def synthetic_scrape(rows, seed=0, start=0):
+    """
+    Data mentah hasil scraping sebanyak `rows` baris, mulai dari produk ke-`start`.
+
+    Dengan `start` generator bisa dipanggil per chunk tanpa nomor produk yang
+    bertabrakan; seed dicampur dengan `start` agar tiap chunk berbeda.
+    """
+    rng = np.random.default_rng([seed, start])
+    numbers = np.arange(start, start + rows)
+    unknown = rng.random(rows) < UNKNOWN_FRACTION
+
+    titles = np.char.add(np.char.add(rng.choice(PRODUCT_TYPES, rows), ' '), numbers.astype(str))
+    price = np.char.add('$', np.round(rng.uniform(10, 500, rows), 2).astype(str))
+    rating = np.char.add(np.char.add('  ', np.round(rng.uniform(1, 5, rows), 1).astype(str)), ' ')
+    rating[rng.random(rows) < NOT_RATED_FRACTION] = '  Not Rated '
+    price[unknown] = 'Price Unavailable'
+    rating[unknown] = '  Invalid Rating '
+
+    # Satu Timestamp per halaman, seperti scraping yang mengambil 20 produk per request
+    pages = numbers // PRODUCTS_PER_PAGE
+    first_page = int(pages[0]) if rows else 0
+    page_times = (FIRST_TIMESTAMP + pd.to_timedelta(np.arange(first_page, first_page + len(np.unique(pages))), unit='s'))
+    timestamps = page_times.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3].to_numpy()[pages - first_page]
+
+    df = pd.DataFrame({
+        'Title': np.where(unknown, 'Unknown Product', titles),
+        'Price': price,
+        'Rating': rating,
+        'Color': np.char.add(rng.integers(1, 9, rows).astype(str), ' Colors'),
+        'Size': np.char.add(' ', rng.choice(SIZES, rows)),
+        'Gender': np.char.add(' ', rng.choice(GENDERS, rows)),
+        'Timestamp': timestamps,
+    }).astype(object)
+
+    # Sebagian baris adalah salinan baris lain (produk yang muncul dua kali saat scraping)
+    duplicates = np.flatnonzero(rng.random(rows) < DUPLICATE_FRACTION)
+    if len(duplicates):
+        df.iloc[duplicates] = df.iloc[rng.integers(0, rows, len(duplicates))].to_numpy()
+    return df
+
+def write_scrape_csv(path, rows, seed=0, chunk_rows=1_000_000):
+    """
+    Tulis `rows` baris data mentah ke CSV per chunk, sehingga skala 10 juta
+    baris tidak perlu dibuat sekaligus di memori.
+
+    Returns:
+        Jumlah baris yang ditulis
+    """
+    for start in range(0, rows, chunk_rows):
+        chunk = synthetic_scrape(min(chunk_rows, rows - start), seed=seed, start=start)
+        chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+    if rows == 0:
+        synthetic_scrape(0).to_csv(path, index=False)
+    return rows
+
+def synthetic_pages(rows, products_per_page=PRODUCTS_PER_PAGE, seed=0):
+    """Halaman katalog HTML (bytes, dari server stub) yang bersama-sama memuat sekitar `rows` produk."""
+    page_count = max(1, math.ceil(rows / products_per_page))
+    for page_number in range(1, page_count + 1):
+        yield render_page(page_number, page_count, products_per_page, seed)
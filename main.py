@@ -1,76 +1,179 @@
-from utils.extract import scrape_data
-from utils.transform import transform_data
-from utils.load import load_to_csv, load_to_postgresql, load_to_google_sheets
-import pandas as pd
-import os
-from datetime import datetime
+from utils.extract import iter_scrape_pages
+from utils.http_client import HttpClient
+from utils.http_cache import HttpCache
+from utils.checkpoint import CrawlCheckpoint
+from utils.archive import HtmlArchive
+from utils.changes import DEFAULT_INDEX_FILE, FingerprintIndex
+from utils.rate_limit import AdaptiveRateLimiter, RetryPolicy
+from utils.metrics import get_registry
+from utils.load import load_dataframe_to_csv, load_dataframe_to_postgresql, load_dataframe_to_google_sheets, dispose_engine
+from utils.pipeline import collect_batches, run_pipeline, wait_for_sinks
+from utils.profiling import DEFAULT_PROFILE_DIR, StageProfiler, run_directory
+import argparse
 
-def main():
+# Batas waktu menunggu sink yang melewati timeout sebelum koneksi database ditutup
+SINK_SHUTDOWN_TIMEOUT = 60
+
+def main(debug_dir=None, debug_format='csv', pg_method='copy', metrics_dir='metrics',
+         profile_dir=None, profile_memory=False, archive_dir=None, replay_run=None, incremental=False,
+         resume=False):
     BASE_URL = 'https://fashion-studio.dicoding.dev/'
-    scrapped_data_file = 'scrapped_data.csv'
-    transformed_file = 'transformed.csv'
     final_products_file = 'products.csv'
+    changes_file = 'products_changes.csv'
+    checkpoint_file = 'scrape_checkpoint.sqlite'
+    http_cache = HttpCache('.http_cache')
+    html_archive = HtmlArchive(archive_dir) if archive_dir else None
+    archive_run = None
+    change_index = FingerprintIndex(DEFAULT_INDEX_FILE) if incremental else None
+    metrics = get_registry()
+    metrics.reset()
+    # Tanpa --profile profiler nonaktif dan tidak menambah overhead
+    profiler = StageProfiler(run_directory(profile_dir) if profile_dir else None, memory=profile_memory)
     
     try:
         print("="*50)
         print("PROSES SCRAPPING DIMULAI")
         print("="*50)
         
-        all_fashion_data = scrape_data(BASE_URL)
+        # Checkpoint menyimpan halaman yang sudah selesai sehingga run yang gagal bisa
+        # dilanjutkan tanpa scraping ulang dengan --resume; tanpa --resume checkpoint lama
+        # dihapus dan semua halaman diambil ulang. Data diteruskan antar tahap sebagai DataFrame;
+        # file perantara hanya ditulis bila --debug-dir diberikan.
+        if replay_run is not None:
+            # Replay: halaman dibaca dari arsip HTML dan di-parse ulang tanpa request ke situs
+            replay = html_archive.open_run(replay_run or None)
+            pages = iter_scrape_pages(BASE_URL, replay=replay, process_pool=True)
+            with metrics.stage('scrape') as stage, profiler.stage('scrape'):
+                raw_df = collect_batches(records for _, records in pages)
+                stage['rows_out'] = len(raw_df)
+            stats = None
+        else:
+            if html_archive is not None:
+                archive_run = html_archive.start_run(BASE_URL)
+            with HttpClient() as client, CrawlCheckpoint(checkpoint_file, base_url=BASE_URL) as checkpoint:
+                # Mulai dari 1 request/detik (setara delay lama) lalu menyesuaikan dengan respons server
+                pages = iter_scrape_pages(BASE_URL, client=client, cache=http_cache, checkpoint=checkpoint,
+                                          rate_limiter=AdaptiveRateLimiter(rate=1.0), retry=RetryPolicy(),
+                                          skip_failed_pages=True, archive=archive_run, resume=resume)
+                with metrics.stage('scrape') as stage, profiler.stage('scrape'):
+                    raw_df = collect_batches(records for _, records in pages)
+                    stage['rows_out'] = len(raw_df)
+                # Checkpoint hanya dihapus bila tidak ada halaman yang gagal; run berikutnya dengan
+                # --resume hanya mengambil ulang halaman yang gagal
+                if not checkpoint.finish():
+                    print(f"Halaman gagal {checkpoint.failed_pages()} disimpan di checkpoint; "
+                          f"jalankan dengan --resume untuk hanya mengambil ulang halaman tersebut")
+                stats = client.stats()
+        if stats is not None:
+            print(f"Koneksi HTTP: {stats['requests']} request, {stats['connections_opened']} koneksi baru, "
+                  f"{stats['connections_reused']} koneksi dipakai ulang")
         
-        if not all_fashion_data:
+        if raw_df.empty:
             print("Tidak ada data yang berhasil discraping")
             return
         
-        df = pd.DataFrame(all_fashion_data)
-        df.to_csv(scrapped_data_file, index=False)
-        print(f"\nData hasil scrapped berhasil di simpan: {scrapped_data_file}")
+        print(f"\nData hasil scrapped: {len(raw_df)} baris")
         
         print("\n" + "="*50)
-        print("PROSES TRANSFORMASI DATA DIMULAI")
+        print("PROSES TRANSFORMASI DAN LOADING DATA DIMULAI")
         print("="*50)
         
-        success = transform_data(scrapped_data_file, transformed_file)
+        spreadsheet_id = "1qkzwYBMQDRx0AFTONigI_vDn2ZUdWgZYl_CoBGktSxg"
+        sheet_name = "Sheet1"
+        sinks = {
+            'CSV': lambda df: load_dataframe_to_csv(df, final_products_file),
+            'PostgreSQL': lambda df: load_dataframe_to_postgresql(df, "fashion_products", method=pg_method),
+            'Google Sheets': lambda df: load_dataframe_to_google_sheets(df, spreadsheet_id, sheet_name),
+        }
+        detect_deletes = True
+        if incremental:
+            # Hanya delta yang dimuat: upsert (termasuk hapus) ke PostgreSQL dan daftar perubahan ke CSV.
+            # Google Sheets adalah salinan penuh katalog sehingga tidak bisa menerima delta.
+            sinks = {
+                'CSV': lambda df: load_dataframe_to_csv(df, changes_file),
+                'PostgreSQL': lambda df: load_dataframe_to_postgresql(df, "fashion_products", method='upsert'),
+            }
+            # Halaman yang gagal di-scrape tidak boleh membuat produknya dianggap terhapus
+            failed_pages = sum(series['value'] for series in metrics.snapshot()['counters'].get('scrape_pages_total', [])
+                               if series['labels'].get('result') == 'failed')
+            detect_deletes = failed_pages == 0
+        # Sink berjalan paralel; Google Sheets diberi batas waktu lebih longgar
+        result = run_pipeline(raw_df, sinks, debug_dir=debug_dir, debug_format=debug_format,
+                              sink_timeout=300, sink_timeouts={'Google Sheets': 600}, profiler=profiler,
+                              change_index=change_index, detect_deletes=detect_deletes)
         
-        if success:
-            transformed_df = pd.read_csv(transformed_file)
-            
-            print("\nSampel data yang sudah ditransformasi:")
-            print(transformed_df.head())
-            
-            print("\n" + "="*50)
-            print("PROSES LOADING DATA DIMULAI")
-            print("="*50)
-            
-            # 1. Load ke CSV
-            csv_success = load_to_csv(transformed_file, final_products_file)
-            if csv_success:
-                print("\nData berhasil dimuat ke CSV")
-            else:
-                print("\nGagal memuat data ke CSV")
-            
-            # 2. Load ke PostgreSQL
-            pg_success = load_to_postgresql(transformed_file, "fashion_products")
-            if pg_success:
-                print("\nData berhasil dimuat ke PostgreSQL")
-            else:
-                print("\nGagal memuat data ke PostgreSQL")
-            
-            # 3. Load ke Google Sheets
-            spreadsheet_id = "1qkzwYBMQDRx0AFTONigI_vDn2ZUdWgZYl_CoBGktSxg"
-            sheet_name = "Sheet1"
-            
-            gs_success = load_to_google_sheets(transformed_file, spreadsheet_id, sheet_name)
-            if gs_success:
-               print("\nData berhasil dimuat ke Google Sheets")
+        print("\nSampel data yang sudah ditransformasi:")
+        print(result.data.head())
+        
+        for name, sink_result in result.sinks.items():
+            if sink_result.success:
+                print(f"\nData berhasil dimuat ke {name} ({sink_result.seconds:.2f} s)")
             else:
-               print("\nGagal memuat data ke Google Sheets")
-            
-        else:
-            print("Gagal mentransformasikan data")
+                print(f"\nGagal memuat data ke {name} ({sink_result.seconds:.2f} s): {sink_result.error}")
     
     except Exception as e:
         print(f"An error occurred: {str(e)}")
 
+    finally:
+        # Engine hanya ditutup bila tidak ada sink (timeout) yang masih menulis memakainya
+        still_running = wait_for_sinks(timeout=SINK_SHUTDOWN_TIMEOUT)
+        if still_running:
+            print(f"Sink {', '.join(still_running)} masih berjalan setelah {SINK_SHUTDOWN_TIMEOUT} detik; "
+                  f"koneksi database tidak ditutup")
+        else:
+            dispose_engine()
+        if change_index is not None:
+            change_index.close()
+        if archive_run is not None:
+            archive_run.save()
+            archive_stats = archive_run.stats()
+            print(f"\nArsip HTML run {archive_run.run_id}: {archive_stats['pages']} halaman, "
+                  f"{archive_stats['new_objects']} baru, {archive_stats['deduplicated']} duplikat, "
+                  f"{archive_stats['raw_bytes']} -> {archive_stats['stored_bytes']} byte")
+            if archive_stats['missing']:
+                print(f"Arsip run {archive_run.run_id} parsial: {archive_stats['missing']} halaman dari checkpoint "
+                      f"tidak memiliki HTML di arsip dan akan di-replay sebagai halaman gagal")
+        http_cache.close()
+        cache_report = http_cache.report()
+        print(f"\nCache HTTP: {cache_report['hits']} hit, {cache_report['misses']} miss, "
+              f"{cache_report['entries']} halaman tersimpan ({cache_report['bytes']} byte)")
+        if metrics_dir:
+            json_path, prometheus_path = metrics.write(metrics_dir)
+            print(f"Metrics disimpan ke {json_path} dan {prometheus_path}")
+        if profiler.enabled:
+            print(f"Laporan profiling ({len(profiler.reports)} file) disimpan di {profiler.run_dir}")
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='ETL pipeline Fashion Studio')
+    parser.add_argument('--debug-dir', default=None,
+                        help='simpan data perantara (scrapped_data, transformed) di direktori ini')
+    parser.add_argument('--debug-format', default='csv', choices=['csv', 'parquet', 'feather'],
+                        help='format data perantara; parquet/feather menyimpan skema bertipe')
+    parser.add_argument('--pg-method', default='copy', choices=['copy', 'upsert', 'to_sql'],
+                        help='cara load ke PostgreSQL: ganti seluruh tabel (copy/to_sql) atau hanya produk '
+                             'baru/berubah (upsert)')
+    parser.add_argument('--metrics-dir', default='metrics',
+                        help='direktori metrics.json dan metrics.prom (format Prometheus) dari run ini')
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_PROFILE_DIR, default=None, metavar='DIR',
+                        help='profil tahap scrape, transform dan load dengan cProfile; laporan .pstats '
+                             f'per tahap disimpan di subdirektori run baru di DIR (default: {DEFAULT_PROFILE_DIR})')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='dengan --profile: lacak juga alokasi memori (tracemalloc, top-N per tahap)')
+    parser.add_argument('--archive-dir', default=None,
+                        help='simpan HTML setiap halaman (terkompresi, per hash konten) ke arsip di direktori ini')
+    parser.add_argument('--replay', nargs='?', const='', default=None, metavar='RUN_ID',
+                        help='dengan --archive-dir: bangun ulang data dari arsip tanpa jaringan '
+                             '(default: run terakhir)')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'hanya muat produk baru/berubah/terhapus sejak run sebelumnya (indeks di {DEFAULT_INDEX_FILE}); '
+                             'PostgreSQL memakai upsert, CSV berisi daftar perubahan, Google Sheets dilewati')
+    parser.add_argument('--resume', action='store_true',
+                        help='lanjutkan crawl sebelumnya yang belum lengkap: halaman yang sudah ada di checkpoint '
+                             'tidak diambil ulang (tanpa opsi ini semua halaman selalu diambil ulang)')
+    args = parser.parse_args()
+    if args.replay is not None and not args.archive_dir:
+        parser.error('--replay membutuhkan --archive-dir')
+    main(debug_dir=args.debug_dir, debug_format=args.debug_format, pg_method=args.pg_method,
+         metrics_dir=args.metrics_dir, profile_dir=args.profile, profile_memory=args.profile_memory,
+         archive_dir=args.archive_dir, replay_run=args.replay, incremental=args.incremental,
+         resume=args.resume)
\ No newline at end of file
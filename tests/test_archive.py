@@ -0,0 +1,165 @@
+import pytest
+import sys
+import os
+import contextlib
+import io
+from unittest.mock import patch
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.stub_server import run_stub_server
+from utils.sample_catalog import render_page
+from utils.archive import HtmlArchive, content_digest, zstandard
+from utils.checkpoint import CrawlCheckpoint
+from utils.extract import build_page_url, extract_page_records, scrape_data
+
+PAGE = render_page(1, page_count=3)
+
+def quiet_scrape(base_url, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return scrape_data(base_url, delay=0, **kwargs)
+
+def without_timestamp(records):
+    return [{k: v for k, v in record.items() if k != 'Timestamp'} for record in records]
+
+class TestHtmlArchive:
+    def test_put_is_content_addressed_and_deduplicated(self, tmp_path):
+        archive = HtmlArchive(str(tmp_path), codec='gzip')
+
+        digest, is_new = archive.put(PAGE)
+        again, is_new_again = archive.put(PAGE)
+
+        assert digest == again == content_digest(PAGE)
+        assert (is_new, is_new_again) == (True, False)
+        assert archive.get(digest) == PAGE
+        assert archive.object_size(digest) < len(PAGE)
+
+    @pytest.mark.skipif(zstandard is None, reason="zstandard tidak terpasang")
+    def test_zstd_objects_and_mixed_codecs(self, tmp_path):
+        digest, _ = HtmlArchive(str(tmp_path), codec='gzip').put(PAGE)
+        archive = HtmlArchive(str(tmp_path), codec='zstd')
+
+        # Objek gzip lama tetap dikenali, tidak ditulis ulang sebagai zstd
+        assert archive.put(PAGE) == (digest, False)
+        other = render_page(2, page_count=3)
+        other_digest, _ = archive.put(other)
+        assert archive.get(other_digest) == other
+        assert os.path.exists(tmp_path / 'objects' / other_digest[:2] / f'{other_digest}.zst')
+
+    def test_unknown_codec(self, tmp_path):
+        with pytest.raises(ValueError):
+            HtmlArchive(str(tmp_path), codec='bzip2')
+
+    def test_get_missing_object(self, tmp_path):
+        with pytest.raises(KeyError):
+            HtmlArchive(str(tmp_path)).get('0' * 64)
+
+    def test_manifest_round_trip_and_latest_run(self, tmp_path):
+        archive = HtmlArchive(str(tmp_path))
+        with archive.start_run('http://example.test/') as first:
+            first.record(1, 'http://example.test/', PAGE, fetched_at='2025-05-19 19:04:47.835')
+        with archive.start_run('http://example.test/') as second:
+            second.record(2, 'http://example.test/page2', PAGE)
+
+        assert archive.runs() == sorted([first.run_id, second.run_id])
+        assert second.deduplicated == 1
+        opened = archive.open_run(first.run_id)
+        assert opened.fetched_at(1) == '2025-05-19 19:04:47.835'
+        assert list(opened.iter_pages()) == [(1, PAGE)]
+        assert archive.open_run().run_id == archive.runs()[-1]
+
+    def test_open_run_without_runs(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            HtmlArchive(str(tmp_path)).open_run()
+
+    def test_missing_pages_replay_as_failed_fetch(self, tmp_path):
+        run = HtmlArchive(str(tmp_path)).start_run('http://example.test/')
+        run.record(1, 'http://example.test/', PAGE)
+
+        assert list(run.iter_pages([1, 2])) == [(1, PAGE), (2, None)]
+
+class TestScrapeWithArchive:
+    def test_archive_then_replay_without_network(self, tmp_path):
+        archive = HtmlArchive(str(tmp_path))
+        with run_stub_server(page_count=3) as base_url:
+            with archive.start_run(base_url) as run:
+                crawled = quiet_scrape(base_url, archive=run)
+
+        # Server sudah berhenti: replay hanya membaca arsip
+        replay = archive.open_run()
+        replayed = quiet_scrape('http://unreachable.invalid/', replay=replay)
+
+        assert len(crawled) == 3 * 20
+        assert without_timestamp(replayed) == without_timestamp(crawled)
+        assert {record['Timestamp'] for record in replayed[:20]} == {replay.fetched_at(1)}
+
+    def test_second_crawl_deduplicates_identical_pages(self, tmp_path):
+        archive = HtmlArchive(str(tmp_path))
+        with run_stub_server(page_count=3) as base_url:
+            with archive.start_run(base_url) as first:
+                quiet_scrape(base_url, archive=first)
+            with archive.start_run(base_url) as second:
+                quiet_scrape(base_url, max_workers=3, archive=second)
+
+        assert first.stats()['new_objects'] == 3
+        assert second.stats()['new_objects'] == 0
+        assert second.stats()['deduplicated'] == 3
+        assert second.stats()['stored_bytes'] < second.stats()['raw_bytes']
+
+    def test_replay_respects_page_range(self, tmp_path):
+        archive = HtmlArchive(str(tmp_path))
+        with run_stub_server(page_count=3) as base_url:
+            with archive.start_run(base_url) as run:
+                quiet_scrape(base_url, archive=run)
+
+        replayed = quiet_scrape('http://unreachable.invalid/', start_page=2, max_pages=2, replay=archive.open_run())
+
+        (_, page_two), = run.iter_pages([2])
+        assert without_timestamp(replayed) == without_timestamp(extract_page_records(page_two))
+
+class TestArchiveWithCheckpoint:
+    BASE_URL = 'http://example.test/'
+
+    def pages(self):
+        return {build_page_url(self.BASE_URL, n): render_page(n, page_count=4) for n in range(1, 5)}
+
+    def test_resumed_run_references_objects_of_the_interrupted_run(self, tmp_path):
+        archive = HtmlArchive(str(tmp_path / 'archive'))
+        pages = self.pages()
+        path = str(tmp_path / 'state.sqlite')
+
+        # Run pertama: halaman 3 gagal dan dilewati
+        with patch('utils.extract.fetching_content', side_effect=lambda url: None if url.endswith('page3') else pages[url]):
+            with CrawlCheckpoint(path, base_url=self.BASE_URL) as checkpoint, archive.start_run(self.BASE_URL) as first:
+                quiet_scrape(self.BASE_URL, checkpoint=checkpoint, skip_failed_pages=True, archive=first)
+
+        # Run kedua: halaman 1, 2, 4 dari checkpoint, hanya halaman 3 diambil
+        with patch('utils.extract.fetching_content', side_effect=pages.get):
+            with CrawlCheckpoint(path, base_url=self.BASE_URL) as checkpoint, archive.start_run(self.BASE_URL) as second:
+                resumed = quiet_scrape(self.BASE_URL, checkpoint=checkpoint, skip_failed_pages=True, archive=second)
+
+        assert second.stats()['reused'] == 3
+        assert second.stats()['missing'] == 0
+        replay = archive.open_run(second.run_id)
+        assert replay.page_numbers() == [1, 2, 3, 4]
+        replayed = quiet_scrape('http://unreachable.invalid/', replay=replay)
+        assert without_timestamp(replayed) == without_timestamp(resumed)
+
+    def test_checkpointed_page_without_archived_object_marks_run_partial(self, tmp_path):
+        archive = HtmlArchive(str(tmp_path / 'archive'))
+        pages = self.pages()
+        with CrawlCheckpoint(str(tmp_path / 'state.sqlite'), base_url=self.BASE_URL) as checkpoint:
+            checkpoint.save_page_count(4)
+            checkpoint.save_page(2, extract_page_records(pages[build_page_url(self.BASE_URL, 2)]))
+            with patch('utils.extract.fetching_content', side_effect=pages.get):
+                with archive.start_run(self.BASE_URL) as run:
+                    quiet_scrape(self.BASE_URL, checkpoint=checkpoint, archive=run)
+
+        replay = archive.open_run(run.run_id)
+        assert replay.missing == {2}
+        assert list(replay.iter_pages([2])) == [(2, None)]
+        assert run.stats()['missing'] == 1
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,134 @@
+import pytest
+import sys
+import os
+import pandas as pd
+from sqlalchemy import create_engine
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.changes import CHANGE_COLUMN, KEY_COLUMN, FingerprintIndex, delta_frame, product_fingerprints
+from utils.load import upsert_dataframe
+from utils.pipeline import run_pipeline
+
+CLEANED = pd.DataFrame({
+    'Title': ['Product 1', 'Product 2', 'Product 3'],
+    'Price': [1600000.0, 3200000.0, 800000.0],
+    'Rating': [4.8, 4.5, 3.9],
+    'Color': [3, 2, 1],
+    'Size': ['M', 'L', 'XL'],
+    'Gender': ['Men', 'Women', 'Unisex'],
+    'Timestamp': pd.to_datetime(['2023-04-01 12:00:00.000', '2023-04-01 12:01:00.000', '2023-04-01 12:02:00.000']),
+})
+
+RAW = pd.DataFrame({
+    'Title': ['Product 1', 'Product 2'],
+    'Price': ['$100.00', '$200.00'],
+    'Rating': ['4.8', '4.5'],
+    'Color': ['3 Colors', '2 Colors'],
+    'Size': ['Size: M', 'Size: L'],
+    'Gender': ['Gender: Men', 'Gender: Women'],
+    'Timestamp': ['2023-04-01 12:00:00.000', '2023-04-01 12:01:00.000'],
+})
+
+@pytest.fixture
+def index(tmp_path):
+    with FingerprintIndex(str(tmp_path / 'index.sqlite')) as index:
+        yield index
+
+def second_run():
+    """Product 1 berubah harga, Product 2 tetap, Product 3 hilang, Product 4 baru."""
+    df = CLEANED.iloc[:2].copy()
+    df.loc[0, 'Price'] = 999.0
+    new = CLEANED.iloc[[2]].assign(Title='Product 4')
+    return pd.concat([df, new], ignore_index=True)
+
+class TestFingerprints:
+    def test_fingerprint_ignores_timestamp_and_dtype(self):
+        other = CLEANED.assign(Timestamp=pd.Timestamp('2024-01-01'), Color=CLEANED['Color'].astype('Int64'))
+
+        assert product_fingerprints(CLEANED).tolist() == product_fingerprints(other).tolist()
+
+    def test_fingerprint_changes_with_content(self):
+        changed = CLEANED.assign(Rating=[4.8, 4.5, 4.0])
+
+        assert (product_fingerprints(CLEANED) != product_fingerprints(changed)).tolist() == [False, False, True]
+
+class TestFingerprintIndex:
+    def test_first_run_is_all_new(self, index):
+        changes = index.classify(CLEANED)
+
+        assert changes.counts == {'new': 3, 'changed': 0, 'unchanged': 0, 'deleted': 0}
+        assert changes.updates[CHANGE_COLUMN].tolist() == ['new'] * 3
+        assert len(index) == 0
+
+    def test_classify_against_committed_run(self, index):
+        index.commit(index.classify(CLEANED))
+
+        changes = index.classify(second_run())
+
+        assert changes.counts == {'new': 1, 'changed': 1, 'unchanged': 1, 'deleted': 1}
+        assert dict(zip(changes.updates['Title'], changes.updates[CHANGE_COLUMN])) == \
+            {'Product 1': 'changed', 'Product 4': 'new'}
+        index.commit(changes)
+        assert len(index) == 3
+        assert index.classify(second_run()).counts == {'new': 0, 'changed': 0, 'unchanged': 3, 'deleted': 0}
+
+    def test_detect_deletes_off_keeps_missing_products(self, index):
+        index.commit(index.classify(CLEANED))
+
+        changes = index.classify(CLEANED.iloc[:1], detect_deletes=False)
+        index.commit(changes)
+
+        assert changes.deleted == []
+        assert len(index) == 3
+
+    def test_duplicate_products_are_counted_once(self, index):
+        changes = index.classify(pd.concat([CLEANED, CLEANED.iloc[:1]], ignore_index=True))
+
+        assert changes.counts['new'] == 3
+
+    def test_delta_frame_appends_deleted_rows(self, index):
+        index.commit(index.classify(CLEANED))
+        changes = index.classify(second_run())
+
+        delta = delta_frame(changes.updates, changes.deleted)
+
+        assert delta[CHANGE_COLUMN].tolist() == ['changed', 'new', 'deleted']
+        assert delta[KEY_COLUMN].iloc[-1] == changes.deleted[0]
+        assert pd.isna(delta['Title'].iloc[-1])
+
+class TestIncrementalLoad:
+    def test_upsert_applies_delta_including_deletions(self, index, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'products.sqlite'}")
+        first = index.classify(CLEANED)
+        upsert_dataframe(delta_frame(first.updates, first.deleted), 'fashion_products', engine)
+        index.commit(first)
+
+        changes = index.classify(second_run())
+        counts = upsert_dataframe(delta_frame(changes.updates, changes.deleted), 'fashion_products', engine)
+
+        stored = pd.read_sql('SELECT "Title", "Price" FROM fashion_products ORDER BY "Title"', engine)
+        assert counts == {'inserted': 1, 'updated': 1, 'unchanged': 0, 'deleted': 1}
+        assert stored.values.tolist() == [['Product 1', 999.0], ['Product 2', 3200000.0], ['Product 4', 800000.0]]
+        engine.dispose()
+
+    def test_run_pipeline_sends_only_delta_and_commits_on_success(self, index):
+        received = []
+
+        first = run_pipeline(RAW, {'sink': lambda df: received.append(df) or True}, change_index=index)
+        second = run_pipeline(RAW, {'sink': lambda df: received.append(df) or True}, change_index=index)
+
+        assert first.changes == {'new': 2, 'changed': 0, 'unchanged': 0, 'deleted': 0}
+        assert len(received[0]) == 2
+        assert second.changes == {'new': 0, 'changed': 0, 'unchanged': 2, 'deleted': 0}
+        assert received[1].empty
+
+    def test_failed_sink_leaves_index_untouched(self, index):
+        result = run_pipeline(RAW, {'broken': lambda df: False}, change_index=index)
+
+        assert result.changes['new'] == 2
+        assert len(index) == 0
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,126 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.checkpoint import CrawlCheckpoint
+from utils.extract import scrape_data, build_page_url
+from utils.sample_catalog import render_page
+
+BASE_URL = 'https://fashion-studio.dicoding.dev/'
+
+class TestCrawlCheckpoint:
+    def test_save_and_load_page(self, tmp_path):
+        records = [{'Title': 'Kaos ⭐', 'Price': '$10.00'}]
+        with CrawlCheckpoint(str(tmp_path / 'state.sqlite')) as checkpoint:
+            assert checkpoint.last_completed_page() is None
+            checkpoint.save_page(2, records)
+            checkpoint.save_page(1, [])
+
+            assert checkpoint.completed_pages() == [1, 2]
+            assert checkpoint.last_completed_page() == 2
+            assert checkpoint.load_page(2) == records
+            assert checkpoint.load_page(3) is None
+
+    def test_checkpoint_survives_reopen(self, tmp_path):
+        path = str(tmp_path / 'state.sqlite')
+        with CrawlCheckpoint(path, base_url=BASE_URL) as checkpoint:
+            checkpoint.save_page(1, [{'Title': 'A'}])
+
+        with CrawlCheckpoint(path, base_url=BASE_URL) as checkpoint:
+            assert checkpoint.completed_pages() == [1]
+
+    def test_checkpoint_for_other_url_is_discarded(self, tmp_path):
+        path = str(tmp_path / 'state.sqlite')
+        with CrawlCheckpoint(path, base_url=BASE_URL) as checkpoint:
+            checkpoint.save_page(1, [{'Title': 'A'}])
+
+        with CrawlCheckpoint(path, base_url='http://localhost:8000/') as checkpoint:
+            assert checkpoint.completed_pages() == []
+
+class TestResumeCrawl:
+    @patch('builtins.print')
+    def test_resume_only_fetches_remaining_pages(self, mock_print, tmp_path):
+        pages = {build_page_url(BASE_URL, n): render_page(n, page_count=4) for n in range(1, 6)}
+        path = str(tmp_path / 'state.sqlite')
+
+        # Run pertama gagal di halaman 3
+        with patch('utils.extract.fetching_content', side_effect=lambda url: None if url.endswith('page3') else pages[url]):
+            with CrawlCheckpoint(path, base_url=BASE_URL) as checkpoint:
+                first = scrape_data(BASE_URL, delay=0, checkpoint=checkpoint)
+        assert len(first) == 40
+
+        # Run kedua melanjutkan dari halaman 3 tanpa mengambil ulang halaman 1-2;
+        # jumlah halaman (4) dibaca dari checkpoint, bukan dari halaman 1
+        with patch('utils.extract.fetching_content', side_effect=pages.get) as mock_fetch:
+            with CrawlCheckpoint(path, base_url=BASE_URL) as checkpoint:
+                resumed = scrape_data(BASE_URL, delay=0, checkpoint=checkpoint)
+                assert checkpoint.completed_pages() == [1, 2, 3, 4]
+
+        fetched_urls = [args[0] for args, _ in mock_fetch.call_args_list]
+        assert fetched_urls == [build_page_url(BASE_URL, n) for n in (3, 4)]
+        assert len(resumed) == 80
+        assert resumed[:40] == first
+
+    @patch('builtins.print')
+    def test_failed_page_keeps_checkpoint_and_is_the_only_refetch(self, mock_print, tmp_path):
+        pages = {build_page_url(BASE_URL, n): render_page(n, page_count=4) for n in range(1, 5)}
+        path = str(tmp_path / 'state.sqlite')
+
+        # Run pertama: halaman 2 gagal dan dilewati, crawl tetap menghasilkan data
+        with patch('utils.extract.fetching_content', side_effect=lambda url: None if url.endswith('page2') else pages[url]):
+            with CrawlCheckpoint(path, base_url=BASE_URL) as checkpoint:
+                first = scrape_data(BASE_URL, delay=0, checkpoint=checkpoint, skip_failed_pages=True)
+                assert len(first) == 60
+                assert checkpoint.failed_pages() == [2]
+                assert checkpoint.finish() is False
+                assert checkpoint.completed_pages() == [1, 3, 4]
+
+        with patch('utils.extract.fetching_content', side_effect=pages.get) as mock_fetch:
+            with CrawlCheckpoint(path, base_url=BASE_URL) as checkpoint:
+                resumed = scrape_data(BASE_URL, delay=0, checkpoint=checkpoint, skip_failed_pages=True)
+                assert checkpoint.failed_pages() == []
+                assert checkpoint.finish() is True
+                assert checkpoint.completed_pages() == []
+
+        fetched_urls = [args[0] for args, _ in mock_fetch.call_args_list]
+        assert fetched_urls == [build_page_url(BASE_URL, 2)]
+        assert len(resumed) == 80
+
+    @patch('builtins.print')
+    def test_fresh_run_refetches_despite_failed_page_in_checkpoint(self, mock_print, tmp_path):
+        pages = {build_page_url(BASE_URL, n): render_page(n, page_count=3) for n in range(1, 4)}
+        path = str(tmp_path / 'state.sqlite')
+        with patch('utils.extract.fetching_content', side_effect=lambda url: None if url.endswith('page2') else pages[url]):
+            with CrawlCheckpoint(path, base_url=BASE_URL) as checkpoint:
+                scrape_data(BASE_URL, delay=0, checkpoint=checkpoint, skip_failed_pages=True)
+                assert checkpoint.finish() is False
+
+        # Tanpa resume (default main.py) semua halaman diambil ulang, bukan dibaca dari checkpoint
+        with patch('utils.extract.fetching_content', side_effect=pages.get) as mock_fetch:
+            with CrawlCheckpoint(path, base_url=BASE_URL) as checkpoint:
+                result = scrape_data(BASE_URL, delay=0, checkpoint=checkpoint, skip_failed_pages=True, resume=False)
+
+        fetched_urls = [args[0] for args, _ in mock_fetch.call_args_list]
+        assert fetched_urls == [build_page_url(BASE_URL, n) for n in (1, 2, 3)]
+        assert len(result) == 60
+
+    @patch('builtins.print')
+    def test_resume_false_starts_over(self, mock_print, tmp_path):
+        with CrawlCheckpoint(str(tmp_path / 'state.sqlite')) as checkpoint:
+            checkpoint.save_page(1, [{'Title': 'Lama'}])
+            with patch('utils.extract.fetching_content', side_effect=[render_page(1), None]) as mock_fetch:
+                result = scrape_data(BASE_URL, delay=0, checkpoint=checkpoint, resume=False)
+
+        assert mock_fetch.call_count == 2
+        assert len(result) == 20
+        assert all(record['Title'] != 'Lama' for record in result)
+
+# Tambahkan entrypoint agar test dapat dijalankan langsung
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main([__file__]))
@@ -5,10 +5,18 @@ from unittest.mock import patch, MagicMock, call
 from bs4 import BeautifulSoup
 from datetime import datetime
 import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from utils.extract import fetching_content, extract_fashion_data, scrape_data
+from utils.extract import (
+    fetching_content, extract_fashion_data, scrape_data, HostThrottle, parse_collection_cards, PARSER_BACKENDS,
+    build_page_url, PROCESS_POOL_MIN_PAGES, iter_scrape_pages, iter_scrape, extract_page_records, discover_page_count
+)
+from utils.sample_catalog import render_page
+from utils.metrics import get_registry
 
 class TestFetchingContent:
     @patch('utils.extract.requests.Session')
@@ -57,6 +65,26 @@ class TestFetchingContent:
         assert result is None
         mock_print.assert_called_once_with(f"Terjadi kesalahan saat melakukan requests terhadap {url}")
 
+    @patch('utils.extract.requests.Session')
+    def test_fetching_content_closes_one_off_session(self, mock_session):
+        # Tanpa client, session sekali pakai harus ditutup agar socket tidak bocor
+        mock_session_instance = MagicMock()
+        mock_session_instance.get.return_value.content = b'ok'
+        mock_session.return_value = mock_session_instance
+
+        assert fetching_content('https://fashion-studio.dicoding.dev/') == b'ok'
+        mock_session_instance.close.assert_called_once()
+
+    @patch('utils.extract.requests.Session')
+    def test_fetching_content_with_client(self, mock_session):
+        # Dengan client, session baru tidak boleh dibuat
+        client = MagicMock()
+        client.get.return_value.content = b'pooled'
+
+        assert fetching_content('https://fashion-studio.dicoding.dev/', client=client) == b'pooled'
+        client.get.assert_called_once_with('https://fashion-studio.dicoding.dev/')
+        mock_session.assert_not_called()
+
     @pytest.mark.skip(reason="Flawed test; skipping get_request_exception in class")
     @patch('utils.extract.requests.Session')
     @patch('builtins.print')
@@ -165,6 +193,34 @@ class TestExtractFashionData:
         assert result is None
         mock_print.assert_called_once()
 
+class TestParseCollectionCards:
+    @staticmethod
+    def records(content, parser):
+        cards = parse_collection_cards(content, parser)
+        return [{k: v for k, v in extract_fashion_data(card).items() if k != 'Timestamp'} for card in cards]
+
+    @pytest.mark.parametrize('parser', PARSER_BACKENDS)
+    def test_backends_produce_identical_records(self, parser):
+        # Halaman stub meniru struktur halaman asli, termasuk kartu 'Unknown Product'
+        content = render_page(1)
+        assert self.records(content, parser) == self.records(content, 'html.parser')
+        assert len(self.records(content, parser)) == 20
+
+    def test_strainer_keeps_nested_elements(self):
+        html = '''
+        <div class="header"><p>Bukan produk</p></div>
+        <div class="collection-card"><div class="product-details">
+            <h3 class="product-title">Nested</h3><p>Rating:4.5/5</p><p>1 Color</p><p>Size: M</p><p>Gender: Men</p>
+        </div></div>
+        '''
+        cards = parse_collection_cards(html, 'strainer')
+        assert len(cards) == 1
+        assert len(cards[0].find_all('p')) == 4
+
+    def test_unknown_parser_raises(self):
+        with pytest.raises(ValueError):
+            parse_collection_cards('<html></html>', 'html5')
+
 class TestScrapeData:
     @patch('utils.extract.fetching_content')
     @patch('utils.extract.extract_fashion_data')
@@ -314,6 +370,183 @@ class TestScrapeData:
         assert result == []
         mock_print.assert_called_once_with("Peringatan: Tidak ada data yang berhasil di-scrape")
 
+class TestScrapeDataConcurrent:
+    @staticmethod
+    def fake_fetch(url):
+        # Halaman terakhir (page4) kosong, halaman lain berisi dua produk
+        page = 1 if url.endswith('/') else int(url.rsplit('page', 1)[1])
+        if page >= 4:
+            return '<html><body>Tidak ada produk</body></html>'
+        # Halaman awal sengaja lebih lambat agar selesai belakangan
+        time.sleep(0.05 if page == 1 else 0)
+        return f'''
+        <div class="collection-card"><h3 class="product-title">Item {page}-1</h3><span class="price">$1</span>
+        <p>Rating:4.5/5</p><p>1 Color</p><p>Size: M</p><p>Gender: Men</p></div>
+        <div class="collection-card"><h3 class="product-title">Item {page}-2</h3><span class="price">$1</span>
+        <p>Rating:4.5/5</p><p>1 Color</p><p>Size: M</p><p>Gender: Men</p></div>
+        '''
+
+    @patch('builtins.print')
+    def test_scrape_data_concurrent_keeps_page_order(self, mock_print):
+        with patch('utils.extract.fetching_content', side_effect=self.fake_fetch):
+            result = scrape_data('https://fashion-studio.dicoding.dev/', delay=0, max_workers=4)
+
+        assert [item['Title'] for item in result] == ['Item 1-1', 'Item 1-2', 'Item 2-1', 'Item 2-2', 'Item 3-1', 'Item 3-2']
+
+    @patch('builtins.print')
+    def test_scrape_data_concurrent_matches_serial(self, mock_print):
+        with patch('utils.extract.fetching_content', side_effect=self.fake_fetch):
+            serial = scrape_data('https://fashion-studio.dicoding.dev/', delay=0)
+            concurrent = scrape_data('https://fashion-studio.dicoding.dev/', delay=0, max_workers=3, per_host_limit=2)
+
+        assert [item['Title'] for item in serial] == [item['Title'] for item in concurrent]
+
+    @patch('builtins.print')
+    def test_scrape_data_concurrent_stops_on_failed_page(self, mock_print):
+        # Halaman 2 gagal: halaman setelahnya tidak boleh ikut masuk ke hasil
+        def fetch(url):
+            return None if url.endswith('page2') else self.fake_fetch(url)
+
+        with patch('utils.extract.fetching_content', side_effect=fetch):
+            result = scrape_data('https://fashion-studio.dicoding.dev/', delay=0, max_workers=4)
+
+        assert [item['Title'] for item in result] == ['Item 1-1', 'Item 1-2']
+
+    def test_host_throttle_limits_requests_per_host(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def fetch(url):
+            with lock:
+                active.append(url)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(url)
+            return b'ok'
+
+        throttle = HostThrottle(per_host_limit=2)
+        with patch('utils.extract.fetching_content', side_effect=fetch):
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                list(executor.map(throttle.fetch, [f'https://fashion-studio.dicoding.dev/page{i}' for i in range(2, 8)]))
+
+        assert max(peak) == 2
+
+class TestScrapeDataProcessPool:
+    @staticmethod
+    def without_timestamp(records):
+        return [{k: v for k, v in record.items() if k != 'Timestamp'} for record in records]
+
+    @patch('builtins.print')
+    def test_process_pool_matches_in_process(self, mock_print):
+        # 10 halaman berisi + halaman ke-11 kosong
+        pages = {build_page_url('https://fashion-studio.dicoding.dev/', n): render_page(n, page_count=10) for n in range(1, 12)}
+
+        with patch('utils.extract.fetching_content', side_effect=pages.get):
+            in_process = scrape_data('https://fashion-studio.dicoding.dev/', delay=0)
+            pooled = scrape_data('https://fashion-studio.dicoding.dev/', delay=0, process_pool=True, parse_workers=2)
+
+        assert len(pooled) == 200
+        assert self.without_timestamp(pooled) == self.without_timestamp(in_process)
+
+    @patch('builtins.print')
+    def test_process_pool_records_parse_seconds(self, mock_print):
+        pages = {build_page_url('https://fashion-studio.dicoding.dev/', n): render_page(n, page_count=10) for n in range(1, 11)}
+        metrics = get_registry()
+        metrics.reset()
+
+        with patch('utils.extract.fetching_content', side_effect=pages.get):
+            scrape_data('https://fashion-studio.dicoding.dev/', delay=0, process_pool=True, parse_workers=2)
+
+        parsed = [page for page in metrics.snapshot()['pages'] if page.get('parse_seconds', 0) > 0]
+        assert [page['page'] for page in parsed] == list(range(1, 11))
+
+    @patch('builtins.print')
+    def test_process_pool_stops_at_failed_page_in_order(self, mock_print):
+        pages = {build_page_url('https://fashion-studio.dicoding.dev/', n): render_page(n) for n in range(1, 4)}
+
+        with patch('utils.extract.fetching_content', side_effect=pages.get):
+            result = scrape_data('https://fashion-studio.dicoding.dev/', delay=0, process_pool=True, parse_workers=2)
+
+        assert len(result) == 60
+        assert mock_print.call_args_list[-1] == call("Gagal mengambil konten untuk halaman 4")
+
+    @patch('utils.extract.ProcessPoolExecutor')
+    @patch('utils.extract.fetching_content')
+    @patch('builtins.print')
+    def test_small_crawl_parses_in_process(self, mock_print, mock_fetch, mock_pool):
+        # Crawl di bawah PROCESS_POOL_MIN_PAGES tidak membuat proses worker
+        mock_fetch.return_value = render_page(1)
+
+        result = scrape_data('https://fashion-studio.dicoding.dev/', delay=0, max_pages=PROCESS_POOL_MIN_PAGES - 1,
+                             process_pool=True, parse_workers=4)
+
+        assert len(result) == 20 * (PROCESS_POOL_MIN_PAGES - 1)
+        mock_pool.assert_not_called()
+
+class TestIterScrape:
+    @patch('utils.extract.fetching_content')
+    @patch('builtins.print')
+    def test_iter_scrape_pages_is_lazy(self, mock_print, mock_fetch):
+        # Halaman berikutnya baru diambil ketika konsumen meminta batch berikutnya
+        mock_fetch.return_value = render_page(1)
+
+        pages = iter_scrape_pages('https://fashion-studio.dicoding.dev/', delay=0)
+        page_number, records = next(pages)
+
+        assert page_number == 1
+        assert len(records) == 20
+        assert mock_fetch.call_count == 1
+        pages.close()
+
+    @patch('utils.extract.fetching_content')
+    @patch('builtins.print')
+    def test_iter_scrape_yields_records_in_order(self, mock_print, mock_fetch):
+        mock_fetch.side_effect = [render_page(1), render_page(2), None]
+
+        records = list(iter_scrape('https://fashion-studio.dicoding.dev/', delay=0))
+
+        assert len(records) == 40
+        assert [record['Title'] for record in records[:20]] == [record['Title'] for record in extract_page_records(render_page(1))]
+        assert all(set(record) == {'Title', 'Price', 'Rating', 'Color', 'Size', 'Gender', 'Timestamp'} for record in records)
+
+class TestPaginationDiscovery:
+    def test_discover_from_page_of_text(self):
+        assert discover_page_count(render_page(1, page_count=50)) == 50
+
+    def test_discover_from_numbered_links(self):
+        html = '''<ul class="pagination">
+            <li><a href="/">1</a></li><li><a href="/page2">2</a></li><li><a href="/page7">7</a></li>
+        </ul>'''
+        assert discover_page_count(html) == 7
+
+    def test_discover_unknown_with_only_next_link(self):
+        html = '<ul class="pagination"><li class="next"><a href="/page2">Next</a></li></ul>'
+        assert discover_page_count(html) is None
+        assert discover_page_count('<html><body>Tanpa pagination</body></html>') is None
+
+    @patch('builtins.print')
+    def test_scrape_fetches_exactly_discovered_pages(self, mock_print):
+        # Halaman 4 masih berisi produk, tetapi pagination menyatakan hanya ada 3 halaman
+        with patch('utils.extract.fetching_content', side_effect=lambda url: render_page(1, page_count=3)) as mock_fetch:
+            result = scrape_data('https://fashion-studio.dicoding.dev/', delay=0)
+
+        assert mock_fetch.call_count == 3
+        assert len(result) == 60
+
+    @pytest.mark.parametrize('max_workers', [1, 4])
+    @patch('builtins.print')
+    def test_scrape_follows_catalog_beyond_default_pages(self, mock_print, max_workers):
+        base_url = 'https://fashion-studio.dicoding.dev/'
+        pages = {build_page_url(base_url, n): render_page(n, page_count=60, products_per_page=1) for n in range(1, 61)}
+
+        with patch('utils.extract.fetching_content', side_effect=pages.get) as mock_fetch:
+            result = scrape_data(base_url, delay=0, max_workers=max_workers)
+
+        assert len(result) == 60
+        assert sorted(args[0] for args, _ in mock_fetch.call_args_list) == sorted(pages)
+
 # Tambahkan module-level tests setelah kelas-kelas test dan sebelum entrypoint
 
 def test_fetching_content_get_request_exception_module(monkeypatch):
@@ -323,6 +556,8 @@ def test_fetching_content_get_request_exception_module(monkeypatch):
     class DummySession:
         def get(self, url, headers=None):
             raise requests.exceptions.RequestException("Network failure")
+        def close(self):
+            pass
     monkeypatch.setattr("utils.extract.requests.Session", lambda: DummySession())
     url = "https://fashion-studio.dicoding.dev/"
     with pytest.raises(requests.exceptions.RequestException):
@@ -0,0 +1,116 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.http_cache import HttpCache
+from utils.http_client import HttpClient
+from utils.extract import fetching_content, scrape_data
+from benchmarks.stub_server import run_stub_server
+
+URL = 'https://fashion-studio.dicoding.dev/'
+
+class TestHttpCache:
+    def test_conditional_headers_for_stored_page(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        assert cache.conditional_headers(URL) == {}
+
+        cache.store(URL, b'<html></html>', etag='"abc"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+
+        assert cache.conditional_headers(URL) == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+        }
+
+    def test_index_persists_between_runs(self, tmp_path):
+        HttpCache(str(tmp_path)).store(URL, b'body', etag='"v1"')
+
+        cache = HttpCache(str(tmp_path))
+
+        assert cache.conditional_headers(URL) == {'If-None-Match': '"v1"'}
+        assert cache.load(URL) == b'body'
+        assert cache.report()['hits'] == 1
+
+    def test_hits_update_recency_in_memory_until_flush(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        cache.store(URL, b'body', etag='"v1"')
+        stored_at = cache._index[URL]['last_used']
+
+        # Hit tidak menulis ulang index.json; urutan LRU baru disimpan saat close()
+        with patch.object(cache, '_write_index', wraps=cache._write_index) as write_index:
+            for _ in range(5):
+                assert cache.load(URL) == b'body'
+            assert write_index.call_count == 0
+            assert HttpCache(str(tmp_path))._index[URL]['last_used'] == stored_at
+
+            cache.close()
+            cache.close()
+            assert write_index.call_count == 1
+
+        assert HttpCache(str(tmp_path))._index[URL]['last_used'] > stored_at
+
+    def test_response_without_validators_is_not_stored(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        cache.store(URL, b'body')
+
+        assert cache.conditional_headers(URL) == {}
+        assert cache.report() == {'hits': 0, 'misses': 1, 'entries': 0, 'bytes': 0}
+
+    def test_eviction_keeps_size_bounded(self, tmp_path):
+        # Batas 10 byte: entri yang paling lama tidak dipakai dibuang lebih dulu
+        cache = HttpCache(str(tmp_path), max_bytes=10)
+        cache.store(f'{URL}page1', b'12345', etag='"1"')
+        cache.store(f'{URL}page2', b'12345', etag='"2"')
+        cache.load(f'{URL}page1')
+        cache.store(f'{URL}page3', b'12345', etag='"3"')
+
+        assert cache.size() <= 10
+        assert cache.conditional_headers(f'{URL}page2') == {}
+        assert cache.load(f'{URL}page1') == b'12345'
+        assert cache.load(f'{URL}page3') == b'12345'
+
+    def test_fetching_content_serves_304_from_cache(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        cache.store(URL, b'cached body', etag='"abc"')
+
+        client = MagicMock()
+        client.get.return_value.status_code = 304
+
+        assert fetching_content(URL, client=client, cache=cache) == b'cached body'
+        client.get.assert_called_once_with(URL, headers={'If-None-Match': '"abc"'})
+        assert cache.report()['hits'] == 1
+
+    @patch('utils.extract.requests.Session')
+    def test_fetching_content_refetches_when_body_missing(self, mock_session, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        cache.store(URL, b'old', etag='"abc"')
+        os.remove(cache._body_path(URL))
+
+        not_modified = MagicMock(status_code=304)
+        fresh = MagicMock(status_code=200, content=b'new', headers={'ETag': '"def"'})
+        mock_session.return_value.get.side_effect = [not_modified, fresh]
+
+        assert fetching_content(URL, cache=cache) == b'new'
+        assert cache.conditional_headers(URL) == {'If-None-Match': '"def"'}
+
+    @patch('builtins.print')
+    def test_second_crawl_is_served_from_cache(self, mock_print, tmp_path):
+        with run_stub_server(page_count=3) as base_url:
+            with HttpClient() as client:
+                first = scrape_data(base_url, delay=0, client=client, cache=HttpCache(str(tmp_path)))
+                cache = HttpCache(str(tmp_path))
+                second = scrape_data(base_url, delay=0, client=client, cache=cache)
+
+        assert [item['Title'] for item in first] == [item['Title'] for item in second]
+        # Ketiga halaman (jumlahnya terbaca dari pagination) dijawab 304 pada run kedua
+        assert cache.report()['hits'] == 3
+        assert cache.report()['misses'] == 0
+
+# Tambahkan entrypoint agar test dapat dijalankan langsung
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main([__file__]))
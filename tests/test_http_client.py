@@ -0,0 +1,54 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.http_client import HttpClient, HEADERS
+from utils.extract import scrape_data
+from benchmarks.stub_server import run_stub_server
+
+class TestHttpClient:
+    def test_http_client_reuses_connection(self):
+        # Lima request berurutan ke host yang sama cukup memakai satu koneksi
+        with run_stub_server(page_count=5) as base_url:
+            with HttpClient() as client:
+                for page in range(1, 6):
+                    response = client.get(base_url if page == 1 else f"{base_url}page{page}")
+                    assert response.status_code == 200
+                stats = client.stats()
+
+        assert stats == {'requests': 5, 'connections_opened': 1, 'connections_reused': 4}
+
+    def test_http_client_sends_default_headers(self):
+        client = HttpClient()
+        assert client.session.headers['User-Agent'] == HEADERS['User-Agent']
+        client.close()
+
+    def test_http_client_context_manager_closes_session(self):
+        with HttpClient() as client:
+            client.session = MagicMock()
+        client.session.close.assert_called_once()
+        assert client.closed is True
+
+    @patch('builtins.print')
+    def test_scrape_data_with_shared_client(self, mock_print):
+        # Seluruh halaman (serial maupun paralel) melewati pool koneksi yang sama
+        with run_stub_server(page_count=3) as base_url:
+            with HttpClient(pool_maxsize=2) as client:
+                serial = scrape_data(base_url, delay=0, client=client)
+                concurrent = scrape_data(base_url, delay=0, client=client, max_workers=2)
+                stats = client.stats()
+
+        assert len(serial) == len(concurrent) == 60
+        # Jumlah halaman terbaca dari pagination, jadi tiap crawl tepat 3 request
+        assert stats['requests'] == 6
+        assert stats['connections_opened'] <= 2
+
+# Tambahkan entrypoint agar test dapat dijalankan langsung
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main([__file__]))
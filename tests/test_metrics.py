@@ -0,0 +1,128 @@
+import pytest
+import sys
+import os
+import json
+import pandas as pd
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.metrics import MetricsRegistry, get_registry
+from utils.pipeline import run_pipeline
+from utils.transform import clean_dataframe
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    get_registry().reset()
+    yield
+    get_registry().reset()
+
+def counter(snapshot, name, **labels):
+    return sum(series['value'] for series in snapshot['counters'].get(name, [])
+               if all(series['labels'].get(k) == str(v) for k, v in labels.items()))
+
+class TestMetricsRegistry:
+    def test_counters_accumulate_per_label_set(self):
+        registry = MetricsRegistry()
+        registry.inc('pages_total', result='ok')
+        registry.inc('pages_total', 2, result='ok')
+        registry.inc('pages_total', result='failed')
+
+        snapshot = registry.snapshot()
+
+        assert counter(snapshot, 'pages_total', result='ok') == 3
+        assert counter(snapshot, 'pages_total', result='failed') == 1
+
+    def test_prometheus_histogram_is_cumulative(self):
+        registry = MetricsRegistry(prefix='test')
+        registry.observe('latency_seconds', 0.02, buckets=(0.05, 0.5), status=200)
+        registry.observe('latency_seconds', 0.2, buckets=(0.05, 0.5), status=200)
+        registry.observe('latency_seconds', 3.0, buckets=(0.05, 0.5), status=200)
+
+        text = registry.to_prometheus()
+
+        assert '# TYPE test_latency_seconds histogram' in text
+        assert 'test_latency_seconds_bucket{status="200",le="0.05"} 1' in text
+        assert 'test_latency_seconds_bucket{status="200",le="0.5"} 2' in text
+        assert 'test_latency_seconds_bucket{status="200",le="+Inf"} 3' in text
+        assert 'test_latency_seconds_count{status="200"} 3' in text
+        assert text.endswith('\n')
+
+    def test_prometheus_escapes_label_values(self):
+        registry = MetricsRegistry(prefix='test')
+        registry.set('sink_success', 1, sink='Google "Sheets"')
+
+        assert 'test_sink_success{sink="Google \\"Sheets\\""} 1' in registry.to_prometheus()
+
+    def test_stage_records_failure_and_reraises(self):
+        registry = MetricsRegistry()
+        with pytest.raises(RuntimeError):
+            with registry.stage('load', rows_in=5):
+                raise RuntimeError('gagal')
+
+        stage = registry.snapshot()['stages']['load']
+        assert stage['success'] is False
+        assert stage['rows_in'] == 5
+        assert stage['seconds'] >= 0
+
+    def test_record_page_merges_fields(self):
+        registry = MetricsRegistry()
+        registry.record_page(2, fetch_seconds=0.1, bytes=100)
+        registry.record_page(2, parse_seconds=0.01, records=20, result='ok')
+
+        snapshot = registry.snapshot()
+
+        assert snapshot['pages'] == [{'page': 2, 'fetch_seconds': 0.1, 'bytes': 100,
+                                      'parse_seconds': 0.01, 'records': 20, 'result': 'ok'}]
+        assert snapshot['histograms']['scrape_page_fetch_seconds'][0]['count'] == 1
+
+    def test_write_creates_json_and_prometheus_files(self, tmp_path):
+        registry = MetricsRegistry()
+        registry.inc('scrape_records_total', 20)
+
+        json_path, prometheus_path = registry.write(str(tmp_path / 'metrics'))
+
+        with open(json_path, encoding='utf-8') as f:
+            assert counter(json.load(f), 'scrape_records_total') == 20
+        with open(prometheus_path, encoding='utf-8') as f:
+            assert 'etl_scrape_records_total 20' in f.read()
+
+class TestPipelineInstrumentation:
+    def test_clean_dataframe_counts_dropped_rows_per_rule(self):
+        raw = pd.DataFrame([
+            {'Title': 'Unknown Product', 'Price': '$1.00', 'Rating': '4.0', 'Color': '1 Color',
+             'Size': 'Size: M', 'Gender': 'Gender: Men'},
+            {'Title': 'Product 1', 'Price': 'Price Unavailable', 'Rating': 'Invalid Rating', 'Color': '1 Color',
+             'Size': 'Size: M', 'Gender': 'Gender: Men'},
+            {'Title': 'Product 2', 'Price': '$1.00', 'Rating': 'Invalid Rating', 'Color': '1 Color',
+             'Size': 'Size: M', 'Gender': 'Gender: Men'},
+            {'Title': 'Product 3', 'Price': '$1.00', 'Rating': '4.0', 'Color': '1 Color',
+             'Size': 'Size: M', 'Gender': 'Gender: Men'},
+        ])
+
+        df = clean_dataframe(raw)
+        snapshot = get_registry().snapshot()
+
+        assert df['Title'].tolist() == ['Product 3']
+        assert counter(snapshot, 'transform_rows_dropped_total', rule='invalid_title') == 1
+        assert counter(snapshot, 'transform_rows_dropped_total', rule='missing_Price') == 1
+        assert counter(snapshot, 'transform_rows_dropped_total', rule='missing_Rating') == 1
+
+    def test_run_pipeline_records_transform_and_sink_metrics(self):
+        raw = pd.DataFrame([
+            {'Title': 'Product 1', 'Price': '$100.00', 'Rating': '4.8', 'Color': '3 Colors',
+             'Size': 'Size: M', 'Gender': 'Gender: Men', 'Timestamp': '2023-04-01 12:00:00.000'},
+        ] * 2)
+
+        run_pipeline(raw, {'ok': lambda df: True, 'broken': lambda df: False})
+        snapshot = get_registry().snapshot()
+
+        assert snapshot['stages']['transform']['rows_in'] == 2
+        assert snapshot['stages']['transform']['rows_out'] == 1
+        assert counter(snapshot, 'transform_rows_dropped_total', rule='duplicate') == 1
+        assert snapshot['stages']['load']['success'] is False
+        success = {series['labels']['sink']: series['value'] for series in snapshot['gauges']['load_sink_success']}
+        assert success == {'ok': 1, 'broken': 0}
+
+if __name__ == '__main__':
+    pytest.main()
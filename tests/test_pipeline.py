@@ -0,0 +1,125 @@
+import pytest
+import sys
+import os
+import threading
+import time
+import pandas as pd
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.pipeline import collect_batches, run_pipeline, run_sinks, wait_for_sinks
+from utils.transform import transform_data
+
+RAW_RECORDS = [
+    {'Title': 'Product 1', 'Price': '$100.00', 'Rating': ' 4.8 ', 'Color': '3 Colors',
+     'Size': ' M', 'Gender': ' Men', 'Timestamp': '2023-04-01 12:00:00.000'},
+    {'Title': 'Unknown Product', 'Price': 'Price Unavailable', 'Rating': ' Invalid Rating ', 'Color': '5 Colors',
+     'Size': ' M', 'Gender': ' Men', 'Timestamp': '2023-04-01 12:01:00.000'},
+    {'Title': 'Product 2', 'Price': '$20.50', 'Rating': ' 3.9 ', 'Color': '1 Color',
+     'Size': ' L', 'Gender': ' Women', 'Timestamp': '2023-04-01 12:02:00.000'},
+]
+
+class TestCollectBatches:
+    def test_collect_batches_concatenates_non_empty_batches(self):
+        df = collect_batches([RAW_RECORDS[:1], [], pd.DataFrame(RAW_RECORDS[1:])])
+
+        assert df['Title'].tolist() == ['Product 1', 'Unknown Product', 'Product 2']
+        assert df.index.tolist() == [0, 1, 2]
+
+    def test_collect_batches_empty(self):
+        assert collect_batches(iter([[], []])).empty
+
+class TestRunPipeline:
+    def test_sinks_receive_the_transformed_frame(self, tmp_path):
+        received = {}
+        sinks = {
+            'ok': lambda df: received.setdefault('ok', df) is not None,
+            'failing': lambda df: False,
+        }
+
+        result = run_pipeline(pd.DataFrame(RAW_RECORDS), sinks)
+
+        assert {name: sink.success for name, sink in result.sinks.items()} == {'ok': True, 'failing': False}
+        assert received['ok'] is result.data
+        assert result.data['Title'].tolist() == ['Product 2', 'Product 1']
+        assert result.data['Price'].tolist() == [328000.0, 1600000.0]
+        # Tanpa debug_dir tidak ada file perantara
+        assert os.listdir(tmp_path) == []
+
+    def test_debug_dir_writes_intermediate_csv(self, tmp_path):
+        raw = pd.DataFrame(RAW_RECORDS)
+        debug_dir = tmp_path / 'debug'
+
+        run_pipeline(raw, {}, debug_dir=str(debug_dir))
+
+        assert sorted(os.listdir(debug_dir)) == ['scrapped_data.csv', 'transformed.csv']
+        # Hasil tahap in-memory sama dengan transform_data berbasis file
+        transform_data(str(debug_dir / 'scrapped_data.csv'), str(tmp_path / 'expected.csv'))
+        pd.testing.assert_frame_equal(pd.read_csv(debug_dir / 'transformed.csv'),
+                                      pd.read_csv(tmp_path / 'expected.csv'))
+
+class TestRunSinks:
+    def test_sinks_run_concurrently_and_are_timed(self):
+        data = pd.DataFrame({'A': [1]})
+        barrier = threading.Barrier(3, timeout=2)
+
+        def sink(df):
+            # Hanya lolos jika ketiga sink berjalan bersamaan
+            barrier.wait()
+            time.sleep(0.1)
+            return df is data
+
+        start = time.perf_counter()
+        results = run_sinks(data, {'csv': sink, 'postgres': sink, 'sheets': sink})
+        elapsed = time.perf_counter() - start
+
+        assert list(results) == ['csv', 'postgres', 'sheets']
+        assert all(result.success and result.error is None for result in results.values())
+        assert all(0.1 <= result.seconds < elapsed + 0.01 for result in results.values())
+        assert elapsed < 0.3
+
+    def test_failure_exception_and_timeout_are_reported_per_sink(self):
+        release = threading.Event()
+
+        def raising(df):
+            raise RuntimeError('koneksi ditolak')
+
+        results = run_sinks(pd.DataFrame(), {
+            'ok': lambda df: True,
+            'failed': lambda df: False,
+            'raising': raising,
+            'slow': lambda df: release.wait(5),
+        }, timeout=0.2)
+        release.set()
+
+        assert results['ok'].success is True
+        assert results['failed'].success is False
+        assert results['raising'].error == 'koneksi ditolak'
+        assert results['slow'].success is False
+        assert 'timeout' in results['slow'].error
+        assert results['slow'].seconds < 1
+
+    def test_per_sink_timeout_overrides_default(self):
+        results = run_sinks(pd.DataFrame(), {
+            'slow': lambda df: time.sleep(0.2) or True,
+            'strict': lambda df: time.sleep(0.2) or True,
+        }, timeout=1, timeouts={'strict': 0.05})
+
+        assert results['slow'].success is True
+        assert results['strict'].success is False
+
+    def test_wait_for_sinks_tracks_timed_out_threads(self):
+        release = threading.Event()
+        results = run_sinks(pd.DataFrame(), {'stuck': lambda df: release.wait(5)}, timeout=0.05)
+
+        assert results['stuck'].success is False
+        assert 'stuck' in wait_for_sinks(timeout=0.05)
+        release.set()
+        assert wait_for_sinks(timeout=5) == []
+
+# Tambahkan entrypoint agar test dapat dijalankan langsung
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main([__file__]))
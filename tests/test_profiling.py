@@ -0,0 +1,83 @@
+import pytest
+import sys
+import os
+import pstats
+import tracemalloc
+import pandas as pd
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.pipeline import run_pipeline
+from utils.profiling import StageProfiler, run_directory
+
+RAW = pd.DataFrame([
+    {'Title': 'Product 1', 'Price': '$100.00', 'Rating': '4.8', 'Color': '3 Colors',
+     'Size': 'Size: M', 'Gender': 'Gender: Men', 'Timestamp': '2023-04-01 12:00:00.000'},
+])
+
+def busy_work():
+    return sum(i * i for i in range(10_000))
+
+class TestStageProfiler:
+    def test_disabled_profiler_writes_nothing(self, tmp_path):
+        profiler = StageProfiler()
+
+        with profiler.stage('transform'):
+            busy_work()
+
+        assert not profiler.enabled
+        assert profiler.reports == []
+        assert profiler.wrap('load', busy_work) is busy_work
+
+    def test_stage_writes_pstats_and_text_report(self, tmp_path):
+        profiler = StageProfiler(str(tmp_path), top_n=5)
+
+        with profiler.stage('transform'):
+            busy_work()
+
+        stats = pstats.Stats(str(tmp_path / 'transform.pstats'))
+        assert any(func[2] == 'busy_work' for func in stats.stats)
+        assert 'busy_work' in (tmp_path / 'transform.txt').read_text(encoding='utf-8')
+
+    def test_memory_report_and_tracemalloc_stopped(self, tmp_path):
+        profiler = StageProfiler(str(tmp_path), memory=True)
+
+        with profiler.stage('scrape', cpu=False):
+            data = [str(i) * 10 for i in range(10_000)]
+
+        report = (tmp_path / 'scrape.memory.txt').read_text(encoding='utf-8')
+        assert report.startswith('Puncak memori yang dilacak')
+        assert not (tmp_path / 'scrape.pstats').exists()
+        assert not tracemalloc.is_tracing()
+        assert len(data) == 10_000
+
+    def test_report_is_written_when_stage_raises(self, tmp_path):
+        profiler = StageProfiler(str(tmp_path))
+
+        with pytest.raises(RuntimeError):
+            with profiler.stage('load'):
+                raise RuntimeError('gagal')
+
+        assert (tmp_path / 'load.pstats').exists()
+
+    def test_run_directory_is_unique(self, tmp_path):
+        first = run_directory(str(tmp_path))
+        second = run_directory(str(tmp_path))
+
+        assert first != second
+        assert os.path.isdir(first) and os.path.isdir(second)
+
+class TestPipelineProfiling:
+    def test_run_pipeline_profiles_transform_and_each_sink(self, tmp_path):
+        profiler = StageProfiler(str(tmp_path), memory=True)
+
+        result = run_pipeline(RAW, {'CSV': lambda df: True, 'Google Sheets': lambda df: True}, profiler=profiler)
+
+        assert all(sink.success for sink in result.sinks.values())
+        files = set(os.listdir(tmp_path))
+        assert {'transform.pstats', 'transform.txt', 'transform.memory.txt',
+                'load.memory.txt', 'load-csv.pstats', 'load-google-sheets.pstats'} <= files
+
+if __name__ == '__main__':
+    pytest.main()
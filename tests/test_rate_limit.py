@@ -0,0 +1,167 @@
+import pytest
+import sys
+import os
+import time
+import requests
+from email.utils import formatdate
+from unittest.mock import patch, MagicMock
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.rate_limit import AdaptiveRateLimiter, RetryPolicy, parse_retry_after
+from utils.extract import fetching_content, scrape_data
+from utils.sample_catalog import render_page
+
+URL = 'https://fashion-studio.dicoding.dev/'
+
+def make_response(status_code, content=b'', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status_code} Error")
+    return response
+
+class TestParseRetryAfter:
+    def test_parse_retry_after_seconds(self):
+        assert parse_retry_after('120') == 120.0
+
+    def test_parse_retry_after_http_date(self):
+        value = formatdate(time.time() + 30, usegmt=True)
+        assert 28 <= parse_retry_after(value) <= 30
+
+    def test_parse_retry_after_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('besok') is None
+
+class TestAdaptiveRateLimiter:
+    def test_rate_increases_on_fast_responses(self):
+        limiter = AdaptiveRateLimiter(rate=1.0, increase=0.5, max_rate=2.0)
+        for _ in range(5):
+            limiter.record(0.05, 200)
+        assert limiter.rate == 2.0
+
+    def test_rate_decreases_on_throttling_and_slow_responses(self):
+        limiter = AdaptiveRateLimiter(rate=8.0, decrease=0.5, target_latency=1.0, min_rate=1.0)
+        limiter.record(0.05, 429)
+        assert limiter.rate == 4.0
+        limiter.record(2.5, 200)
+        assert limiter.rate == 2.0
+        limiter.record(0.05, 503)
+        limiter.record(0.05, 503)
+        assert limiter.rate == 1.0
+
+    def test_acquire_respects_rate(self):
+        limiter = AdaptiveRateLimiter(rate=50.0, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        # Token pertama langsung tersedia, lima berikutnya masing-masing ~20 ms
+        assert time.monotonic() - start >= 0.09
+
+    def test_retry_after_pauses_acquire(self):
+        limiter = AdaptiveRateLimiter(rate=100.0)
+        limiter.acquire()
+        limiter.record(0.01, 429, retry_after=0.2)
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.15
+
+class TestRetryPolicy:
+    def test_backoff_is_jittered_and_bounded(self):
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=5.0)
+        delays = [policy.backoff(attempt) for attempt in range(10) for _ in range(20)]
+        assert all(0 <= delay <= 5.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_backoff_honours_retry_after(self):
+        policy = RetryPolicy(backoff_base=0.1, backoff_max=0.2)
+        assert policy.backoff(0, retry_after=10) == 10
+
+class TestFetchingContentRetry:
+    @patch('utils.extract.time.sleep')
+    @patch('builtins.print')
+    def test_transient_status_is_retried(self, mock_print, mock_sleep):
+        client = MagicMock()
+        client.get.side_effect = [
+            make_response(503, headers={'Retry-After': '2'}),
+            make_response(429),
+            make_response(200, b'ok'),
+        ]
+
+        result = fetching_content(URL, client=client, retry=RetryPolicy(max_retries=3, backoff_base=0.01))
+
+        assert result == b'ok'
+        assert client.get.call_count == 3
+        # Retry-After dari respons 503 dipatuhi
+        assert mock_sleep.call_args_list[0].args[0] == 2.0
+
+    @patch('utils.extract.time.sleep')
+    @patch('builtins.print')
+    def test_retries_exhausted_returns_none(self, mock_print, mock_sleep):
+        client = MagicMock()
+        client.get.return_value = make_response(500)
+
+        result = fetching_content(URL, client=client, retry=RetryPolicy(max_retries=2))
+
+        assert result is None
+        assert client.get.call_count == 3
+
+    @patch('utils.extract.time.sleep')
+    @patch('builtins.print')
+    def test_connection_error_is_retried(self, mock_print, mock_sleep):
+        client = MagicMock()
+        client.get.side_effect = [requests.exceptions.ConnectionError('reset'), make_response(200, b'ok')]
+
+        assert fetching_content(URL, client=client, retry=RetryPolicy()) == b'ok'
+
+    @patch('builtins.print')
+    def test_client_errors_are_not_retried(self, mock_print):
+        client = MagicMock()
+        client.get.return_value = make_response(404)
+
+        assert fetching_content(URL, client=client, retry=RetryPolicy()) is None
+        assert client.get.call_count == 1
+
+    def test_rate_limiter_receives_feedback(self):
+        client = MagicMock()
+        client.get.return_value = make_response(200, b'ok')
+        limiter = MagicMock()
+
+        fetching_content(URL, client=client, rate_limiter=limiter)
+
+        limiter.acquire.assert_called_once()
+        assert limiter.record.call_args.args[1] == 200
+
+class TestScrapeDataSkipFailedPages:
+    @patch('utils.extract.time.sleep')
+    @patch('builtins.print')
+    def test_failed_page_is_skipped(self, mock_print, mock_sleep):
+        # Halaman 2 gagal permanen; crawl tetap lanjut ke halaman 3 dan berhenti di halaman kosong
+        def fetch(url, **kwargs):
+            if url.endswith('page2'):
+                return None
+            if url.endswith('page4'):
+                return b'<html></html>'
+            return render_page(3 if url.endswith('page3') else 1)
+
+        with patch('utils.extract.fetching_content', side_effect=fetch):
+            result = scrape_data(URL, delay=0, skip_failed_pages=True, retry=RetryPolicy())
+
+        assert len(result) == 40
+
+    @patch('utils.extract.time.sleep')
+    @patch('builtins.print')
+    def test_rate_limiter_replaces_fixed_delay(self, mock_print, mock_sleep):
+        with patch('utils.extract.fetching_content', side_effect=[render_page(1), None]):
+            scrape_data(URL, delay=1, rate_limiter=AdaptiveRateLimiter())
+
+        assert all(call.args[0] == 0 for call in mock_sleep.call_args_list)
+
+# Tambahkan entrypoint agar test dapat dijalankan langsung
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main([__file__]))
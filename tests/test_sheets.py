@@ -0,0 +1,176 @@
+import pytest
+import sys
+import os
+import re
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.sheets import SheetsWriter, a1_range, changed_row_ranges, column_letter
+
+class StubRequest:
+    def __init__(self, action):
+        self.action = action
+
+    def execute(self):
+        return self.action()
+
+class StubSheetsService:
+    """Pengganti service Sheets API: menyimpan isi sheet sebagai dict {(baris, kolom): nilai}."""
+
+    RANGE = re.compile(r"^'(?P<sheet>(?:[^']|'')+)'(?:!A(?P<first>\d+):(?P<col>[A-Z]+)(?P<last>\d+))?$")
+
+    def __init__(self):
+        self.cells = {}
+        self.calls = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def _parse(self, a1):
+        match = self.RANGE.match(a1)
+        assert match, a1
+        return match
+
+    def batchUpdate(self, spreadsheetId, body):
+        def action():
+            for item in body['data']:
+                first = int(self._parse(item['range'])['first'])
+                for r, row in enumerate(item['values']):
+                    for c, value in enumerate(row):
+                        self.cells[(first + r, c + 1)] = value
+            return {}
+        self.calls.append(('batchUpdate', body))
+        return StubRequest(action)
+
+    def batchClear(self, spreadsheetId, body):
+        def action():
+            for a1 in body['ranges']:
+                match = self._parse(a1)
+                if match['first'] is None:
+                    self.cells.clear()
+                    continue
+                for key in list(self.cells):
+                    if int(match['first']) <= key[0] <= int(match['last']):
+                        del self.cells[key]
+            return {}
+        self.calls.append(('batchClear', body))
+        return StubRequest(action)
+
+    def grid(self):
+        if not self.cells:
+            return []
+        rows = max(r for r, _ in self.cells)
+        cols = max(c for _, c in self.cells)
+        return [[self.cells.get((r, c)) for c in range(1, cols + 1)] for r in range(1, rows + 1)]
+
+def table(rows, price=10.0):
+    return [['Title', 'Price']] + [[f'Product {i}', price + i] for i in range(rows)]
+
+def test_a1_helpers():
+    assert [column_letter(i) for i in (1, 7, 26, 27, 52, 703)] == ['A', 'G', 'Z', 'AA', 'AZ', 'AAA']
+    assert a1_range("Fashion's", 2, 868, 7) == "'Fashion''s'!A2:G868"
+    assert changed_row_ranges(['a', 'b', 'c', 'd'], ['a', 'x', 'y', 'd', 'e']) == [(1, 3), (4, 5)]
+
+class TestSheetsWriter:
+    def test_first_upload_clears_and_writes_everything(self, tmp_path):
+        service = StubSheetsService()
+        service.cells[(900, 1)] = 'sisa upload lama'
+        writer = SheetsWriter(service, 'sheet-id', 'Fashion', snapshot_file=str(tmp_path / 'snapshot.json'))
+
+        result = writer.write(table(3))
+
+        assert service.grid() == table(3)
+        assert result == {'rows': 4, 'changed_rows': 4, 'cleared_rows': 0, 'requests': 2}
+        assert service.calls[1][1]['data'][0]['range'] == "'Fashion'!A1:B4"
+
+    def test_second_upload_sends_only_changed_rows(self, tmp_path):
+        service = StubSheetsService()
+        writer = SheetsWriter(service, 'sheet-id', 'Fashion', snapshot_file=str(tmp_path / 'snapshot.json'))
+        writer.write(table(10))
+        service.calls.clear()
+
+        values = table(10)
+        values[3][1] = 99.0
+        values[7][1] = 98.0
+        result = writer.write(values)
+
+        assert service.grid() == values
+        assert result['changed_rows'] == 2
+        assert [item['range'] for item in service.calls[0][1]['data']] == ["'Fashion'!A4:B4", "'Fashion'!A8:B8"]
+
+        # Tanpa perubahan tidak ada request sama sekali
+        service.calls.clear()
+        assert writer.write(values)['requests'] == 0
+        assert service.calls == []
+
+    def test_new_timestamps_alone_are_not_resent(self, tmp_path):
+        service = StubSheetsService()
+        writer = SheetsWriter(service, 'sheet-id', 'Fashion', snapshot_file=str(tmp_path / 'snapshot.json'))
+        header = ['Title', 'Price', 'Timestamp']
+        first = [header] + [[f'Product {i}', 10.0 + i, '2024-01-01 10:00:00.000'] for i in range(5)]
+        writer.write(first)
+        service.calls.clear()
+
+        # Run berikutnya: produk sama, Timestamp baru; hanya Product 2 yang berubah harga
+        second = [header] + [[f'Product {i}', 10.0 + i, '2024-01-02 10:00:00.000'] for i in range(5)]
+        second[3][1] = 99.0
+        result = writer.write(second)
+
+        assert result['changed_rows'] == 1
+        assert [item['range'] for item in service.calls[0][1]['data']] == ["'Fashion'!A4:C4"]
+        assert service.grid()[3] == second[3]
+        assert service.grid()[1][2] == '2024-01-01 10:00:00.000'
+
+    def test_shorter_upload_clears_leftover_rows(self, tmp_path):
+        service = StubSheetsService()
+        writer = SheetsWriter(service, 'sheet-id', 'Fashion', snapshot_file=str(tmp_path / 'snapshot.json'))
+        writer.write(table(10))
+
+        result = writer.write(table(4))
+
+        assert service.grid() == table(4)
+        assert result['cleared_rows'] == 6
+        assert result['changed_rows'] == 0
+
+    def test_large_upload_is_chunked(self, tmp_path):
+        service = StubSheetsService()
+        writer = SheetsWriter(service, 'sheet-id', 'Fashion', snapshot_file=None, max_cells=10)
+
+        result = writer.write(table(20))
+
+        assert service.grid() == table(20)
+        updates = [body for name, body in service.calls if name == 'batchUpdate']
+        assert len(updates) == result['requests'] - 1 == 5
+        for body in updates:
+            assert sum(len(item['values']) * 2 for item in body['data']) <= 10
+
+    def test_width_change_or_force_rewrites(self, tmp_path):
+        service = StubSheetsService()
+        snapshot_file = str(tmp_path / 'snapshot.json')
+        SheetsWriter(service, 'sheet-id', 'Fashion', snapshot_file=snapshot_file).write(table(3))
+
+        narrow = [[row[0]] for row in table(3)]
+        result = SheetsWriter(service, 'sheet-id', 'Fashion', snapshot_file=snapshot_file).write(narrow)
+        assert service.grid() == narrow
+        assert result['changed_rows'] == 4
+
+        result = SheetsWriter(service, 'sheet-id', 'Fashion', snapshot_file=snapshot_file).write(narrow, force=True)
+        assert result['changed_rows'] == 4
+
+    def test_snapshots_are_kept_per_sheet(self, tmp_path):
+        snapshot_file = str(tmp_path / 'snapshot.json')
+        SheetsWriter(StubSheetsService(), 'sheet-id', 'A', snapshot_file=snapshot_file).write(table(3))
+
+        result = SheetsWriter(StubSheetsService(), 'sheet-id', 'B', snapshot_file=snapshot_file).write(table(3))
+
+        assert result['changed_rows'] == 4
+
+# Tambahkan entrypoint agar test dapat dijalankan langsung
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main([__file__]))
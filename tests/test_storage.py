@@ -0,0 +1,72 @@
+import pytest
+import sys
+import os
+import pandas as pd
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.storage import TRANSFORMED_DTYPES, apply_dtypes, file_format, read_frame, write_frame
+from utils.transform import transform_data, transform_csv_chunked
+
+pytest.importorskip('pyarrow')
+
+RAW = pd.DataFrame({
+    'Title': ['Product 1', 'Product 2', 'Unknown Product'],
+    'Price': ['$100.00', '$20.50', 'Price Unavailable'],
+    'Rating': [' 4.8 ', ' 3.9 ', ' Invalid Rating '],
+    'Color': ['3 Colors', '1 Color', '5 Colors'],
+    'Size': [' M', ' L', ' M'],
+    'Gender': [' Men', ' Women', ' Men'],
+    'Timestamp': ['2023-04-01 12:00:00.123', '2023-04-01 12:02:00.456', '2023-04-01 12:03:00.000'],
+})
+
+class TestStorage:
+    def test_file_format_from_extension(self):
+        assert file_format('data/transformed.PARQUET') == 'parquet'
+        assert file_format('transformed.arrow') == 'feather'
+        with pytest.raises(ValueError):
+            file_format('transformed.xlsx')
+
+    @pytest.mark.parametrize('extension', ['csv', 'parquet', 'feather'])
+    def test_typed_round_trip(self, tmp_path, extension):
+        path = str(tmp_path / f'transformed.{extension}')
+        df = apply_dtypes(pd.DataFrame({
+            'Title': ['A', 'B'],
+            'Price': [1600000.0, 328000.0],
+            'Rating': [4.8, 3.9],
+            'Color': [3, 1],
+            'Size': ['M', 'L'],
+            'Gender': ['Men', 'Women'],
+            'Timestamp': ['2023-04-01 12:00:00.123', '2023-04-01 12:02:00.456'],
+        }), TRANSFORMED_DTYPES)
+
+        write_frame(df, path, TRANSFORMED_DTYPES)
+        result = read_frame(path, TRANSFORMED_DTYPES)
+
+        pd.testing.assert_frame_equal(result, df)
+        assert result['Color'].dtype == pd.Int64Dtype()
+        assert isinstance(result['Size'].dtype, pd.CategoricalDtype)
+        assert result['Timestamp'].dtype == 'datetime64[ns]'
+
+    def test_transform_data_parquet_matches_csv(self, tmp_path):
+        RAW.to_csv(tmp_path / 'raw.csv', index=False)
+        write_frame(RAW, str(tmp_path / 'raw.parquet'))
+
+        assert transform_data(str(tmp_path / 'raw.csv'), str(tmp_path / 'out.csv'))
+        assert transform_data(str(tmp_path / 'raw.parquet'), str(tmp_path / 'out.parquet'))
+
+        typed = read_frame(str(tmp_path / 'out.parquet'), TRANSFORMED_DTYPES)
+        from_csv = apply_dtypes(pd.read_csv(tmp_path / 'out.csv'), TRANSFORMED_DTYPES)
+        pd.testing.assert_frame_equal(typed.reset_index(drop=True), from_csv)
+        assert typed['Title'].tolist() == ['Product 2', 'Product 1']
+
+    def test_chunked_mode_requires_csv(self, tmp_path):
+        with pytest.raises(ValueError):
+            transform_csv_chunked(str(tmp_path / 'raw.parquet'), str(tmp_path / 'out.csv'))
+
+# Tambahkan entrypoint agar test dapat dijalankan langsung
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,75 @@
+import pytest
+import sys
+import os
+import contextlib
+import io
+import requests
+
+# Menambahkan direktori root ke sys.path agar bisa mengimpor utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.stub_server import base_url, run_stub_server, serve_stub
+from utils.extract import scrape_data
+from utils.http_client import HttpClient
+from utils.rate_limit import RetryPolicy
+
+class TestStubServer:
+    def test_serves_root_and_numbered_pages(self):
+        with run_stub_server(page_count=3) as url:
+            first = requests.get(url)
+            third = requests.get(f'{url}page3')
+            missing = requests.get(f'{url}about')
+
+        assert first.status_code == 200 and 'collection-card' in first.text
+        assert 'Page 3 of 3' in third.text
+        assert missing.status_code == 404
+
+    def test_etag_revalidation_returns_304(self):
+        with run_stub_server(page_count=1) as url:
+            etag = requests.get(url).headers['ETag']
+            revalidated = requests.get(url, headers={'If-None-Match': etag})
+
+        assert revalidated.status_code == 304
+        assert revalidated.content == b''
+
+    def test_etag_can_be_disabled(self):
+        with run_stub_server(page_count=1, etag=False) as url:
+            response = requests.get(url)
+
+        assert 'ETag' not in response.headers
+
+    def test_rate_limited_responses_carry_retry_after(self):
+        with run_stub_server(page_count=1, rate_limit_rate=1.0, retry_after=7) as url:
+            response = requests.get(url)
+
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '7'
+
+    def test_error_rate_and_stats(self):
+        with serve_stub(page_count=1, error_rate=1.0, error_status=500) as server:
+            statuses = [requests.get(base_url(server)).status_code for _ in range(3)]
+            stats = server.stats()
+
+        assert statuses == [500, 500, 500]
+        assert stats == {'requests': 3, 'statuses': {500: 3}}
+
+    def test_max_rps_rejects_bursts(self):
+        with serve_stub(page_count=1, max_rps=2) as server:
+            statuses = [requests.get(base_url(server)).status_code for _ in range(6)]
+
+        assert statuses[:2] == [200, 200]
+        assert 429 in statuses
+
+    def test_scrape_data_recovers_from_faults_with_retry(self):
+        with serve_stub(page_count=5, error_rate=0.3, rate_limit_rate=0.2, retry_after=0, seed=1) as server:
+            with HttpClient() as client, contextlib.redirect_stdout(io.StringIO()):
+                data = scrape_data(base_url(server), delay=0, max_pages=5, max_workers=4, client=client,
+                                   retry=RetryPolicy(max_retries=10, backoff_base=0.001))
+            stats = server.stats()
+
+        assert len(data) == 5 * 20
+        assert stats['statuses'][200] == 5
+        assert stats['requests'] > 5
+
+if __name__ == '__main__':
+    pytest.main()
@@ -1,8 +1,9 @@
 import pytest
 import sys
 import os
+import numpy as np
 import pandas as pd
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import ANY, patch, mock_open, MagicMock
 
 # Menambahkan direktori root ke sys.path agar bisa mengimpor utils
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -13,7 +14,19 @@ from utils.transform import (
     clean_colors, 
     clean_size, 
     clean_gender, 
-    transform_data
+    transform_data,
+    clean_dataframe,
+    iter_transform_batches,
+    clean_price_series,
+    clean_rating_series,
+    clean_colors_series,
+    clean_size_series,
+    clean_gender_series,
+    transform_csv_chunked,
+    CLEANING_METHODS,
+    MEMOIZED_CLEANERS,
+    MemoizedCleaner,
+    RowHashIndex
 )
 
 class TestCleanPrice:
@@ -107,7 +120,7 @@ class TestTransformData:
         
         # Memverifikasi hasil
         assert result is True
-        mock_read_csv.assert_called_once_with('input.csv')
+        mock_read_csv.assert_called_once_with('input.csv', dtype=ANY)
         mock_to_csv.assert_called_once()
     
     @patch('utils.transform.pd.read_csv')
@@ -201,6 +214,238 @@ def test_transform_data_no_timestamp(mock_to_csv, mock_read_csv):
     assert result is True
     mock_to_csv.assert_called_once()
 
+class TestIterTransformBatches:
+    def test_batches_are_cleaned_and_deduplicated_across_batches(self):
+        batch_1 = [
+            {'Title': 'A', 'Price': '$10.00', 'Rating': '4.0', 'Color': '1 Color', 'Size': 'Size: M', 'Gender': 'Gender: Men', 'Timestamp': '2023-01-01 12:00:00.000'},
+            {'Title': 'Unknown Product', 'Price': 'Price Unavailable', 'Rating': 'Invalid Rating', 'Color': '5 Colors', 'Size': 'Size: M', 'Gender': 'Gender: Men', 'Timestamp': '2023-01-01 12:00:00.000'},
+        ]
+        batch_2 = [
+            # Duplikat baris pertama dari batch sebelumnya
+            dict(batch_1[0]),
+            {'Title': 'B', 'Price': '$20.00', 'Rating': '4.5 / 5', 'Color': '2 Colors', 'Size': 'Size: L', 'Gender': 'Gender: Women', 'Timestamp': '2023-01-01 12:00:01.000'},
+        ]
+
+        frames = list(iter_transform_batches([batch_1, [], batch_2]))
+
+        assert [frame['Title'].tolist() for frame in frames] == [['A'], ['B']]
+        assert frames[1].iloc[0]['Price'] == 320000.0
+        assert frames[1].iloc[0]['Gender'] == 'Women'
+        assert str(frames[1]['Color'].dtype) == 'Int64'
+
+    def test_clean_dataframe_does_not_modify_input(self):
+        df = pd.DataFrame({
+            'Title': ['A'], 'Price': ['$10.00'], 'Rating': ['4.0'], 'Color': ['1 Color'],
+            'Size': ['Size: M'], 'Gender': ['Gender: Men']
+        })
+        cleaned = clean_dataframe(df)
+
+        assert df.iloc[0]['Price'] == '$10.00'
+        assert cleaned.iloc[0]['Price'] == 160000.0
+
+DIRTY_VALUES = [
+    '$100.00', ' $ 12.5 ', 'Price Unavailable', '$', '', '$abc', None, '100.00', '$-5', 3.5,
+    ' 4.8 ', '4.8 / 5', ' Invalid Rating ', 'Not Rated', '3', '4.5/5⭐', '/5',
+    '3 Colors', '1 Color', 'Colors', '10Colors x 2 Colors',
+    'Size: M', ' M', 'Size: Size: L', 'Gender: Men', ' Women', 'Gender:',
+]
+
+class TestVectorizedCleaning:
+    @pytest.mark.parametrize('scalar, vectorized', [
+        (clean_price, clean_price_series),
+        (clean_rating, clean_rating_series),
+        (clean_size, clean_size_series),
+        (clean_gender, clean_gender_series),
+    ])
+    def test_series_cleaner_matches_scalar_cleaner(self, scalar, vectorized):
+        # Fungsi skalar tetap menjadi acuan: hasil vectorized harus identik
+        raw = pd.Series(DIRTY_VALUES, dtype=object)
+        pd.testing.assert_series_equal(vectorized(raw), raw.apply(scalar), check_dtype=False)
+
+    @pytest.mark.parametrize('scalar, vectorized', [
+        (clean_price, clean_price_series),
+        (clean_rating, clean_rating_series),
+        (clean_colors, clean_colors_series),
+        (clean_size, clean_size_series),
+        (clean_gender, clean_gender_series),
+    ])
+    def test_unicode_digits_and_underscores_match_scalar_cleaner(self, scalar, vectorized):
+        # float()/int() menerima digit unicode dan '_'; nilai ini dibersihkan dengan fungsi skalar
+        raw = pd.Series(['$١٠٠', '$1_000.50', '$１２', '٣', '4_5', '４.５ / 5', '３ Colors', '٣ Colors',
+                         '1_0 Colors', 'Size:\u3000M', 'Gender:\x1fMen', 'Size: ＸＬ', '$100.00', '3 Colors',
+                         ' 4.8 ', None], dtype=object)
+        expected = raw.apply(scalar)
+        if scalar is clean_colors:
+            expected = expected.astype(pd.Int64Dtype())
+        pd.testing.assert_series_equal(vectorized(raw), expected, check_dtype=False)
+
+    def test_clean_colors_series_matches_scalar_cleaner(self):
+        raw = pd.Series(DIRTY_VALUES, dtype=object)
+        pd.testing.assert_series_equal(clean_colors_series(raw), raw.apply(clean_colors).astype(pd.Int64Dtype()))
+
+    def test_non_string_column_is_cleaned_to_missing(self):
+        # Sama seperti fungsi skalar: nilai non-string (mis. rating yang terbaca float) menjadi kosong
+        raw = pd.Series([4.5, 3.0])
+        assert clean_rating_series(raw).isna().all()
+        assert raw.apply(clean_rating).isna().all()
+
+    @pytest.mark.parametrize('column', ['Price', 'Rating', 'Color', 'Size', 'Gender'])
+    def test_memoized_cleaner_matches_reference(self, column):
+        raw = pd.Series(DIRTY_VALUES * 2, dtype=object)
+        pd.testing.assert_series_equal(
+            MEMOIZED_CLEANERS[column](raw), CLEANING_METHODS['reference'][column](raw), check_dtype=False)
+
+    def test_memoized_cleaner_parses_each_value_once(self):
+        cleaner = MemoizedCleaner('Size', clean_size, maxsize=2)
+        batch = pd.Series(['Size: M', 'Size: M', None, 'Size: L', 'Size: M'])
+
+        first = cleaner(batch)
+        second = cleaner(batch)
+
+        assert first.tolist() == second.tolist() == ['M', 'M', None, 'L', 'M']
+        # Batch kedua seluruhnya dilayani memo
+        assert cleaner.stats() == {'cells': 10, 'unique': 4, 'parsed': 2, 'memo_size': 2, 'hit_rate': 0.8}
+        cleaner.clear()
+        assert cleaner.stats()['cells'] == 0 and cleaner.stats()['memo_size'] == 0
+
+    def test_memo_is_bounded(self):
+        cleaner = MemoizedCleaner('Color', clean_colors, maxsize=3)
+        cleaner(pd.Series([f'{i} Colors' for i in range(10)]))
+
+        assert cleaner.stats()['memo_size'] == 3
+
+    def test_clean_dataframe_methods_are_identical(self):
+        raw = pd.DataFrame({
+            'Title': ['A', 'B', 'Unknown Product', 'C', None, 'D'],
+            'Price': ['$10.00', '$20.50', 'Price Unavailable', '$5', '$7.00', 'Price Unavailable'],
+            'Rating': [' 4.0 ', '4.5 / 5', ' Invalid Rating ', 'Not Rated', '3.3', '2.2'],
+            'Color': ['1 Color', '2 Colors', '5 Colors', '3 Colors', '4 Colors', 'Rating: 4'],
+            'Size': [' M', 'Size: L', ' M', ' S', ' XL', ' XXL'],
+            'Gender': [' Men', 'Gender: Women', ' Men', ' Unisex', ' Men', ' Women'],
+            'Timestamp': ['2023-01-01 12:00:00.000'] * 6,
+        })
+
+        pd.testing.assert_frame_equal(
+            clean_dataframe(raw, method='vectorized'),
+            clean_dataframe(raw, method='reference'),
+        )
+        pd.testing.assert_frame_equal(
+            clean_dataframe(raw, method='memoized'),
+            clean_dataframe(raw, method='reference'),
+        )
+
+def write_raw_csv(path, rows):
+    # rows: 1 produk per baris, dengan duplikat dan nilai kotor seperti hasil scraping
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+def raw_rows(count):
+    rows = []
+    for i in range(count):
+        rows.append({
+            'Title': 'Unknown Product' if i % 7 == 0 else f'Product {i % 40}',
+            'Price': 'Price Unavailable' if i % 11 == 0 else f'${10 + i % 40}.00',
+            'Rating': ' Not Rated ' if i % 13 == 0 else f' {1 + (i % 40) / 10} ',
+            'Color': f'{1 + i % 5} Colors',
+            'Size': ' M',
+            'Gender': ' Men',
+            # Timestamp berulang (duplikat antar chunk) dan tidak berurutan; satu nilai rusak
+            'Timestamp': 'bukan tanggal' if i == 5 else f'2023-01-01 12:{(i * 17) % 40:02d}:00.000',
+        })
+    return rows
+
+class TestTransformChunked:
+    def test_chunked_output_matches_in_memory(self, tmp_path):
+        input_file = tmp_path / 'raw.csv'
+        write_raw_csv(input_file, raw_rows(300))
+
+        assert transform_data(str(input_file), str(tmp_path / 'memory.csv'))
+        assert transform_data(str(input_file), str(tmp_path / 'chunked.csv'), chunksize=32)
+
+        expected = pd.read_csv(tmp_path / 'memory.csv')
+        actual = pd.read_csv(tmp_path / 'chunked.csv')
+        assert 0 < len(actual) < 300
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_chunked_output_matches_in_memory_with_mixed_milliseconds(self, tmp_path):
+        # Chunk pertama hanya berisi milidetik nol, chunk berikutnya tidak
+        rows = raw_rows(60)
+        for i, row in enumerate(rows[30:], start=30):
+            row['Timestamp'] = f'2023-01-02 08:{i % 60:02d}:00.{i * 7:03d}'
+        input_file = tmp_path / 'raw.csv'
+        write_raw_csv(input_file, rows)
+
+        assert transform_data(str(input_file), str(tmp_path / 'memory.csv'))
+        assert transform_data(str(input_file), str(tmp_path / 'chunked.csv'), chunksize=30)
+
+        with open(tmp_path / 'memory.csv', encoding='utf-8') as memory, open(tmp_path / 'chunked.csv', encoding='utf-8') as chunked:
+            assert chunked.read() == memory.read()
+        timestamps = pd.read_csv(tmp_path / 'chunked.csv', dtype={'Timestamp': str})['Timestamp'].dropna()
+        assert timestamps.str.fullmatch(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}').all()
+
+    def test_multi_pass_merge(self, tmp_path):
+        input_file = tmp_path / 'raw.csv'
+        write_raw_csv(input_file, raw_rows(300))
+        transform_data(str(input_file), str(tmp_path / 'memory.csv'))
+
+        # 10 run dengan fan-in 3 memaksa beberapa putaran merge
+        row_count = transform_csv_chunked(str(input_file), str(tmp_path / 'chunked.csv'),
+                                          chunksize=30, temp_dir=str(tmp_path), fan_in=3)
+
+        expected = pd.read_csv(tmp_path / 'memory.csv')
+        assert row_count == len(expected)
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'chunked.csv'), expected)
+        # File run sementara sudah dihapus
+        assert sorted(os.listdir(tmp_path)) == ['chunked.csv', 'memory.csv', 'raw.csv']
+
+    def test_numeric_looking_chunk_is_cleaned_like_text(self, tmp_path):
+        # Chunk kedua hanya berisi rating angka; tetap harus dibersihkan, bukan dibuang
+        rows = raw_rows(4) + [dict(row, Title=f'Numeric {i}', Rating='4.5') for i, row in enumerate(raw_rows(4))]
+        input_file = tmp_path / 'raw.csv'
+        write_raw_csv(input_file, rows)
+
+        transform_csv_chunked(str(input_file), str(tmp_path / 'out.csv'), chunksize=4)
+
+        assert pd.read_csv(tmp_path / 'out.csv')['Title'].str.startswith('Numeric').sum() == 3
+
+    def test_all_numeric_rating_file_is_cleaned_the_same_in_both_modes(self, tmp_path):
+        # Seluruh kolom Rating berupa angka: kedua mode membaca teks dan mempertahankan barisnya
+        rows = [dict(row, Rating='4.5') for row in raw_rows(40)]
+        input_file = tmp_path / 'raw.csv'
+        write_raw_csv(input_file, rows)
+
+        assert transform_data(str(input_file), str(tmp_path / 'memory.csv'))
+        assert transform_data(str(input_file), str(tmp_path / 'chunked.csv'), chunksize=8)
+
+        expected = pd.read_csv(tmp_path / 'memory.csv')
+        assert len(expected) > 0
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'chunked.csv'), expected)
+
+    def test_row_hash_index(self):
+        index = RowHashIndex()
+
+        first = index.add_new(np.array([5, 3, 5, 9], dtype=np.uint64))
+        second = index.add_new(np.array([9, 1, 3, 1, 7], dtype=np.uint64))
+
+        assert first.tolist() == [True, True, False, True]
+        assert second.tolist() == [False, True, False, False, True]
+        assert len(index) == 5
+        assert index.nbytes == 5 * 8
+
+    def test_chunked_without_timestamp(self, tmp_path):
+        rows = [{k: v for k, v in row.items() if k != 'Timestamp'} for row in raw_rows(100)]
+        input_file = tmp_path / 'raw.csv'
+        write_raw_csv(input_file, rows)
+
+        transform_data(str(input_file), str(tmp_path / 'memory.csv'))
+        row_count = transform_csv_chunked(str(input_file), str(tmp_path / 'chunked.csv'), chunksize=16)
+
+        expected = pd.read_csv(tmp_path / 'memory.csv')
+        assert row_count == len(expected)
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'chunked.csv'), expected)
+
+    def test_chunked_missing_input_returns_false(self, tmp_path):
+        assert transform_data(str(tmp_path / 'missing.csv'), str(tmp_path / 'out.csv'), chunksize=10) is False
+
 # Tambahkan entrypoint agar test dapat dijalankan langsung
 if __name__ == "__main__":
     import pytest
@@ -0,0 +1,311 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_ARCHIVE_DIR = '.html_archive'
+# Ekstensi file objek per codec; codec objek lama dikenali dari ekstensinya
+CODEC_EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'gzip'
+DEFAULT_LEVELS = {'zstd': 10, 'gzip': 6}
+
+def content_digest(content: bytes) -> str:
+    """SHA-256 of the raw page bytes, the key of an archived object."""
+    return hashlib.sha256(content).hexdigest()
+
+def _compress(content: bytes, codec: str, level: int) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(content)
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Objek arsip ini memakai zstd; pasang paket 'zstandard' untuk membacanya")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+class HtmlArchive:
+    """
+    Content-addressed store of raw catalog pages.
+
+    Every page body is compressed (zstd when the zstandard package is
+    installed, gzip otherwise) and stored once under the SHA-256 of its
+    bytes, so identical pages of different runs share one object. Each
+    crawl writes a manifest (see ArchiveRun) mapping page numbers to object
+    hashes, which lets iter_scrape_pages replay the crawl from disk.
+
+    Layout:
+        objects/<2 hex>/<sha256>.zst|.gz   compressed page bodies
+        runs/<run_id>.json                 manifest per crawl
+
+    Args:
+        archive_dir: Root directory of the archive
+        codec: 'zstd' or 'gzip' for new objects, DEFAULT_CODEC if not given
+        level: Compression level, DEFAULT_LEVELS[codec] if not given
+    """
+
+    def __init__(self, archive_dir: str = DEFAULT_ARCHIVE_DIR, codec: Optional[str] = None,
+                 level: Optional[int] = None):
+        codec = codec or DEFAULT_CODEC
+        if codec not in CODEC_EXTENSIONS:
+            raise ValueError(f"Codec arsip tidak dikenal: {codec} (pilihan: {', '.join(CODEC_EXTENSIONS)})")
+        if codec == 'zstd' and zstandard is None:
+            raise ValueError("Codec zstd membutuhkan paket 'zstandard'")
+        self.archive_dir = archive_dir
+        self.codec = codec
+        self.level = DEFAULT_LEVELS[codec] if level is None else level
+        self._lock = threading.Lock()
+        self._started_runs = set()
+        os.makedirs(os.path.join(archive_dir, 'objects'), exist_ok=True)
+        os.makedirs(os.path.join(archive_dir, 'runs'), exist_ok=True)
+
+    def _object_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.archive_dir, 'objects', digest[:2], digest + CODEC_EXTENSIONS[codec])
+
+    def _find_object(self, digest: str) -> Optional[Tuple[str, str]]:
+        for codec in (self.codec, *CODEC_EXTENSIONS):
+            path = self._object_path(digest, codec)
+            if os.path.exists(path):
+                return path, codec
+        return None
+
+    def put(self, content: bytes) -> Tuple[str, bool]:
+        """
+        Store a page body unless an identical one is already archived.
+
+        Returns:
+            (sha256 digest, True if a new object was written)
+        """
+        digest = content_digest(content)
+        with self._lock:
+            if self._find_object(digest) is not None:
+                return digest, False
+            path = self._object_path(digest, self.codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(_compress(content, self.codec, self.level))
+            os.replace(tmp_path, path)
+        return digest, True
+
+    def get(self, digest: str) -> bytes:
+        """
+        Raw page bytes of an archived object.
+
+        Raises:
+            KeyError: If no object with this digest exists
+        """
+        found = self._find_object(digest)
+        if found is None:
+            raise KeyError(digest)
+        path, codec = found
+        with open(path, 'rb') as f:
+            return _decompress(f.read(), codec)
+
+    def object_size(self, digest: str) -> int:
+        """Compressed size on disk of an archived object."""
+        found = self._find_object(digest)
+        return os.path.getsize(found[0]) if found else 0
+
+    def runs(self) -> List[str]:
+        """Run ids with a manifest, oldest first."""
+        names = os.listdir(os.path.join(self.archive_dir, 'runs'))
+        return sorted(name[:-len('.json')] for name in names if name.endswith('.json'))
+
+    def _manifest_path(self, run_id: str) -> str:
+        return os.path.join(self.archive_dir, 'runs', f'{run_id}.json')
+
+    def start_run(self, base_url: str, run_id: Optional[str] = None) -> 'ArchiveRun':
+        """New manifest for a crawl of base_url; run_id defaults to the current time."""
+        if run_id is None:
+            run_id = time.strftime('%Y%m%d-%H%M%S')
+            suffix = 1
+            while os.path.exists(self._manifest_path(run_id)) or run_id in self._started_runs:
+                suffix += 1
+                run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{suffix}"
+        self._started_runs.add(run_id)
+        return ArchiveRun(self, run_id, base_url)
+
+    def open_run(self, run_id: Optional[str] = None) -> 'ArchiveRun':
+        """
+        Manifest of an earlier crawl for replay.
+
+        Args:
+            run_id: Run to open, the latest run if not given
+
+        Raises:
+            FileNotFoundError: If the archive has no (such) run
+        """
+        if run_id is None:
+            runs = self.runs()
+            if not runs:
+                raise FileNotFoundError(f"Arsip {self.archive_dir} belum berisi run")
+            run_id = runs[-1]
+        with open(self._manifest_path(run_id), encoding='utf-8') as f:
+            manifest = json.load(f)
+        run = ArchiveRun(self, run_id, manifest['base_url'], created=manifest.get('created'))
+        run.pages = {int(page): entry for page, entry in manifest['pages'].items()}
+        run.missing = set(manifest.get('missing', []))
+        return run
+
+class ArchiveRun:
+    """
+    Manifest of one crawl: which object holds each page, plus its URL and fetch time.
+
+    Record pages with record() while crawling and save() the manifest at
+    the end (or use the run as a context manager). An opened run yields
+    its pages again with iter_pages().
+
+    Pages a resumed crawl takes from its checkpoint are not fetched, so
+    there are no bytes to record; record_previous() points them at the
+    object an earlier run of the same archive stored. Pages for which no
+    earlier object exists are listed under 'missing' in the manifest (the
+    run is partial) and replay as failed fetches.
+    """
+
+    def __init__(self, archive: HtmlArchive, run_id: str, base_url: str, created: Optional[str] = None):
+        self.archive = archive
+        self.run_id = run_id
+        self.base_url = base_url
+        self.created = created or time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.pages: Dict[int, dict] = {}
+        self.new_objects = 0
+        self.deduplicated = 0
+        self.reused = 0
+        self.missing = set()
+        self._previous_entries = None
+        self._lock = threading.Lock()
+
+    def record(self, page_number: int, url: str, content: bytes, fetched_at: Optional[str] = None) -> str:
+        """
+        Archive the body of a fetched page and add it to the manifest.
+
+        Args:
+            fetched_at: Fetch time in the scraper's Timestamp format, now if not given
+
+        Returns:
+            Digest of the stored object
+        """
+        digest, is_new = self.archive.put(content)
+        if fetched_at is None:
+            now = datetime.now()
+            fetched_at = now.strftime('%Y-%m-%d %H:%M:%S.') + f'{int(now.microsecond / 1000):03d}'
+        with self._lock:
+            self.pages[page_number] = {'url': url, 'sha256': digest, 'size': len(content), 'fetched_at': fetched_at}
+            self.missing.discard(page_number)
+            if is_new:
+                self.new_objects += 1
+            else:
+                self.deduplicated += 1
+        return digest
+
+    def _load_previous_entries(self) -> Dict[int, dict]:
+        """Newest manifest entry per page over the earlier runs of this base_url whose object still exists."""
+        entries = {}
+        for run_id in self.archive.runs():
+            if run_id == self.run_id:
+                continue
+            run = self.archive.open_run(run_id)
+            if run.base_url != self.base_url:
+                continue
+            for page_number, entry in run.pages.items():
+                if self.archive._find_object(entry['sha256']) is not None:
+                    entries[page_number] = entry
+        return entries
+
+    def record_previous(self, page_number: int) -> bool:
+        """
+        Add a page that was not fetched in this run (e.g. served from the
+        crawl checkpoint) with the object an earlier run archived for it.
+
+        Returns:
+            True if an earlier object was found, False if the page is marked missing
+        """
+        with self._lock:
+            if self._previous_entries is None:
+                self._previous_entries = self._load_previous_entries()
+            entry = self._previous_entries.get(page_number)
+            if entry is None:
+                self.missing.add(page_number)
+                return False
+            self.pages[page_number] = dict(entry)
+            self.missing.discard(page_number)
+            self.reused += 1
+            return True
+
+    def page_numbers(self) -> List[int]:
+        with self._lock:
+            return sorted(self.pages)
+
+    def fetched_at(self, page_number: int) -> Optional[str]:
+        entry = self.pages.get(page_number)
+        return entry['fetched_at'] if entry else None
+
+    def iter_pages(self, page_numbers: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, Optional[bytes]]]:
+        """
+        (page_number, raw bytes) for the archived pages, in the given order.
+
+        Pages missing from the manifest or whose object is gone yield None,
+        like a failed fetch.
+        """
+        for page_number in (self.page_numbers() if page_numbers is None else page_numbers):
+            entry = self.pages.get(page_number)
+            try:
+                yield page_number, self.archive.get(entry['sha256']) if entry else None
+            except KeyError:
+                yield page_number, None
+
+    def save(self) -> str:
+        """Write the manifest atomically; returns its path."""
+        path = self.archive._manifest_path(self.run_id)
+        with self._lock:
+            manifest = {
+                'run_id': self.run_id,
+                'base_url': self.base_url,
+                'created': self.created,
+                'codec': self.archive.codec,
+                'pages': {str(page): entry for page, entry in sorted(self.pages.items())},
+                # Halaman yang dipakai crawl tetapi tidak ada objeknya di arsip (run parsial)
+                'missing': sorted(self.missing),
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, path)
+        return path
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict with pages, new_objects, deduplicated, reused (pages taken
+            from an earlier run), missing, raw_bytes and stored_bytes
+            (compressed size of the objects this run references)
+        """
+        with self._lock:
+            entries = list(self.pages.values())
+            missing = len(self.missing)
+        return {
+            'pages': len(entries),
+            'new_objects': self.new_objects,
+            'deduplicated': self.deduplicated,
+            'reused': self.reused,
+            'missing': missing,
+            'raw_bytes': sum(entry['size'] for entry in entries),
+            'stored_bytes': sum(self.archive.object_size(digest) for digest in {e['sha256'] for e in entries}),
+        }
+
+    def __enter__(self) -> 'ArchiveRun':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.save()
@@ -0,0 +1,162 @@
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_INDEX_FILE = 'product_index.sqlite'
+
+# Identitas produk (kunci stabil antar run) dan isi yang dipantau perubahannya
+PRODUCT_KEY_COLUMNS = ['Title', 'Size', 'Gender', 'Color']
+PRODUCT_CONTENT_COLUMNS = ['Price', 'Rating']
+FINGERPRINT_COLUMNS = PRODUCT_KEY_COLUMNS + PRODUCT_CONTENT_COLUMNS
+
+KEY_COLUMN = 'product_key'
+CHANGE_COLUMN = 'Change'
+
+def _as_text(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    return df[columns].astype(object).where(df[columns].notna(), '').astype(str)
+
+def row_digests(df: pd.DataFrame, columns: List[str]) -> pd.Series:
+    """SHA-256 hex digest of the given columns of every row (missing values hash as empty)."""
+    text = _as_text(df, columns)
+    joined = text[columns[0]].str.cat([text[column] for column in columns[1:]], sep='\x1f')
+    return joined.map(lambda row: hashlib.sha256(row.encode('utf-8')).hexdigest())
+
+def product_fingerprints(df: pd.DataFrame) -> pd.Series:
+    """
+    64-bit fingerprint of the cleaned Title, Price, Rating, Color, Size and Gender of every row.
+
+    Values are compared as text, so the fingerprint does not depend on
+    whether a column arrives as float, nullable integer or object.
+    """
+    hashes = pd.util.hash_pandas_object(_as_text(df, FINGERPRINT_COLUMNS), index=False)
+    # SQLite INTEGER bertanda 64-bit
+    return pd.Series(hashes.to_numpy().view('int64'), index=df.index)
+
+class ChangeSet(NamedTuple):
+    """
+    Result of FingerprintIndex.classify.
+
+    updates holds the new and changed rows with product_key and a Change
+    column ('new' / 'changed'); deleted lists the product_keys of the last
+    run that are missing now; fingerprints is the index content to commit.
+    """
+    updates: pd.DataFrame
+    deleted: List[str]
+    counts: Dict[str, int]
+    fingerprints: pd.DataFrame
+
+def delta_frame(updates: pd.DataFrame, deleted: List[str]) -> pd.DataFrame:
+    """
+    Rows to send to the load sinks: updates plus one row per deleted product.
+
+    Deleted rows only carry their product_key and Change = 'deleted'.
+    """
+    if not deleted:
+        return updates
+    # Kolom integer dijadikan Int64 agar tidak berubah menjadi float (3 -> 3.0) oleh baris kosong;
+    # product_key upsert dihitung dari teks nilai kolom
+    integers = {column: 'Int64' for column, dtype in updates.dtypes.items() if pd.api.types.is_integer_dtype(dtype)}
+    removals = pd.DataFrame({KEY_COLUMN: deleted, CHANGE_COLUMN: 'deleted'})
+    return pd.concat([updates.astype(integers), removals], ignore_index=True)
+
+class FingerprintIndex:
+    """
+    Fingerprints of the products loaded by the last successful run, stored in SQLite.
+
+    One row per product: product_key (SHA-256 of Title, Size, Gender and
+    Color, the same key the upsert load uses) and a 64-bit fingerprint of
+    the cleaned product fields. classify() compares a freshly cleaned frame
+    with the index; commit() stores the new state once every sink loaded
+    the delta, so a failed run is simply sent again next time.
+
+    Args:
+        path: SQLite file holding the index
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS products ("
+                "product_key TEXT PRIMARY KEY, fingerprint INTEGER NOT NULL) WITHOUT ROWID"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def _stored(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT product_key, fingerprint FROM products"))
+
+    def classify(self, df: pd.DataFrame, detect_deletes: bool = True) -> ChangeSet:
+        """
+        Split cleaned data into new, changed and unchanged products.
+
+        Args:
+            df: Output of clean_dataframe (one product may appear more than
+                once; the first row per product_key is used)
+            detect_deletes: Report indexed products missing from df as
+                deleted; turn off when the scrape is known to be incomplete
+
+        Returns:
+            ChangeSet with the new and changed rows, the deleted product_keys
+            and the counts per class
+        """
+        frame = df.copy(deep=False)
+        frame.insert(0, KEY_COLUMN, row_digests(frame, PRODUCT_KEY_COLUMNS))
+        fingerprints = product_fingerprints(frame)
+        is_first = ~frame[KEY_COLUMN].duplicated()
+        frame, fingerprints = frame[is_first], fingerprints[is_first]
+
+        stored = self._stored()
+        # Int64 (nullable) agar fingerprint 64-bit tidak dibulatkan menjadi float saat ada produk baru
+        stored_fingerprint = frame[KEY_COLUMN].map(pd.Series(stored, dtype='Int64'))
+        is_new = stored_fingerprint.isna().to_numpy()
+        is_changed = ~is_new & (stored_fingerprint != fingerprints).fillna(False).to_numpy(bool)
+
+        updates = frame[is_new | is_changed].copy()
+        updates[CHANGE_COLUMN] = np.where(is_new[is_new | is_changed], 'new', 'changed')
+        deleted = sorted(stored.keys() - set(frame[KEY_COLUMN])) if detect_deletes else []
+
+        return ChangeSet(
+            updates=updates,
+            deleted=deleted,
+            counts={
+                'new': int(is_new.sum()),
+                'changed': int(is_changed.sum()),
+                'unchanged': int(len(frame) - is_new.sum() - is_changed.sum()),
+                'deleted': len(deleted),
+            },
+            fingerprints=pd.DataFrame({KEY_COLUMN: frame[KEY_COLUMN], 'fingerprint': fingerprints}),
+        )
+
+    def commit(self, changes: ChangeSet) -> None:
+        """Store the state classified in changes (new and changed fingerprints, deletions) in one transaction."""
+        updated = changes.fingerprints[changes.fingerprints[KEY_COLUMN].isin(changes.updates[KEY_COLUMN])]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM products WHERE product_key = ?", ((key,) for key in changes.deleted))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO products (product_key, fingerprint) VALUES (?, ?)",
+                zip(updated[KEY_COLUMN].tolist(), updated['fingerprint'].tolist()),
+            )
+
+    def clear(self) -> None:
+        """Forget every fingerprint; the next run loads the whole catalog again."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM products")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'FingerprintIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
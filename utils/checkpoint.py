@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_CHECKPOINT_FILE = 'scrape_checkpoint.sqlite'
+
+class CrawlCheckpoint:
+    """
+    Per-page crawl checkpoint stored in SQLite.
+
+    Every completed page is committed together with its records, so a crawl
+    that dies on page 37 can be restarted and only fetches the pages that
+    are still missing. Records are stored as JSON and replayed unchanged
+    (including their original Timestamp).
+
+    Args:
+        path: SQLite file holding the checkpoint
+        base_url: Catalog URL the checkpoint belongs to; a checkpoint written
+            for another URL is discarded
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_FILE, base_url: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "page INTEGER PRIMARY KEY, records TEXT NOT NULL, "
+                "completed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS failed_pages (page INTEGER PRIMARY KEY)")
+        if base_url is not None:
+            self._bind(base_url)
+
+    def _bind(self, base_url: str) -> None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'base_url'").fetchone()
+        if row is not None and row[0] != base_url:
+            self.clear()
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('base_url', ?)", (base_url,))
+
+    def completed_pages(self) -> List[int]:
+        """Page numbers already completed, in ascending order."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT page FROM pages ORDER BY page")]
+
+    def last_completed_page(self) -> Optional[int]:
+        """Highest completed page number, or None for a fresh checkpoint."""
+        with self._lock:
+            return self._conn.execute("SELECT MAX(page) FROM pages").fetchone()[0]
+
+    def load_page(self, page_number: int) -> Optional[List[Dict]]:
+        """Records saved for a page, or None if the page is not completed yet."""
+        with self._lock:
+            row = self._conn.execute("SELECT records FROM pages WHERE page = ?", (page_number,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_page(self, page_number: int, records: List[Dict]) -> None:
+        """Mark a page as completed and store its records in one transaction."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (page, records) VALUES (?, ?)",
+                (page_number, json.dumps(records, ensure_ascii=False)),
+            )
+            self._conn.execute("DELETE FROM failed_pages WHERE page = ?", (page_number,))
+
+    def save_failed_page(self, page_number: int) -> None:
+        """Remember a page that could not be fetched; it is fetched again on resume."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO failed_pages (page) VALUES (?)", (page_number,))
+
+    def failed_pages(self) -> List[int]:
+        """Pages that failed and have not been completed by a later run, in ascending order."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT page FROM failed_pages ORDER BY page")]
+
+    def finish(self) -> bool:
+        """
+        Clear the checkpoint if the crawl is complete, i.e. no page is still failed.
+
+        Returns:
+            True if the checkpoint was cleared, False if it is kept for a resume
+        """
+        if self.failed_pages():
+            return False
+        self.clear()
+        return True
+
+    def page_count(self) -> Optional[int]:
+        """Catalog page count discovered by the interrupted crawl, if any."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'page_count'").fetchone()
+        return int(row[0]) if row else None
+
+    def save_page_count(self, page_count: int) -> None:
+        """Remember the discovered page count so a resumed crawl does not need page 1 again."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('page_count', ?)", (str(page_count),))
+
+    def clear(self) -> None:
+        """Forget every completed page, e.g. after a crawl finished successfully."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM failed_pages")
+            self._conn.execute("DELETE FROM meta WHERE key = 'page_count'")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'CrawlCheckpoint':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
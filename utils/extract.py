@@ -1,26 +1,114 @@
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+import os
+import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlsplit
+from utils.http_client import HEADERS
+from utils.metrics import get_registry
+from utils.rate_limit import parse_retry_after
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
-    )
-}
+DEFAULT_MAX_PAGES = 50
+
+# Backend parser untuk scrape_data: 'strainer' hanya mem-parse subtree div.collection-card
+PARSER_BACKENDS = ('html.parser', 'lxml', 'strainer', 'lxml-strainer')
+
+# Di bawah jumlah halaman ini biaya start proses worker tidak sebanding dengan hasilnya
+PROCESS_POOL_MIN_PAGES = 8
+
+_FETCH_FAILED = object()
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_PARSER = 'html.parser'
+
+def _send_request(url, client, headers):
+    if client is not None:
+        return client.get(url, headers=headers) if headers else client.get(url)
 
-def fetching_content(url):
-    """Mengambil konten HTML dari URL https://fashion-studio.dicoding.dev/ """
     session = requests.Session()
-    response = session.get(url, headers=HEADERS)
+    try:
+        return session.get(url, headers={**HEADERS, **headers})
+    finally:
+        session.close()
+
+def fetching_content(url, client=None, cache=None, rate_limiter=None, retry=None):
+    """
+    Mengambil konten HTML dari URL https://fashion-studio.dicoding.dev/
+
+    Jika `client` (HttpClient) diberikan, request memakai koneksi keep-alive milik client.
+    Tanpa client, dibuat session sekali pakai yang langsung ditutup setelah request.
+    Jika `cache` (HttpCache) diberikan, request dikirim sebagai conditional GET dan
+    respons 304 dilayani dari cache di disk.
+    `rate_limiter` (AdaptiveRateLimiter) menentukan kapan request boleh dikirim dan belajar dari
+    latensi/status respons; `retry` (RetryPolicy) mengulang kegagalan sementara (429/5xx, koneksi
+    putus) dengan backoff eksponensial ber-jitter.
+    """
+    validators = cache.conditional_headers(url) if cache is not None else {}
+    metrics = get_registry()
+    attempt = 0
+
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        started = time.perf_counter()
+        try:
+            response = _send_request(url, client, validators)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            metrics.observe('http_request_duration_seconds', time.perf_counter() - started, status='error')
+            metrics.inc('http_errors_total', kind='connection')
+            if rate_limiter is not None:
+                rate_limiter.record(time.perf_counter() - started)
+            if retry is None:
+                raise
+            if attempt >= retry.max_retries:
+                print(f"Terjadi kesalahan saat melakukan requests terhadap {url}")
+                return None
+            time.sleep(retry.backoff(attempt))
+            attempt += 1
+            continue
+
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - started, status=response.status_code)
+        metrics.inc('http_response_bytes_total', len(response.content or b''))
+
+        if rate_limiter is None and retry is None:
+            break
+
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        if rate_limiter is not None:
+            rate_limiter.record(time.perf_counter() - started, response.status_code, retry_after)
+        if retry is None or response.status_code not in retry.retry_statuses or attempt >= retry.max_retries:
+            break
+
+        print(f"Respons {response.status_code} dari {url}, mencoba ulang ({attempt + 1}/{retry.max_retries})")
+        time.sleep(retry.backoff(attempt, retry_after))
+        attempt += 1
+
+    if validators and response.status_code == 304:
+        content = cache.load(url)
+        if content is not None:
+            return content
+        # Body di cache hilang: ulangi tanpa validator
+        return fetching_content(url, client=client, cache=cache, rate_limiter=rate_limiter, retry=retry)
     
     try:
         response.raise_for_status()
+        if cache is not None:
+            cache.store(url, response.content,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'))
         return response.content
     
     except requests.exceptions.RequestException as e:
+        metrics.inc('http_errors_total', kind='status')
         print(f"Terjadi kesalahan saat melakukan requests terhadap {url}")
         return None
 
@@ -35,17 +123,16 @@ def extract_fashion_data(collection):
         price_element = collection.find('span', class_='price')
         price = price_element.text if price_element else 'Price Unavailable'
 
-        rating_tag = collection.find_all('p')[0]
+        # Rating, Color, Size, Gender ada di empat <p> pertama; cukup dicari sekali
+        rating_tag, color_tag, size_tag, gender_tag = collection.find_all('p', limit=4)
+
         rating_text = rating_tag.text.replace('Rating:', '')
         rating = rating_text.replace("⭐", "").split("/")[0]
         
-        color_tag = collection.find_all('p')[1]
         color = color_tag.text
         
-        size_tag = collection.find_all('p')[2]
         size = size_tag.text.replace("Size:", "")
         
-        gender_tag = collection.find_all('p')[3]
         gender = gender_tag.text.replace("Gender:", "")
 
         return {
@@ -61,40 +148,395 @@ def extract_fashion_data(collection):
         print(f"Error saat mengekstrak data: {str(e)}")
         return None
 
-def scrape_data(base_url, start_page=1, delay=1):
-    """Fungsi utama untuk mengambil keseluruhan data, mulai dari requests hingga menyimpannya dalam variabel data."""
-    data = []
-    page_number = start_page
-    max_pages = 50
+def parse_collection_cards(content, parser=DEFAULT_PARSER):
+    """
+    Mem-parse HTML halaman dan mengembalikan daftar elemen div.collection-card.
+
+    Backend: 'html.parser' (tree penuh, pure Python), 'lxml' (tree penuh, parser C),
+    'strainer' / 'lxml-strainer' (hanya subtree div.collection-card yang dibangun).
+    Jika lxml tidak terpasang, backend lxml otomatis jatuh ke html.parser.
+    """
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(f"Parser tidak dikenal: {parser}. Pilihan: {', '.join(PARSER_BACKENDS)}")
+
+    features = 'lxml' if parser.startswith('lxml') else 'html.parser'
+    parse_only = SoupStrainer('div', class_='collection-card') if parser.endswith('strainer') else None
+
+    try:
+        soup = BeautifulSoup(content, features, parse_only=parse_only)
+    except FeatureNotFound:
+        soup = BeautifulSoup(content, 'html.parser', parse_only=parse_only)
+
+    return soup.find_all('div', class_='collection-card')
+
+def discover_page_count(content):
+    """
+    Membaca jumlah halaman katalog dari navigasi pagination halaman pertama.
+
+    Mendukung teks 'Page 1 of 50' dan tautan bernomor (href '/page50'). Mengembalikan None
+    jika jumlah halaman tidak bisa dipastikan, misalnya hanya ada tautan 'Next'.
+    """
+    soup = BeautifulSoup(content, 'html.parser', parse_only=SoupStrainer(class_=re.compile('pagination')))
+
+    match = re.search(r'Page\s+\d+\s+of\s+(\d+)', soup.get_text(' '), re.IGNORECASE)
+    if match:
+        return int(match.group(1))
+
+    linked_pages = [int(number) for link in soup.find_all('a', href=True)
+                    for number in re.findall(r'page(\d+)/?$', link['href'])]
+    if linked_pages and not soup.find('a', string=re.compile(r'next', re.IGNORECASE)):
+        return max(linked_pages + [1])
+
+    return None
+
+def _discover_max_pages(base_url, start_page, fetch_options, checkpoint):
+    """
+    Menentukan halaman terakhir sebelum crawl dimulai.
+
+    Halaman 1 diambil sekali dan kontennya dipakai ulang sebagai halaman pertama crawl.
+    Mengembalikan (max_pages, konten_halaman_1 atau None jika tidak diambil).
+    """
+    if checkpoint is not None:
+        if checkpoint.page_count():
+            return checkpoint.page_count(), None
+        if start_page in checkpoint.completed_pages():
+            return DEFAULT_MAX_PAGES, None
+    if start_page != 1:
+        return DEFAULT_MAX_PAGES, None
+
+    url = build_page_url(base_url, 1)
+    print(f'Scraping halaman: {url}')
+    content = _fetch_page(1, url, fetch_options)
+    page_count = discover_page_count(content) if content else None
+
+    if page_count:
+        print(f"Terdeteksi {page_count} halaman dari navigasi pagination")
+        if checkpoint is not None:
+            checkpoint.save_page_count(page_count)
+    return page_count or DEFAULT_MAX_PAGES, content
 
-    while page_number <= max_pages:
-        url = f"{base_url}" if page_number == 1 else f"{base_url}page{page_number}"
+def _with_first_page(first_page, rest, delay):
+    yield first_page
+    time.sleep(delay)
+    yield from rest
+
+def build_page_url(base_url, page_number):
+    """Menyusun URL halaman katalog: halaman 1 adalah base_url, sisanya base_url + 'pageN'."""
+    return f"{base_url}" if page_number == 1 else f"{base_url}page{page_number}"
+
+def _fetch_page(page_number, url, fetch_options):
+    """fetching_content untuk satu halaman katalog, dengan durasi dan ukuran halaman dicatat ke metrics."""
+    started = time.perf_counter()
+    content = fetching_content(url, **fetch_options)
+    get_registry().record_page(page_number, fetch_seconds=time.perf_counter() - started,
+                               bytes=len(content) if content else 0)
+    return content
+
+class HostThrottle:
+    """Membatasi jumlah request yang berjalan bersamaan ke satu host (politeness per host)."""
+
+    def __init__(self, per_host_limit, delay=0):
+        self.per_host_limit = per_host_limit
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    def _slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.Semaphore(self.per_host_limit)
+            return self._slots[host]
+
+    def fetch(self, url, fetch_options=None, page_number=None):
+        """
+        Mengambil URL sambil memegang slot host, lalu menunggu `delay` detik sebelum melepasnya.
+
+        Jika `page_number` diberikan, durasi fetch dicatat ke metrics sebagai halaman tersebut.
+        """
+        with self._slot(url):
+            if page_number is None:
+                content = fetching_content(url, **(fetch_options or {}))
+            else:
+                content = _fetch_page(page_number, url, fetch_options or {})
+            time.sleep(self.delay)
+            return content
+
+def _iter_pages_serial(base_url, pages, delay, fetch_options):
+    """Mengambil halaman satu per satu, persis seperti alur scraping semula."""
+    for page_number in pages:
+        url = build_page_url(base_url, page_number)
         print(f'Scraping halaman: {url}')
+        yield page_number, _fetch_page(page_number, url, fetch_options)
+        time.sleep(delay)
+
+def _iter_pages_concurrent(base_url, pages, delay, max_workers, per_host_limit, fetch_options):
+    """
+    Mengambil halaman secara paralel dengan maksimal `max_workers` request yang berjalan.
 
-        content = fetching_content(url)
+    Hasil tetap dikembalikan sesuai urutan halaman. Ketika pemanggil berhenti
+    (misalnya karena halaman kosong), request yang belum berjalan dibatalkan.
+    """
+    throttle = HostThrottle(per_host_limit or max_workers, delay)
+    pages = iter(pages)
+    window = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit_next():
+        page_number = next(pages, None)
+        if page_number is None:
+            return
+        url = build_page_url(base_url, page_number)
+        print(f'Scraping halaman: {url}')
+        window.append((page_number, executor.submit(throttle.fetch, url, fetch_options, page_number)))
+
+    try:
+        for _ in range(max_workers):
+            submit_next()
+        while window:
+            page_number, future = window.popleft()
+            content = future.result()
+            submit_next()
+            yield page_number, content
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def extract_page_records(content, parser=DEFAULT_PARSER):
+    """
+    Mem-parse satu halaman dan mengekstrak seluruh produknya.
+
+    Fungsi ini juga dijalankan di worker ProcessPoolExecutor, sehingga hanya menerima
+    dan mengembalikan objek yang bisa di-pickle. Mengembalikan None jika halaman
+    tidak memiliki collection-card.
+    """
+    articles_element = parse_collection_cards(content, parser)
+    if not articles_element:
+        return None
+
+    records = []
+    for collection in articles_element:
+        try:
+            fashion = extract_fashion_data(collection)
+            if fashion:
+                records.append(fashion)
+        except Exception as e:
+            print(f"Error saat mengekstrak data produk: {str(e)}")
+            continue
+    return records
+
+def _parse_in_process(fetched_pages, parser):
+    metrics = get_registry()
+    for page_number, content in fetched_pages:
         if not content:
-            print(f"Gagal mengambil konten untuk halaman {page_number}")
-            break
+            yield page_number, _FETCH_FAILED
+            continue
+        started = time.perf_counter()
+        records = extract_page_records(content, parser)
+        metrics.record_page(page_number, parse_seconds=time.perf_counter() - started)
+        yield page_number, records
 
-        soup = BeautifulSoup(content, 'html.parser')
-        articles_element = soup.find_all('div', class_='collection-card')
+def _timed_extract_page_records(content, parser):
+    """extract_page_records di worker proses; durasi parse dikembalikan karena metrics worker tidak terlihat di proses utama."""
+    started = time.perf_counter()
+    records = extract_page_records(content, parser)
+    return records, time.perf_counter() - started
 
-        if not articles_element:
-            print(f"Tidak ada produk yang ditemukan pada halaman {page_number}")
-            break
+def _pool_result(page_number, future):
+    records, parse_seconds = future.result()
+    get_registry().record_page(page_number, parse_seconds=parse_seconds)
+    return page_number, records
 
-        for collection in articles_element:
-            try:
-                fashion = extract_fashion_data(collection)
-                if fashion:
-                    data.append(fashion)
-            except Exception as e:
-                print(f"Error saat mengekstrak data produk: {str(e)}")
+def _parse_in_pool(fetched_pages, parser, parse_workers):
+    """
+    Mengirim bytes halaman ke ProcessPoolExecutor dan mengembalikan hasilnya sesuai urutan halaman.
+
+    Antrean halaman yang menunggu di-parse dibatasi 2x jumlah worker agar memori tetap kecil;
+    selama worker mem-parse, halaman berikutnya tetap diambil dari jaringan.
+    """
+    pending = deque()
+    executor = ProcessPoolExecutor(max_workers=parse_workers)
+    try:
+        for page_number, content in fetched_pages:
+            if not content:
+                while pending:
+                    yield _pool_result(*pending.popleft())
+                yield page_number, _FETCH_FAILED
                 continue
 
-        print(f"Selesai scrapping produk dari halaman {page_number}")
-        page_number += 1
-        time.sleep(delay)
+            pending.append((page_number, executor.submit(_timed_extract_page_records, content, parser)))
+            while pending and (len(pending) > 2 * parse_workers or pending[0][1].done()):
+                yield _pool_result(*pending.popleft())
+
+        while pending:
+            yield _pool_result(*pending.popleft())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _page_result(page_number, result, records=None):
+    metrics = get_registry()
+    metrics.inc('scrape_pages_total', result=result)
+    metrics.record_page(page_number, result=result, records=len(records) if records else 0)
+    if records:
+        metrics.inc('scrape_records_total', len(records))
+
+def _archive_pages(fetched_pages, archive, base_url):
+    """Meneruskan (nomor_halaman, konten) sambil menyimpan setiap konten yang berhasil diambil ke arsip."""
+    try:
+        for page_number, content in fetched_pages:
+            if content:
+                archive.record(page_number, build_page_url(base_url, page_number), content)
+            yield page_number, content
+    finally:
+        fetched_pages.close()
+
+def _iter_replay_pages(replay, start_page, max_pages, parser, process_pool, parse_workers):
+    """iter_scrape_pages untuk replay: halaman dari arsip, di-parse seperti crawl biasa, tanpa jaringan."""
+    parse_workers = parse_workers or os.cpu_count() or 1
+    pages = [page_number for page_number in replay.page_numbers()
+             if page_number >= start_page and (max_pages is None or page_number <= max_pages)]
+    print(f"Replay {len(pages)} halaman dari arsip run {replay.run_id}")
+
+    archived_pages = replay.iter_pages(pages)
+    if process_pool and parse_workers > 1 and len(pages) >= PROCESS_POOL_MIN_PAGES:
+        parsed_pages = _parse_in_pool(archived_pages, parser, parse_workers)
+    else:
+        parsed_pages = _parse_in_process(archived_pages, parser)
+
+    try:
+        for page_number, records in parsed_pages:
+            if records is _FETCH_FAILED or not records:
+                print(f"Halaman {page_number} tidak bisa dibaca dari arsip")
+                _page_result(page_number, 'failed')
+                continue
+            for record in records:
+                record['Timestamp'] = replay.fetched_at(page_number)
+            _page_result(page_number, 'replayed', records)
+            yield page_number, records
+    finally:
+        parsed_pages.close()
+        archived_pages.close()
+
+def iter_scrape_pages(base_url, start_page=1, delay=1, max_pages=None, max_workers=1, per_host_limit=None,
+                      client=None, cache=None, parser=DEFAULT_PARSER, process_pool=False, parse_workers=None,
+                      checkpoint=None, resume=True, rate_limiter=None, retry=None, skip_failed_pages=False,
+                      archive=None, replay=None):
+    """
+    Generator yang menghasilkan (nomor_halaman, daftar_produk) segera setelah setiap halaman di-parse.
+
+    Dengan `max_workers` > 1 halaman diambil secara paralel (maksimal `per_host_limit`
+    request bersamaan ke host yang sama), namun hasil tetap berurutan sesuai halaman.
+    Berikan `client` (HttpClient) agar seluruh halaman memakai pool koneksi yang sama,
+    dan `cache` (HttpCache) agar halaman yang tidak berubah dilayani dari disk.
+    `parser` memilih backend HTML (lihat parse_collection_cards).
+    Dengan `process_pool=True` parsing dijalankan di `parse_workers` proses (default: jumlah CPU),
+    kecuali crawl kecil (< PROCESS_POOL_MIN_PAGES halaman) yang tetap di-parse di proses ini.
+    Dengan `checkpoint` (CrawlCheckpoint) setiap halaman yang selesai disimpan; jika `resume=True`
+    halaman yang sudah ada di checkpoint tidak diambil ulang, melainkan dibaca dari checkpoint.
+    Halaman yang gagal dicatat di checkpoint (failed_pages) sehingga checkpoint.finish() hanya
+    menghapus checkpoint bila crawl benar-benar lengkap.
+    Dengan `rate_limiter` (AdaptiveRateLimiter) jeda tetap `delay` tidak dipakai lagi: kecepatan
+    request mengikuti limiter. `retry` (RetryPolicy) mengulang kegagalan sementara, dan dengan
+    `skip_failed_pages=True` halaman yang tetap gagal dilewati alih-alih menghentikan crawl.
+    Tanpa `max_pages`, jumlah halaman dibaca dari navigasi pagination halaman 1 (lihat
+    discover_page_count) sehingga seluruh URL bisa dijadwalkan sekaligus; jika tidak terdeteksi,
+    dipakai DEFAULT_MAX_PAGES dan crawl berhenti di halaman kosong pertama.
+    Dengan `archive` (utils.archive.ArchiveRun) bytes setiap halaman yang berhasil diambil
+    disimpan terkompresi di arsip HTML; halaman dari checkpoint memakai objek run sebelumnya
+    (ArchiveRun.record_previous) atau dicatat sebagai 'missing' di manifest. Dengan `replay` (ArchiveRun dari HtmlArchive.open_run)
+    tidak ada request sama sekali: halaman dibaca dari arsip lalu di-parse ulang, dan Timestamp
+    record diisi waktu pengambilan aslinya. Checkpoint tidak dipakai saat replay.
+    """
+    if replay is not None:
+        yield from _iter_replay_pages(replay, start_page, max_pages, parser, process_pool, parse_workers)
+        return
+
+    parse_workers = parse_workers or os.cpu_count() or 1
+
+    fetch_options = {name: value for name, value in (
+        ('client', client), ('cache', cache), ('rate_limiter', rate_limiter), ('retry', retry)
+    ) if value is not None}
+    if rate_limiter is not None:
+        delay = 0
+
+    if checkpoint is not None and not resume:
+        checkpoint.clear()
+
+    first_page = None
+    if max_pages is None:
+        max_pages, first_content = _discover_max_pages(base_url, start_page, fetch_options, checkpoint)
+        if first_content is not None:
+            first_page = (start_page, first_content)
+
+    pages = range(start_page, max_pages + 1)
+    completed = set(checkpoint.completed_pages()) if checkpoint is not None else set()
+    pages_to_fetch = [page_number for page_number in pages if page_number not in completed]
+    if first_page is not None:
+        pages_to_fetch = pages_to_fetch[1:]
+
+    if max_workers > 1:
+        fetched_pages = _iter_pages_concurrent(base_url, pages_to_fetch, delay, max_workers, per_host_limit, fetch_options)
+    else:
+        fetched_pages = _iter_pages_serial(base_url, pages_to_fetch, delay, fetch_options)
+    if first_page is not None:
+        fetched_pages = _with_first_page(first_page, fetched_pages, delay if max_workers <= 1 else 0)
+    if archive is not None:
+        fetched_pages = _archive_pages(fetched_pages, archive, base_url)
+
+    if process_pool and parse_workers > 1 and len(pages_to_fetch) >= PROCESS_POOL_MIN_PAGES:
+        parsed_pages = _parse_in_pool(fetched_pages, parser, parse_workers)
+    else:
+        parsed_pages = _parse_in_process(fetched_pages, parser)
+
+    try:
+        for page_number in pages:
+            if page_number in completed:
+                print(f"Halaman {page_number} sudah ada di checkpoint, tidak diambil ulang")
+                records = checkpoint.load_page(page_number)
+                if archive is not None:
+                    archive.record_previous(page_number)
+                _page_result(page_number, 'checkpoint', records)
+                yield page_number, records
+                continue
+
+            page_number, records = next(parsed_pages, (page_number, _FETCH_FAILED))
+            if records is _FETCH_FAILED:
+                print(f"Gagal mengambil konten untuk halaman {page_number}")
+                _page_result(page_number, 'failed')
+                if checkpoint is not None:
+                    checkpoint.save_failed_page(page_number)
+                if skip_failed_pages:
+                    continue
+                return
+
+            if records is None:
+                print(f"Tidak ada produk yang ditemukan pada halaman {page_number}")
+                _page_result(page_number, 'empty')
+                return
+
+            if checkpoint is not None:
+                checkpoint.save_page(page_number, records)
+            print(f"Selesai scrapping produk dari halaman {page_number}")
+            _page_result(page_number, 'ok', records)
+            yield page_number, records
+    finally:
+        parsed_pages.close()
+        fetched_pages.close()
+
+def iter_scrape(base_url, start_page=1, delay=1, **kwargs):
+    """Generator yang menghasilkan data produk satu per satu; argumen lain sama dengan iter_scrape_pages."""
+    for _, records in iter_scrape_pages(base_url, start_page, delay, **kwargs):
+        yield from records
+
+def scrape_data(base_url, start_page=1, delay=1, **kwargs):
+    """
+    Fungsi utama untuk mengambil keseluruhan data, mulai dari requests hingga menyimpannya dalam variabel data.
+
+    Argumen tambahan (max_workers, client, cache, parser, process_pool, ...) diteruskan ke
+    iter_scrape_pages. Gunakan iter_scrape / iter_scrape_pages untuk memproses data secara streaming.
+    """
+    with get_registry().stage('scrape') as stage:
+        data = list(iter_scrape(base_url, start_page, delay, **kwargs))
+        stage['rows_out'] = len(data)
 
     if not data:
         print("Peringatan: Tidak ada data yang berhasil di-scrape")
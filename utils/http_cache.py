@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = '.http_cache'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+class HttpCache:
+    """
+    On-disk HTTP response cache driven by conditional GET.
+
+    Each cached page is stored as a body file plus its validators (ETag and
+    Last-Modified) in a JSON index. On the next run fetching_content sends
+    If-None-Match / If-Modified-Since and, when the server answers
+    304 Not Modified, the body is served from disk. The total size of the
+    stored bodies is bounded by max_bytes; least recently used entries are
+    evicted first.
+
+    New entries are written to the index as they are stored. Cache hits only
+    update the recency of an entry in memory; call flush() or close() (or use
+    the cache as a context manager) to save it.
+
+    Args:
+        cache_dir: Directory holding the index and the body files
+        max_bytes: Upper bound for the total size of cached bodies
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # True bila indeks di memori berbeda dari index.json (urutan LRU setelah hit)
+        self._dirty = False
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._read_index()
+
+    def _read_index(self) -> Dict[str, dict]:
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_index(self) -> None:
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, path)
+        self._dirty = False
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Validator headers for a conditional GET of url.
+
+        Returns:
+            If-None-Match / If-Modified-Since headers, empty if url is not cached
+        """
+        with self._lock:
+            entry = self._index.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load(self, url: str) -> Optional[bytes]:
+        """
+        Serve a cached body after a 304 response and count it as a hit.
+
+        Returns:
+            Cached body or None if the entry is missing on disk
+        """
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                if self._index.pop(url, None) is not None:
+                    self._dirty = True
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if url in self._index:
+                self._index[url]['last_used'] = time.time()
+                self._dirty = True
+        return content
+
+    def store(self, url: str, content: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        """
+        Save a freshly downloaded body (a miss) together with its validators.
+
+        Responses without any validator are counted but not stored, because
+        they can never be revalidated.
+        """
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                return
+            if len(content) > self.max_bytes:
+                return
+
+            with open(self._body_path(url), 'wb') as f:
+                f.write(content)
+            self._index[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': len(content),
+                'last_used': time.time(),
+            }
+            self._evict()
+            self._write_index()
+
+    def _evict(self) -> None:
+        total = sum(entry['size'] for entry in self._index.values())
+        for url, entry in sorted(self._index.items(), key=lambda item: item[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._body_path(url))
+            except FileNotFoundError:
+                pass
+            total -= entry['size']
+            del self._index[url]
+
+    def flush(self) -> None:
+        """Save the index if entries were used or dropped since it was last written."""
+        with self._lock:
+            if self._dirty:
+                self._write_index()
+
+    def close(self) -> None:
+        """Save pending index changes; the cache stays usable afterwards."""
+        self.flush()
+
+    def __enter__(self) -> 'HttpCache':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def size(self) -> int:
+        """Total size in bytes of the cached bodies."""
+        with self._lock:
+            return sum(entry['size'] for entry in self._index.values())
+
+    def report(self) -> Dict[str, int]:
+        """
+        Hit/miss counters of this run.
+
+        Returns:
+            Dict with hits, misses, cached entry count and cached bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._index),
+                'bytes': sum(entry['size'] for entry in self._index.values()),
+            }
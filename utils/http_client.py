@@ -0,0 +1,78 @@
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+    )
+}
+
+class HttpClient:
+    """
+    Reusable keep-alive HTTP client for the extract stage.
+
+    One client holds a single requests.Session whose adapters keep a pool of
+    open connections per host, so consecutive pages reuse the same TCP/TLS
+    connection instead of handshaking again. Use it as a context manager (or
+    call close()) so the pooled sockets are released at the end of a crawl.
+
+    Args:
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Maximum number of open connections kept per host;
+            should be at least the number of concurrent fetch workers
+        timeout: Timeout in seconds for every request
+        headers: Default request headers, HEADERS if not given
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10,
+                 timeout: float = 30, headers: Optional[Dict[str, str]] = None):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or HEADERS)
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.closed = False
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request through the pooled session."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Connection-reuse statistics of the live connection pools.
+
+        Returns:
+            Dict with the number of requests sent, connections opened and
+            requests served over an already open (reused) connection
+        """
+        requests_sent = 0
+        connections_opened = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+
+        return {
+            'requests': requests_sent,
+            'connections_opened': connections_opened,
+            'connections_reused': max(requests_sent - connections_opened, 0),
+        }
+
+    def close(self) -> None:
+        """Close the session and every pooled connection."""
+        if not self.closed:
+            self.session.close()
+            self.closed = True
+
+    def __enter__(self) -> 'HttpClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
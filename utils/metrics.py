@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+# Batas bucket histogram (detik) untuk latensi HTTP dan durasi per halaman
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS_JSON_FILE = 'metrics.json'
+METRICS_PROMETHEUS_FILE = 'metrics.prom'
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and histograms for one pipeline run.
+
+    Every stage records into the same registry (see get_registry): the
+    extract stage per HTTP request and per page, the transform stage rows in
+    and out and rows dropped per cleaning rule, the load stage a duration
+    and result per sink. At the end of a run write() stores everything as
+    structured JSON and in the Prometheus text exposition format (e.g. for
+    the node_exporter textfile collector). All methods are thread-safe.
+
+    Args:
+        prefix: Prefix of the Prometheus metric names
+    """
+
+    def __init__(self, prefix: str = 'etl'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything recorded so far, e.g. at the start of a run."""
+        with self._lock:
+            self._counters: Dict[str, Dict[Labels, float]] = {}
+            self._gauges: Dict[str, Dict[Labels, float]] = {}
+            self._histograms: Dict[str, Dict[Labels, dict]] = {}
+            self._pages: Dict[int, dict] = {}
+            self._stages: Dict[str, dict] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Add value to a counter."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """Set a gauge."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels) -> None:
+        """Record one observation in a histogram."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = {'buckets': buckets, 'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            index = bisect_left(histogram['buckets'], value)
+            if index < len(histogram['counts']):
+                histogram['counts'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def record_page(self, page_number: int, **fields) -> None:
+        """Merge per-page details (fetch_seconds, parse_seconds, records, result) into the page table."""
+        with self._lock:
+            self._pages.setdefault(page_number, {}).update(fields)
+        for field in ('fetch_seconds', 'parse_seconds'):
+            if field in fields:
+                self.observe(f'scrape_page_{field}', fields[field])
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[dict]:
+        """
+        Time a pipeline stage.
+
+        The yielded dict can be filled with rows_in / rows_out while the stage
+        runs. A stage that raises is recorded with success False.
+        """
+        info = {'rows_in': rows_in, 'rows_out': None, 'success': True}
+        start = time.perf_counter()
+        try:
+            yield info
+        except BaseException:
+            info['success'] = False
+            raise
+        finally:
+            info['seconds'] = time.perf_counter() - start
+            self.record_stage(name, **info)
+
+    def record_stage(self, name: str, seconds: float, success: bool = True,
+                     rows_in: Optional[int] = None, rows_out: Optional[int] = None) -> None:
+        """Store the duration, result and row counts of a stage."""
+        with self._lock:
+            self._stages[name] = {'seconds': seconds, 'success': success, 'rows_in': rows_in, 'rows_out': rows_out}
+        self.set('stage_duration_seconds', seconds, stage=name)
+        self.set('stage_success', int(success), stage=name)
+        if rows_in is not None:
+            self.set('stage_rows_in', rows_in, stage=name)
+        if rows_out is not None:
+            self.set('stage_rows_out', rows_out, stage=name)
+
+    def snapshot(self) -> dict:
+        """Everything recorded so far as a JSON-serializable dict."""
+        def series(metrics):
+            return {name: [{'labels': dict(labels), 'value': value} for labels, value in values.items()]
+                    for name, values in metrics.items()}
+
+        with self._lock:
+            return {
+                'stages': {name: dict(info) for name, info in self._stages.items()},
+                'pages': [{'page': page, **fields} for page, fields in sorted(self._pages.items())],
+                'counters': series(self._counters),
+                'gauges': series(self._gauges),
+                'histograms': {
+                    name: [{
+                        'labels': dict(labels),
+                        'buckets': dict(zip(map(str, histogram['buckets']), histogram['counts'])),
+                        'sum': histogram['sum'],
+                        'count': histogram['count'],
+                    } for labels, histogram in values.items()]
+                    for name, values in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Counters, gauges and histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for kind, metrics in (('counter', self._counters), ('gauge', self._gauges)):
+                for name, values in sorted(metrics.items()):
+                    metric = f'{self.prefix}_{name}'
+                    lines.append(f'# TYPE {metric} {kind}')
+                    for labels, value in sorted(values.items()):
+                        lines.append(f'{metric}{_format_labels(labels)} {_format_value(value)}')
+
+            for name, values in sorted(self._histograms.items()):
+                metric = f'{self.prefix}_{name}'
+                lines.append(f'# TYPE {metric} histogram')
+                for labels, histogram in sorted(values.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram['buckets'], histogram['counts']):
+                        cumulative += count
+                        lines.append(f"{metric}_bucket{_format_labels(labels, (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{metric}_bucket{_format_labels(labels, (('le', '+Inf'),))} {histogram['count']}")
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {_format_value(histogram['sum'])}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {histogram['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: str) -> Tuple[str, str]:
+        """
+        Write metrics.json and metrics.prom into directory.
+
+        Returns:
+            Paths of the JSON and the Prometheus file
+        """
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, METRICS_JSON_FILE)
+        prometheus_path = os.path.join(directory, METRICS_PROMETHEUS_FILE)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        with open(prometheus_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        return json_path, prometheus_path
+
+_registry = MetricsRegistry()
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide registry shared by the extract, transform and load stages."""
+    return _registry
@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import pandas as pd
+
+from utils.changes import FingerprintIndex, delta_frame
+from utils.metrics import get_registry
+from utils.profiling import StageProfiler
+from utils.storage import SCRAPED_DTYPES, TRANSFORMED_DTYPES, write_frame
+from utils.transform import clean_dataframe, finalize_dataframe, print_memo_stats, transform_dataframe
+
+# Sink menerima DataFrame hasil transformasi dan mengembalikan True jika berhasil
+Sink = Callable[[pd.DataFrame], bool]
+
+SCRAPPED_DEBUG_FILE = 'scrapped_data'
+TRANSFORMED_DEBUG_FILE = 'transformed'
+
+# Thread sink yang melewati timeout tetap berjalan (thread Python tidak bisa dibatalkan);
+# dicatat agar sumber daya bersama (mis. engine database) tidak ditutup selagi masih dipakai
+_overrunning_sinks: Dict[str, threading.Thread] = {}
+_overrunning_lock = threading.Lock()
+
+class SinkResult(NamedTuple):
+    success: bool
+    seconds: float
+    error: Optional[str] = None
+
+class PipelineResult(NamedTuple):
+    data: pd.DataFrame
+    sinks: Dict[str, SinkResult]
+    # Jumlah produk new/changed/unchanged/deleted, hanya pada mode incremental
+    changes: Optional[Dict[str, int]] = None
+
+def collect_batches(batches: Iterable) -> pd.DataFrame:
+    """
+    Combine scraped batches (record lists or DataFrames) into one raw frame.
+
+    Args:
+        batches: Iterable of DataFrames or lists of record dicts,
+            e.g. the records of utils.extract.iter_scrape_pages
+
+    Returns:
+        Raw DataFrame, empty if no batch contained data
+    """
+    frames = [batch if isinstance(batch, pd.DataFrame) else pd.DataFrame(batch) for batch in batches]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+def _timed_sink(sink: Sink, data: pd.DataFrame) -> SinkResult:
+    start = time.perf_counter()
+    try:
+        success = bool(sink(data))
+        error = None if success else 'sink melaporkan gagal'
+    except Exception as e:
+        success, error = False, str(e)
+    return SinkResult(success, time.perf_counter() - start, error)
+
+def run_sinks(data: pd.DataFrame, sinks: Dict[str, Sink], timeout: Optional[float] = None,
+              timeouts: Optional[Dict[str, float]] = None) -> Dict[str, SinkResult]:
+    """
+    Run every load sink concurrently on the same in-memory frame.
+
+    The sinks are independent I/O-bound writes, so each one gets its own
+    thread and the load phase takes about as long as the slowest sink.
+    Sinks must treat the frame as read-only. A sink that exceeds its timeout
+    is reported as failed; its thread is a daemon and is left to finish (or
+    die with the process), since Python threads cannot be cancelled. Use
+    wait_for_sinks() before releasing resources such threads may still use.
+
+    Args:
+        data: Transformed data shared by all sinks
+        sinks: Load stages by name
+        timeout: Default timeout in seconds per sink, None to wait forever
+        timeouts: Per-sink timeouts overriding the default
+
+    Returns:
+        SinkResult (success, seconds, error) per sink, in the order of sinks
+    """
+    timeouts = timeouts or {}
+    finished: Dict[str, SinkResult] = {}
+    threads = {}
+    start = time.perf_counter()
+    for name, sink in sinks.items():
+        thread = threading.Thread(
+            target=lambda name=name, sink=sink: finished.__setitem__(name, _timed_sink(sink, data)),
+            name=f'sink-{name}', daemon=True,
+        )
+        thread.start()
+        threads[name] = thread
+
+    metrics = get_registry()
+    results = {}
+    for name, thread in threads.items():
+        limit = timeouts.get(name, timeout)
+        thread.join(None if limit is None else max(limit - (time.perf_counter() - start), 0))
+        # Sink yang selesai sendiri tetapi melewati batasnya (tercatat saat menunggu sink lain) tetap timeout
+        if thread.is_alive() or (limit is not None and finished[name].seconds > limit):
+            results[name] = SinkResult(False, time.perf_counter() - start, f'timeout setelah {limit} detik')
+            if thread.is_alive():
+                with _overrunning_lock:
+                    _overrunning_sinks[name] = thread
+        else:
+            results[name] = finished[name]
+        metrics.set('load_sink_duration_seconds', results[name].seconds, sink=name)
+        metrics.set('load_sink_success', int(results[name].success), sink=name)
+    metrics.record_stage('load', time.perf_counter() - start, success=all(r.success for r in results.values()),
+                         rows_in=len(data))
+    return results
+
+def wait_for_sinks(timeout: Optional[float] = None) -> List[str]:
+    """
+    Wait for sink threads that run_sinks left running after their timeout.
+
+    Args:
+        timeout: Seconds to wait in total, None to wait until all finished
+
+    Returns:
+        Names of the sinks still running afterwards (empty when all finished)
+    """
+    deadline = None if timeout is None else time.perf_counter() + timeout
+    with _overrunning_lock:
+        threads = dict(_overrunning_sinks)
+    for thread in threads.values():
+        thread.join(None if deadline is None else max(deadline - time.perf_counter(), 0))
+    with _overrunning_lock:
+        for name, thread in threads.items():
+            if not thread.is_alive() and _overrunning_sinks.get(name) is thread:
+                del _overrunning_sinks[name]
+        return [name for name, thread in _overrunning_sinks.items() if thread.is_alive()]
+
+def run_pipeline(raw: pd.DataFrame, sinks: Dict[str, Sink], method: str = 'vectorized',
+                 debug_dir: Optional[str] = None, debug_format: str = 'csv',
+                 sink_timeout: Optional[float] = None,
+                 sink_timeouts: Optional[Dict[str, float]] = None,
+                 profiler: Optional[StageProfiler] = None,
+                 change_index: Optional[FingerprintIndex] = None,
+                 detect_deletes: bool = True) -> PipelineResult:
+    """
+    Pass one in-memory frame through the transform stage and every load sink.
+
+    The sinks run concurrently, see run_sinks.
+
+    The stages hand the DataFrame to each other directly; nothing is written
+    to disk unless debug_dir is given, in which case the raw scrape and the
+    transformed data are also saved there for inspection.
+
+    Args:
+        raw: Raw scraped data, e.g. from collect_batches
+        sinks: Load stages by name, e.g.
+            {'csv': lambda df: load_dataframe_to_csv(df, 'products.csv')}
+        method: Cleaning implementation, see utils.transform.clean_dataframe
+        debug_dir: Directory for the intermediate files, None to skip them
+        debug_format: Extension of the intermediate files: 'csv', 'parquet',
+            'feather' or 'arrow' (typed schema, see utils.storage)
+        sink_timeout: Default timeout in seconds per sink
+        sink_timeouts: Per-sink timeouts
+        profiler: Profiles the transform stage and each sink (in its own
+            thread), see utils.profiling.StageProfiler
+        change_index: Incremental mode: after cleaning, products are
+            compared with the fingerprints of the last run and only the
+            delta (new and changed rows plus 'deleted' rows, with
+            product_key and Change columns, see utils.changes) is finished
+            and sent to the sinks. The index is updated only when every
+            sink succeeded.
+        detect_deletes: With change_index, report products missing from
+            raw as deleted; pass False when the scrape is incomplete
+
+    Returns:
+        PipelineResult with the transformed data and a SinkResult per sink
+    """
+    profiler = profiler or StageProfiler()
+    if debug_dir is not None:
+        os.makedirs(debug_dir, exist_ok=True)
+        write_frame(raw, os.path.join(debug_dir, f'{SCRAPPED_DEBUG_FILE}.{debug_format}'), SCRAPED_DTYPES)
+
+    changes = None
+    with get_registry().stage('transform', rows_in=len(raw)) as stage, profiler.stage('transform'):
+        if change_index is None:
+            data = transform_dataframe(raw, verbose=True, method=method)
+        else:
+            changes = change_index.classify(clean_dataframe(raw, verbose=True, method=method),
+                                            detect_deletes=detect_deletes)
+            print(f"Perubahan sejak run sebelumnya: {changes.counts['new']} baru, {changes.counts['changed']} berubah, "
+                  f"{changes.counts['unchanged']} tidak berubah, {changes.counts['deleted']} dihapus")
+            data = delta_frame(finalize_dataframe(changes.updates, verbose=True), changes.deleted)
+        stage['rows_out'] = len(data)
+    print(f"Transformasi data selesai. Data memiliki {len(data)} baris.")
+    if method == 'memoized':
+        print_memo_stats()
+
+    if debug_dir is not None:
+        write_frame(data, os.path.join(debug_dir, f'{TRANSFORMED_DEBUG_FILE}.{debug_format}'), TRANSFORMED_DTYPES)
+
+    sinks = {name: profiler.wrap(f'load {name}', sink) for name, sink in sinks.items()}
+    with profiler.stage('load', cpu=False):
+        sink_results = run_sinks(data, sinks, timeout=sink_timeout, timeouts=sink_timeouts)
+
+    if changes is None:
+        return PipelineResult(data, sink_results)
+    for name, count in changes.counts.items():
+        get_registry().set('products_changed', count, change=name)
+    if all(result.success for result in sink_results.values()):
+        change_index.commit(changes)
+    else:
+        print("Indeks perubahan tidak diperbarui karena ada sink yang gagal; delta dikirim ulang pada run berikutnya")
+    return PipelineResult(data, sink_results, changes.counts)
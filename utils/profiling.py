@@ -0,0 +1,131 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+DEFAULT_PROFILE_DIR = 'profiles'
+DEFAULT_TOP_N = 25
+
+def run_directory(base_dir: str = DEFAULT_PROFILE_DIR) -> str:
+    """New timestamped directory under base_dir for the reports of one run."""
+    path = os.path.join(base_dir, time.strftime('%Y%m%d-%H%M%S'))
+    suffix = 1
+    while os.path.exists(path):
+        suffix += 1
+        path = os.path.join(base_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{suffix}")
+    os.makedirs(path)
+    return path
+
+def _file_stem(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'stage'
+
+class StageProfiler:
+    """
+    Optional cProfile and tracemalloc hooks around pipeline stages.
+
+    For every profiled stage the run directory receives <stage>.pstats
+    (open with pstats or snakeviz), <stage>.txt with the top functions by
+    cumulative time and, with memory=True, <stage>.memory.txt with the top
+    allocation sites and the peak traced memory. A profiler without a
+    run_dir is disabled and its hooks cost nothing.
+
+    cProfile only sees the thread that enabled it, so stages that run in
+    worker threads (the load sinks) are profiled from inside their thread,
+    see wrap(). Python 3.12+ allows one active cProfile at a time; a stage
+    that cannot enable its own profiler runs unprofiled with a note.
+    tracemalloc is process-wide and is owned by the outermost stage that
+    asked for it.
+
+    Args:
+        run_dir: Directory for the reports, None disables profiling
+        memory: Also trace allocations with tracemalloc
+        top_n: Number of functions / allocation sites in the text reports
+    """
+
+    def __init__(self, run_dir: Optional[str] = None, memory: bool = False, top_n: int = DEFAULT_TOP_N):
+        self.run_dir = run_dir
+        self.memory = memory
+        self.top_n = top_n
+        self.reports: List[str] = []
+        if run_dir is not None:
+            os.makedirs(run_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.run_dir is not None
+
+    def _path(self, name: str, extension: str) -> str:
+        return os.path.join(self.run_dir, f'{_file_stem(name)}{extension}')
+
+    def _write(self, path: str, text: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        self.reports.append(path)
+
+    def _write_cpu_report(self, name: str, profile: cProfile.Profile) -> None:
+        pstats_path = self._path(name, '.pstats')
+        profile.dump_stats(pstats_path)
+        self.reports.append(pstats_path)
+
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(self.top_n)
+        self._write(self._path(name, '.txt'), out.getvalue())
+
+    def _write_memory_report(self, name: str, snapshot: tracemalloc.Snapshot, peak: int) -> None:
+        lines = [f'Puncak memori yang dilacak: {peak / 1024 / 1024:.1f} MiB',
+                 f'Top {self.top_n} lokasi alokasi:']
+        for stat in snapshot.statistics('lineno')[:self.top_n]:
+            lines.append(str(stat))
+        self._write(self._path(name, '.memory.txt'), '\n'.join(lines) + '\n')
+
+    @contextmanager
+    def stage(self, name: str, cpu: bool = True) -> Iterator[None]:
+        """
+        Profile the enclosed block as stage name.
+
+        Args:
+            name: Stage name, also the stem of the report files
+            cpu: Run cProfile; False only traces memory (e.g. around worker threads)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        profile = None
+        if cpu:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                print(f"Profiling CPU untuk tahap {name} dilewati: {e}")
+                profile = None
+
+        trace_memory = self.memory and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._write_cpu_report(name, profile)
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self._write_memory_report(name, snapshot, peak)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """func profiled as stage name in whichever thread calls it; func itself when disabled."""
+        if not self.enabled:
+            return func
+
+        def profiled(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return profiled
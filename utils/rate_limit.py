@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+# Status HTTP yang layak dicoba ulang: server sibuk atau sedang bermasalah sementara
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+THROTTLE_STATUSES = (429, 503)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay seconds ('120') or an HTTP date
+
+    Returns:
+        Seconds to wait (never negative) or None if missing/invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket rate limiter whose refill rate follows the server.
+
+    acquire() blocks until a token is available. After every response the
+    caller reports the latency and status through record(): the rate grows
+    additively while responses are fast, shrinks multiplicatively when the
+    latency exceeds target_latency or the server answers 429/503, and a
+    Retry-After header pauses all acquisitions until it has elapsed.
+
+    Args:
+        rate: Initial requests per second
+        burst: Bucket capacity (requests that may start back to back)
+        min_rate: Lower bound for the adapted rate
+        max_rate: Upper bound for the adapted rate
+        target_latency: Latency in seconds above which the rate is reduced
+        increase: Requests per second added after each fast response
+        decrease: Factor applied to the rate on slow or throttled responses
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 1, min_rate: float = 0.2, max_rate: float = 50.0,
+                 target_latency: float = 1.0, increase: float = 0.5, decrease: float = 0.5):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until the next request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def record(self, latency: float, status_code: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        """
+        Adapt the rate to one response.
+
+        Args:
+            latency: Response time in seconds
+            status_code: HTTP status, None for a network error
+            retry_after: Parsed Retry-After header in seconds
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if status_code in THROTTLE_STATUSES or status_code is None or latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+            elif status_code < 400:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+class RetryPolicy:
+    """
+    Retry settings for transient fetch failures.
+
+    Waits follow jittered exponential backoff ("full jitter"): a random
+    duration between 0 and min(backoff_max, backoff_base * 2 ** attempt),
+    but never shorter than the server's Retry-After.
+
+    Args:
+        max_retries: Retries after the first attempt
+        backoff_base: Base delay in seconds
+        backoff_max: Upper bound of a single delay in seconds
+        retry_statuses: HTTP statuses that are retried
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 retry_statuses: Iterable[int] = RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = tuple(retry_statuses)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number attempt + 1."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
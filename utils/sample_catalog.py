@@ -0,0 +1,75 @@
+"""
+HTML katalog sintetis yang meniru halaman fashion-studio.dicoding.dev.
+
+Dipakai bersama oleh unit test (fixture halaman), server stub dan data
+sintetis benchmark, sehingga test tidak bergantung pada paket benchmarks.
+"""
+import random
+
+PRODUCT_TYPES = ['T-shirt', 'Hoodie', 'Pants', 'Outerwear', 'Jacket', 'Shoes', 'Crewneck']
+SIZES = ['S', 'M', 'L', 'XL', 'XXL']
+GENDERS = ['Men', 'Women', 'Unisex']
+
+CARD_TEMPLATE = '''
+        <div class="collection-card">
+            <div style="position: relative;">
+                <img src="https://picsum.photos/280/350?random={number}" class="collection-image" alt="{title}">
+            </div>
+            <div class="product-details">
+                <h3 class="product-title">{title}</h3>
+                <div class="price-container">{price}</div>
+                <p style="font-size: 14px; color: #777;">Rating: ⭐ {rating} / 5</p>
+                <p style="font-size: 14px; color: #777;">{colors} Colors</p>
+                <p style="font-size: 14px; color: #777;">Size: {size}</p>
+                <p style="font-size: 14px; color: #777;">Gender: {gender}</p>
+            </div>
+        </div>'''
+
+PAGE_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Fashion Studio</title>
+</head>
+<body>
+    <div class="container">
+        <div id="collectionList" class="collection-grid">{cards}
+        </div>
+        <ul class="pagination">{pagination}
+        </ul>
+    </div>
+</body>
+</html>
+'''
+
+def render_card(number, rng):
+    """Render satu kartu produk; sebagian kartu sengaja dibuat 'kotor' seperti situs aslinya."""
+    if rng.random() < 0.05:
+        return CARD_TEMPLATE.format(
+            number=number, title='Unknown Product',
+            price='<p class="price">Price Unavailable</p>',
+            rating='Invalid Rating', colors=5, size='M', gender='Men')
+
+    return CARD_TEMPLATE.format(
+        number=number,
+        title=f'{rng.choice(PRODUCT_TYPES)} {number}',
+        price=f'<span class="price">${rng.uniform(10, 500):.2f}</span>',
+        rating='Not Rated' if rng.random() < 0.05 else f'{rng.uniform(1, 5):.1f}',
+        colors=rng.randint(1, 8),
+        size=rng.choice(SIZES),
+        gender=rng.choice(GENDERS))
+
+def render_pagination(page_number, page_count):
+    items = [f'\n            <li class="page-item current"><span class="page-link">Page {page_number} of {page_count}</span></li>']
+    if page_number < page_count:
+        items.append(f'\n            <li class="page-item next"><a class="page-link" href="/page{page_number + 1}">Next</a></li>')
+    return ''.join(items)
+
+def render_page(page_number, page_count=50, products_per_page=20, seed=0):
+    """Render halaman katalog ke-`page_number` secara deterministik (bytes UTF-8)."""
+    rng = random.Random(seed * 100003 + page_number)
+    first = (page_count - page_number + 1) * products_per_page
+    cards = ''.join(render_card(first - i, rng) for i in range(products_per_page))
+    if page_number > page_count:
+        cards = ''
+    return PAGE_TEMPLATE.format(cards=cards, pagination=render_pagination(page_number, page_count)).encode('utf-8')
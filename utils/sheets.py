@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_SNAPSHOT_FILE = '.sheets_snapshot.json'
+# Batas aman per request batchUpdate; payload Sheets API sebaiknya tetap di bawah ~2 MB
+MAX_CELLS_PER_REQUEST = 50_000
+# Kolom yang berubah setiap scraping tanpa perubahan produk; tidak ikut hash baris
+VOLATILE_COLUMNS = ('Timestamp',)
+
+def column_letter(index: int) -> str:
+    """Spreadsheet column name of a 1-based column index (1 -> A, 27 -> AA)."""
+    letters = ''
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+def quote_sheet_name(sheet_name: str) -> str:
+    """Sheet name quoted for A1 notation; on its own it addresses the whole sheet."""
+    return "'" + sheet_name.replace("'", "''") + "'"
+
+def a1_range(sheet_name: str, first_row: int, last_row: int, column_count: int) -> str:
+    """A1 notation for rows first_row..last_row (1-based, inclusive) of the first column_count columns."""
+    return f"{quote_sheet_name(sheet_name)}!A{first_row}:{column_letter(column_count)}{last_row}"
+
+def row_hash(row: Sequence, skip: Sequence[int] = ()) -> str:
+    """SHA-1 of the cell values of a row, leaving out the 0-based column positions in skip."""
+    cells = [value for i, value in enumerate(row) if i not in skip]
+    return hashlib.sha1(json.dumps(cells, default=str).encode('utf-8')).hexdigest()
+
+def changed_row_ranges(old_hashes: List[str], new_hashes: List[str]) -> List[Tuple[int, int]]:
+    """
+    Runs of consecutive rows whose content differs from the snapshot.
+
+    Returns:
+        List of (start, stop) 0-based half-open row index ranges into new_hashes
+    """
+    ranges = []
+    start = None
+    for i, digest in enumerate(new_hashes):
+        changed = i >= len(old_hashes) or old_hashes[i] != digest
+        if changed and start is None:
+            start = i
+        elif not changed and start is not None:
+            ranges.append((start, i))
+            start = None
+    if start is not None:
+        ranges.append((start, len(new_hashes)))
+    return ranges
+
+class SheetsWriter:
+    """
+    Writes a table of values to one sheet with as little traffic as possible.
+
+    The range is sized from the data (and respects sheet_name). A local
+    snapshot keeps a hash per row of the last successful upload, so the next
+    write only sends runs of rows that changed; rows left over from a longer
+    previous upload are cleared. Without a usable snapshot the sheet is
+    cleared and rewritten. Large uploads are split into several
+    values().batchUpdate calls of at most max_cells cells each.
+
+    Columns named in volatile_columns (the header row decides the
+    positions) are left out of the row hashes: the scrape Timestamp changes
+    every run, and hashing it would make every row look changed. A row
+    whose product data is unchanged therefore keeps the Timestamp of the
+    upload that last wrote it.
+
+    The snapshot assumes nobody edits the sheet by hand in between; pass
+    force=True to write() to resend everything.
+
+    Args:
+        service: Google Sheets API service (googleapiclient build('sheets', 'v4'))
+            or any object with the same spreadsheets().values() interface
+        spreadsheet_id: ID of the Google Spreadsheet
+        sheet_name: Name of the sheet to write to
+        snapshot_file: JSON file holding the row hashes, None disables diffing
+        max_cells: Upper bound of cells per batchUpdate request
+        volatile_columns: Header names excluded from the row hashes
+    """
+
+    def __init__(self, service, spreadsheet_id: str, sheet_name: str,
+                 snapshot_file: Optional[str] = DEFAULT_SNAPSHOT_FILE, max_cells: int = MAX_CELLS_PER_REQUEST,
+                 volatile_columns: Sequence[str] = VOLATILE_COLUMNS):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self.snapshot_file = snapshot_file
+        self.max_cells = max_cells
+        self.volatile_columns = list(volatile_columns)
+
+    @property
+    def _snapshot_key(self) -> str:
+        return f"{self.spreadsheet_id}!{self.sheet_name}"
+
+    def _read_snapshots(self) -> Dict[str, dict]:
+        if not self.snapshot_file:
+            return {}
+        try:
+            with open(self.snapshot_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_snapshot(self, snapshot: dict) -> None:
+        if not self.snapshot_file:
+            return
+        snapshots = self._read_snapshots()
+        snapshots[self._snapshot_key] = snapshot
+        tmp_path = f"{self.snapshot_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshots, f)
+        os.replace(tmp_path, self.snapshot_file)
+
+    def _batches(self, values: List[list], ranges: List[Tuple[int, int]], width: int) -> List[List[dict]]:
+        rows_per_block = max(1, self.max_cells // max(width, 1))
+        batches, batch, batch_cells = [], [], 0
+        for start, stop in ranges:
+            for block_start in range(start, stop, rows_per_block):
+                block = values[block_start:min(stop, block_start + rows_per_block)]
+                cells = len(block) * width
+                if batch and batch_cells + cells > self.max_cells:
+                    batches.append(batch)
+                    batch, batch_cells = [], 0
+                batch.append({
+                    'range': a1_range(self.sheet_name, block_start + 1, block_start + len(block), width),
+                    'values': block,
+                })
+                batch_cells += cells
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def write(self, values: List[list], force: bool = False) -> Dict[str, int]:
+        """
+        Upload values (header row first) to the sheet.
+
+        Args:
+            values: Rows of cell values, all of the same width
+            force: Ignore the snapshot and send every row
+
+        Returns:
+            Dict with rows, changed_rows, cleared_rows and requests (API calls made)
+        """
+        width = max((len(row) for row in values), default=0)
+        header = values[0] if values else []
+        skip = {i for i, name in enumerate(header) if name in self.volatile_columns}
+        # Baris header di-hash utuh agar perubahan nama kolom tetap terkirim
+        hashes = [row_hash(row, skip if i else ()) for i, row in enumerate(values)]
+        snapshot = None if force else self._read_snapshots().get(self._snapshot_key)
+        if snapshot is not None and (snapshot.get('width') != width
+                                     or snapshot.get('volatile_columns', []) != self.volatile_columns):
+            snapshot = None
+
+        sheet_values = self.service.spreadsheets().values()
+        requests = 0
+        cleared_rows = 0
+        if snapshot is None:
+            # Tulis ulang penuh: isi lama (panjang/lebarnya tidak diketahui) dihapus dulu
+            sheet_values.batchClear(spreadsheetId=self.spreadsheet_id,
+                                    body={'ranges': [quote_sheet_name(self.sheet_name)]}).execute()
+            requests += 1
+            ranges = [(0, len(values))] if values else []
+        else:
+            old_hashes = snapshot['row_hashes']
+            ranges = changed_row_ranges(old_hashes, hashes)
+            cleared_rows = max(len(old_hashes) - len(values), 0)
+            if cleared_rows:
+                sheet_values.batchClear(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={'ranges': [a1_range(self.sheet_name, len(values) + 1, len(old_hashes), width)]},
+                ).execute()
+                requests += 1
+
+        for data in self._batches(values, ranges, width):
+            sheet_values.batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'valueInputOption': 'RAW', 'data': data},
+            ).execute()
+            requests += 1
+
+        self._save_snapshot({'width': width, 'volatile_columns': self.volatile_columns, 'row_hashes': hashes})
+        return {
+            'rows': len(values),
+            'changed_rows': sum(stop - start for start, stop in ranges),
+            'cleared_rows': cleared_rows,
+            'requests': requests,
+        }
@@ -0,0 +1,134 @@
+import os
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Skema eksplisit artefak antar tahap. Hasil scraping masih berupa teks mentah;
+# hasil transformasi sudah bertipe sehingga pembaca tidak perlu menebak dtype lagi.
+SCRAPED_DTYPES = {
+    'Title': object,
+    'Price': object,
+    'Rating': object,
+    'Color': object,
+    'Size': object,
+    'Gender': object,
+    'Timestamp': object,
+}
+TRANSFORMED_DTYPES = {
+    'Title': object,
+    'Price': 'float64',
+    'Rating': 'float64',
+    'Color': pd.Int64Dtype(),
+    'Size': 'category',
+    'Gender': 'category',
+    'Timestamp': 'datetime64[ns]',
+}
+
+# Format Timestamp hasil scraping (milidetik); dipakai untuk setiap kolom datetime di CSV
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+def format_timestamps(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Datetime columns of df as text in the scraper's millisecond format, NaT stays missing.
+
+    pandas' to_csv picks the sub-second precision per frame, so a frame whose
+    timestamps all have zero milliseconds would be written without them;
+    formatting explicitly makes every CSV (and every chunk) look the same.
+    """
+    columns = [column for column in df.columns if pd.api.types.is_datetime64_any_dtype(df[column])]
+    if not columns:
+        return df
+    df = df.copy(deep=False)
+    for column in columns:
+        df[column] = df[column].dt.strftime(TIMESTAMP_FORMAT).str[:-3]
+    return df
+
+# Format ditentukan dari ekstensi file
+FILE_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
+def file_format(path: str) -> str:
+    """
+    Storage format of path, derived from its extension.
+
+    Raises:
+        ValueError: If the extension is not one of FILE_FORMATS
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(f"Format file tidak dikenal: {path} (pilihan: {', '.join(FILE_FORMATS)})")
+    return FILE_FORMATS[extension]
+
+def apply_dtypes(df: pd.DataFrame, dtypes: Dict[str, object]) -> pd.DataFrame:
+    """
+    Cast the columns of df that appear in dtypes; other columns are kept as they are.
+
+    Args:
+        df: Data to cast
+        dtypes: Column name to pandas dtype, e.g. TRANSFORMED_DTYPES
+
+    Returns:
+        Cast copy of df
+    """
+    casts = {column: dtype for column, dtype in dtypes.items()
+             if column in df.columns and df[column].dtype != dtype}
+    return df.astype(casts) if casts else df
+
+def read_frame(path: str, dtypes: Optional[Dict[str, object]] = None) -> pd.DataFrame:
+    """
+    Read a stage artifact written by write_frame.
+
+    CSV columns listed in dtypes are read with that dtype (datetime columns
+    are parsed like transform does, invalid values become NaT); other
+    columns use pandas' type inference. Parquet and Arrow IPC (Feather)
+    files carry their schema, so only dtypes that the file format cannot
+    express exactly are re-applied from dtypes. Either way the frame has
+    the same types whatever format the artifact was stored in.
+
+    Args:
+        path: .csv, .parquet, .feather or .arrow file
+        dtypes: Expected schema of the artifact, e.g. SCRAPED_DTYPES
+
+    Returns:
+        DataFrame read from path
+    """
+    fmt = file_format(path)
+    if fmt == 'csv':
+        if not dtypes:
+            return pd.read_csv(path)
+        dates = [column for column, dtype in dtypes.items() if pd.api.types.is_datetime64_any_dtype(dtype)]
+        df = pd.read_csv(path, dtype={column: dtype for column, dtype in dtypes.items() if column not in dates})
+        for column in dates:
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column], errors='coerce')
+        return df
+    df = pd.read_parquet(path) if fmt == 'parquet' else pd.read_feather(path)
+    return apply_dtypes(df, dtypes) if dtypes else df
+
+def write_frame(df: pd.DataFrame, path: str, dtypes: Optional[Dict[str, object]] = None) -> None:
+    """
+    Write a stage artifact; the format follows the file extension.
+
+    For Parquet and Arrow IPC the frame is first cast to dtypes, so the file
+    holds the explicit schema (e.g. float Price, Int64 Color, categorical
+    Size, datetime Timestamp) instead of untyped text.
+
+    Args:
+        df: Data to write
+        path: .csv, .parquet, .feather or .arrow file
+        dtypes: Schema to store, e.g. TRANSFORMED_DTYPES (ignored for CSV)
+    """
+    fmt = file_format(path)
+    if fmt == 'csv':
+        format_timestamps(df).to_csv(path, index=False)
+        return
+    if dtypes:
+        df = apply_dtypes(df, dtypes)
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(path)
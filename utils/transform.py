@@ -1,6 +1,31 @@
+import csv
+import functools
+import heapq
+import os
+import shutil
+import tempfile
+import numpy as np
 import pandas as pd
 import re
-from typing import Optional
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from utils.metrics import get_registry
+from utils.storage import SCRAPED_DTYPES, TRANSFORMED_DTYPES, file_format, format_timestamps, read_frame, write_frame
+
+USD_TO_IDR = 16000
+
+# Angka ASCII yang diterima float(): desimal, notasi ilmiah, inf/infinity dan nan
+FLOAT_PATTERN = r'[+-]?(?:\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?|inf(?:inity)?|nan)'
+# Nilai yang tidak ditangani cleaner vectorized secara identik: karakter di luar ASCII tercetak
+# (digit unicode '٣'/'１', spasi unicode, karakter kontrol) dan '_' (float('1_000')).
+# Nilai seperti ini dibersihkan dengan fungsi skalar sebagai acuan.
+SCALAR_FALLBACK_PATTERN = r'[^\x20-\x7e]|_'
+
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = 'string[pyarrow]'
+except ImportError:
+    TEXT_DTYPE = 'string[python]'
 
 def clean_price(price: str) -> Optional[float]:
     """
@@ -18,7 +43,7 @@ def clean_price(price: str) -> Optional[float]:
             
         if isinstance(price, str) and '$' in price:
             usd_price = float(price.replace('$', '').strip())
-            idr_price = usd_price * 16000
+            idr_price = usd_price * USD_TO_IDR
             return idr_price
         else:
             return None
@@ -116,54 +141,604 @@ def clean_gender(gender: str) -> Optional[str]:
     except Exception:
         return None
 
-def transform_data(input_file: str, output_file: str) -> bool:
+def _as_text(series: pd.Series) -> pd.Series:
+    """
+    String view of a column for the .str accessor.
+
+    Uses the Arrow-backed string dtype when pyarrow is installed, so the .str
+    methods run as compiled Arrow kernels instead of a Python loop. Values that
+    are not strings become missing, matching the scalar cleaners, which return
+    None for any non-string value.
+    """
+    if pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+        series = series.where(series.map(lambda value: isinstance(value, str)), None)
+    return series.astype(TEXT_DTYPE)
+
+def _flags(mask: pd.Series):
+    """Nullable boolean result of a .str method as a numpy mask; missing counts as False."""
+    return mask.fillna(False).to_numpy(dtype=bool)
+
+def _to_float(text: pd.Series) -> pd.Series:
+    """Parse a stripped string column like float(); NaN where float() would raise."""
+    valid = _flags(text.str.fullmatch(FLOAT_PATTERN, case=False))
+    return text.where(valid).astype(float)
+
+def _to_object(text: pd.Series) -> pd.Series:
+    """Back to a plain object column with None for missing values, like Series.apply returns."""
+    return text.astype(object).where(text.notna(), None)
+
+def _split_fallback(values: pd.Series):
+    """
+    Text view of values with the rows matching SCALAR_FALLBACK_PATTERN masked out.
+
+    Returns:
+        (text, numpy mask of the rows to clean with the scalar function)
+    """
+    text = _as_text(values)
+    fallback = _flags(text.str.contains(SCALAR_FALLBACK_PATTERN))
+    return (text.mask(fallback) if fallback.any() else text), fallback
+
+def _fill_fallback(result: pd.Series, values: pd.Series, fallback, scalar) -> pd.Series:
+    """Put the scalar cleaner's result for the fallback rows into the vectorized result."""
+    if not fallback.any():
+        return result
+    result = result.copy()
+    result[fallback] = values[fallback].map(scalar).astype(result.dtype).array
+    return result
+
+def clean_price_series(prices: pd.Series) -> pd.Series:
+    """
+    Vectorized clean_price: convert a whole column of USD prices to IDR.
+
+    Args:
+        prices: Raw price column, e.g. '$100.00' or 'Price Unavailable'
+
+    Returns:
+        Float column with the price in IDR, NaN where clean_price returns None
+    """
+    text, fallback = _split_fallback(prices)
+    has_dollar = _flags(text.str.contains('$', regex=False))
+    usd_price = _to_float(text.str.replace('$', '', regex=False).str.strip())
+    return _fill_fallback((usd_price * USD_TO_IDR).where(has_dollar), prices, fallback, clean_price)
+
+def clean_rating_series(ratings: pd.Series) -> pd.Series:
+    """
+    Vectorized clean_rating.
+
+    Args:
+        ratings: Raw rating column, e.g. '4.8', '4.8 / 5' or 'Invalid Rating'
+
+    Returns:
+        Float column, NaN where clean_rating returns None
+    """
+    text, fallback = _split_fallback(ratings)
+    invalid = (_flags(text.str.contains('Invalid Rating', regex=False))
+               | _flags(text.str.contains('Not Rated', regex=False))
+               | _flags(text.eq('Price Unavailable')))
+    value = text.str.replace(r'/[\s\S]*', '', regex=True).str.strip()
+    return _fill_fallback(_to_float(value).mask(invalid), ratings, fallback, clean_rating)
+
+def clean_colors_series(colors: pd.Series) -> pd.Series:
+    """
+    Vectorized clean_colors.
+
+    Args:
+        colors: Raw color column, e.g. '3 Colors'
+
+    Returns:
+        Nullable Int64 column with the number of colors
+    """
+    text, fallback = _split_fallback(colors)
+    count = text.str.extract(r'(\d+)\s*Colors?', expand=False)
+    return _fill_fallback(count.astype(pd.Int64Dtype()), colors, fallback, clean_colors)
+
+def _strip_prefix_series(values: pd.Series, prefix: str, scalar) -> pd.Series:
+    text, fallback = _split_fallback(values)
+    stripped = text.str.strip()
+    prefixed = _flags(stripped.str.startswith(prefix))
+    result = _to_object(stripped.mask(prefixed, stripped.str.replace(prefix, '', regex=False).str.strip()))
+    return _fill_fallback(result, values, fallback, scalar)
+
+def clean_size_series(sizes: pd.Series) -> pd.Series:
+    """
+    Vectorized clean_size.
+
+    Args:
+        sizes: Raw size column, e.g. 'Size: M' or ' M'
+
+    Returns:
+        Object column with the cleaned size, missing where clean_size returns None
+    """
+    return _strip_prefix_series(sizes, 'Size:', clean_size)
+
+def clean_gender_series(genders: pd.Series) -> pd.Series:
+    """
+    Vectorized clean_gender.
+
+    Args:
+        genders: Raw gender column, e.g. 'Gender: Men' or ' Men'
+
+    Returns:
+        Object column with the cleaned gender, missing where clean_gender returns None
+    """
+    return _strip_prefix_series(genders, 'Gender:', clean_gender)
+
+# Jumlah nilai mentah berbeda yang diingat per kolom (LRU); kolom seperti Size/Gender/Color
+# hanya punya beberapa nilai, Price/Rating bisa ribuan
+DEFAULT_MEMO_SIZE = 4096
+
+class MemoizedCleaner:
+    """
+    Column cleaner that runs a scalar clean_* function once per distinct raw value.
+
+    The column is factorized into codes and its unique values; only the
+    unique values are cleaned, through a bounded LRU memo that is kept
+    between calls, and the results are mapped back with the codes. Raw
+    values seen in an earlier batch or chunk are not parsed again.
+
+    Cell statistics: a cell is a hit when it did not cause a call to the
+    scalar function (a repeat inside the column or a memo hit), a miss when
+    its value had to be parsed. They are also counted in the metrics
+    registry as transform_memo_cells_total{column, result}.
+
+    Args:
+        column: Column name used in the statistics and metrics
+        func: Scalar cleaner, e.g. clean_size
+        dtype: dtype of the cleaned column, None keeps an object column
+        maxsize: Number of distinct raw values remembered
+    """
+
+    def __init__(self, column: str, func: Callable, dtype: Optional[str] = None,
+                 maxsize: int = DEFAULT_MEMO_SIZE):
+        self.column = column
+        self.func = func
+        self.dtype = dtype
+        self.maxsize = maxsize
+        self._cached = functools.lru_cache(maxsize=maxsize, typed=True)(func)
+        self._lock = threading.Lock()
+        self.cells = 0
+        self.unique = 0
+        self.parsed = 0
+
+    def __call__(self, values: pd.Series) -> pd.Series:
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        misses = self._cached.cache_info().misses
+        # Satu elemen None di akhir: kode -1 (nilai kosong) menunjuk ke sana, seperti clean_* mengembalikan None
+        cleaned = np.empty(len(uniques) + 1, dtype=object)
+        cleaned[:-1] = [self._cached(value) for value in uniques]
+        cleaned[-1] = None
+        parsed = self._cached.cache_info().misses - misses
+        with self._lock:
+            self.cells += len(codes)
+            self.unique += len(uniques)
+            self.parsed += parsed
+
+        metrics = get_registry()
+        metrics.inc('transform_memo_cells_total', len(codes) - parsed, column=self.column, result='hit')
+        metrics.inc('transform_memo_cells_total', parsed, column=self.column, result='miss')
+
+        result = pd.Series(cleaned[codes], index=values.index, name=values.name)
+        return result if self.dtype is None else result.astype(self.dtype)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict with cells, unique (distinct values per call, summed), parsed
+            (scalar cleaner calls), memo_size and hit_rate (share of cells
+            that were not parsed)
+        """
+        with self._lock:
+            cells, unique, parsed = self.cells, self.unique, self.parsed
+        return {
+            'cells': cells,
+            'unique': unique,
+            'parsed': parsed,
+            'memo_size': self._cached.cache_info().currsize,
+            'hit_rate': (cells - parsed) / cells if cells else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Forget the memo and reset the statistics."""
+        self._cached.cache_clear()
+        with self._lock:
+            self.cells = self.unique = self.parsed = 0
+
+MEMOIZED_CLEANERS = {
+    'Price': MemoizedCleaner('Price', clean_price, dtype='float64'),
+    'Rating': MemoizedCleaner('Rating', clean_rating, dtype='float64'),
+    'Color': MemoizedCleaner('Color', clean_colors, dtype=pd.Int64Dtype()),
+    'Size': MemoizedCleaner('Size', clean_size),
+    'Gender': MemoizedCleaner('Gender', clean_gender),
+}
+
+def memo_stats() -> Dict[str, Dict[str, float]]:
+    """Statistics of the 'memoized' cleaning method per column, see MemoizedCleaner.stats."""
+    return {column: cleaner.stats() for column, cleaner in MEMOIZED_CLEANERS.items()}
+
+def clear_memo() -> None:
+    """Empty the memo of every column of the 'memoized' cleaning method."""
+    for cleaner in MEMOIZED_CLEANERS.values():
+        cleaner.clear()
+
+def print_memo_stats() -> None:
+    """Print the cell hit rate of every memoized column."""
+    for column, stats in memo_stats().items():
+        print(f"Memo {column}: {stats['cells']} sel, {stats['parsed']} di-parse, "
+              f"hit rate {stats['hit_rate']:.1%}, {stats['memo_size']} nilai tersimpan")
+
+# Pembersih per kolom: 'reference' memakai fungsi skalar di atas lewat Series.apply
+# (dipertahankan sebagai acuan uji paritas), 'vectorized' memakai accessor .str pandas.
+CLEANING_METHODS = {
+    'reference': {
+        'Price': lambda column: column.apply(clean_price),
+        'Rating': lambda column: column.apply(clean_rating),
+        'Color': lambda column: column.apply(clean_colors).astype(pd.Int64Dtype()),
+        'Size': lambda column: column.apply(clean_size),
+        'Gender': lambda column: column.apply(clean_gender),
+    },
+    'vectorized': {
+        'Price': clean_price_series,
+        'Rating': clean_rating_series,
+        'Color': clean_colors_series,
+        'Size': clean_size_series,
+        'Gender': clean_gender_series,
+    },
+    # 'memoized' memakai fungsi skalar sekali per nilai mentah berbeda (lihat MemoizedCleaner)
+    'memoized': MEMOIZED_CLEANERS,
+}
+
+REQUIRED_COLUMNS = ['Title', 'Price', 'Rating', 'Color', 'Size', 'Gender']
+
+def clean_dataframe(df: pd.DataFrame, verbose: bool = False, method: str = 'vectorized') -> pd.DataFrame:
     """
+    Apply the row-level cleaning steps to a raw scrape frame.
+
+    Every step only looks at a single row, so the function can be applied to
+    the whole scrape or to each streamed batch independently. Deduplication
+    and Timestamp ordering are not done here.
+
+    Args:
+        df: Raw scraped data
+        verbose: Print a progress message for every step
+        method: 'vectorized' (pandas .str accessors), 'reference'
+            (row-wise apply of the scalar clean_* functions) or 'memoized'
+            (scalar functions once per distinct raw value, see MemoizedCleaner)
+
+    Returns:
+        Cleaned DataFrame without invalid titles and rows with missing values
+    """
+    log = print if verbose else (lambda message: None)
+    cleaners = CLEANING_METHODS[method]
+    df = df.copy(deep=False)
+
+    log("Mengubah nilai harga menjadi Rupiah")
+    df['Price'] = cleaners['Price'](df['Price'])
+    
+    log("Mengubah nilai rating menjadi format desimal")
+    df['Rating'] = cleaners['Rating'](df['Rating'])
+    
+    log("Mengubah jumlah warna menjadi angka")
+    df['Color'] = cleaners['Color'](df['Color'])
+    
+    log("Membersihkan nilai ukuran")
+    df['Size'] = cleaners['Size'](df['Size'])
+    
+    log("Membersihkan nilai gender")
+    df['Gender'] = cleaners['Gender'](df['Gender'])
+    
+    metrics = get_registry()
+
+    log("Menghapus baris dengan judul tidak valid")
+    valid_title = ~df['Title'].isin(['Unknown Product', '']) & ~df['Title'].isna()
+    metrics.inc('transform_rows_dropped_total', int((~valid_title).sum()), rule='invalid_title')
+    df = df[valid_title]
+    
+    log("Menghapus baris dengan nilai kosong di kolom penting")
+    # Setiap baris yang dibuang dihitung pada kolom penting pertama yang kosong
+    missing = df[REQUIRED_COLUMNS].isna()
+    counted = np.zeros(len(df), dtype=bool)
+    for column in REQUIRED_COLUMNS:
+        dropped = missing[column].to_numpy() & ~counted
+        metrics.inc('transform_rows_dropped_total', int(dropped.sum()), rule=f'missing_{column}')
+        counted |= dropped
+    df = df[~counted]
+
+    return df
+
+class RowHashIndex:
+    """
+    Set of 64-bit row hashes kept as one sorted uint64 array.
+
+    Costs 8 bytes per distinct row, where a Python set of ints needs about
+    70. Lookups are binary searches; the sorted new hashes of a batch are
+    inserted at their search positions in one linear pass.
+    """
+
+    def __init__(self):
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    @property
+    def nbytes(self) -> int:
+        return self._hashes.nbytes
+
+    def add_new(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Add the hashes that are not in the index yet.
+
+        Args:
+            hashes: uint64 row hashes of one batch
+
+        Returns:
+            Boolean mask of the hashes that were new: not in the index and
+            the first occurrence within hashes
+        """
+        is_new = ~pd.Series(hashes).duplicated().to_numpy()
+        # Pencarian dengan kunci terurut jauh lebih ramah cache daripada urutan acak
+        order = np.argsort(hashes, kind='stable')
+        ordered = hashes[order]
+        positions = np.searchsorted(self._hashes, ordered)
+        if len(self._hashes):
+            found = np.zeros(len(hashes), dtype=bool)
+            found[order] = self._hashes[np.minimum(positions, len(self._hashes) - 1)] == ordered
+            is_new &= ~found
+        inserted = is_new[order]
+        self._hashes = np.insert(self._hashes, positions[inserted], ordered[inserted])
+        return is_new
+
+def drop_seen_duplicates(df: pd.DataFrame, seen: RowHashIndex) -> pd.DataFrame:
+    """
+    Drop rows already present in this frame or in earlier frames of a stream.
+
+    Args:
+        df: Cleaned batch
+        seen: Hashes of the rows kept so far; updated in place
+
+    Returns:
+        Rows of df that were not seen before, in their original order
+    """
+    is_new = seen.add_new(pd.util.hash_pandas_object(df, index=False).to_numpy())
+    get_registry().inc('transform_rows_dropped_total', int((~is_new).sum()), rule='duplicate')
+    return df[is_new]
+
+def iter_transform_batches(batches: Iterable) -> Iterator[pd.DataFrame]:
+    """
+    Clean a stream of scraped batches (e.g. from utils.extract.iter_scrape_pages).
+
+    Each batch is cleaned as soon as it arrives and rows already seen in an
+    earlier batch are dropped, so memory stays flat no matter how many pages
+    are crawled. The global Timestamp ordering of transform_data is not
+    applied; batches keep their arrival order.
+
+    Args:
+        batches: Iterable of DataFrames or lists of record dicts
+
+    Yields:
+        Cleaned, deduplicated DataFrame per non-empty batch
+    """
+    seen = RowHashIndex()
+    for batch in batches:
+        df = batch if isinstance(batch, pd.DataFrame) else pd.DataFrame(batch)
+        if df.empty:
+            continue
+
+        df = drop_seen_duplicates(clean_dataframe(df), seen)
+        if 'Timestamp' in df.columns:
+            df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
+        if not df.empty:
+            yield df
+
+# Kunci urut run: nanodetik Timestamp yang dinegasikan (urutan menurun), NaT paling akhir
+SORT_KEY_COLUMN = '_sort_key'
+NAT_SORT_KEY = np.iinfo(np.int64).max
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_MERGE_FAN_IN = 64
+
+def _timestamp_sort_key(timestamps: pd.Series) -> np.ndarray:
+    nanoseconds = timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    return np.where(timestamps.isna().to_numpy(), NAT_SORT_KEY, -nanoseconds)
+
+def _write_sorted_run(df: pd.DataFrame, path: str) -> None:
+    """Sort one cleaned chunk by Timestamp (newest first) and spill it to disk with its sort key."""
+    run = df.copy(deep=False)
+    run.insert(0, SORT_KEY_COLUMN, _timestamp_sort_key(df['Timestamp']))
+    format_timestamps(run.sort_values(SORT_KEY_COLUMN, kind='stable')).to_csv(path, index=False)
+
+def _merge_runs(run_files: List[str], output_file: str, keep_sort_key: bool) -> int:
+    """
+    k-way merge of sorted run files with heapq.merge, one row per run in memory.
+
+    heapq.merge is stable, so rows with the same Timestamp keep the order in
+    which they appeared in the input.
+
+    Returns:
+        Number of rows written
+    """
+    files = [open(path, newline='', encoding='utf-8') for path in run_files]
+    try:
+        readers = [csv.reader(f) for f in files]
+        header = [next(reader) for reader in readers][0]
+        start = 0 if keep_sort_key else 1
+        row_count = 0
+        with open(output_file, 'w', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out, lineterminator=os.linesep)
+            writer.writerow(header[start:])
+            for row in heapq.merge(*readers, key=lambda row: int(row[0])):
+                writer.writerow(row[start:])
+                row_count += 1
+        return row_count
+    finally:
+        for f in files:
+            f.close()
+
+def external_sort_runs(run_files: List[str], output_file: str, temp_dir: str,
+                       fan_in: int = DEFAULT_MERGE_FAN_IN) -> int:
+    """
+    Merge sorted runs into output_file, in several passes if there are more
+    than fan_in runs so the number of open files stays bounded.
+
+    Args:
+        run_files: Run files written by _write_sorted_run
+        output_file: Final CSV without the sort key column
+        temp_dir: Directory for the intermediate runs
+        fan_in: Maximum number of runs merged at once
+
+    Returns:
+        Number of rows written
+    """
+    merge_pass = 0
+    while len(run_files) > fan_in:
+        merged = []
+        for i in range(0, len(run_files), fan_in):
+            path = os.path.join(temp_dir, f'merge-{merge_pass}-{i // fan_in}.csv')
+            _merge_runs(run_files[i:i + fan_in], path, keep_sort_key=True)
+            merged.append(path)
+        for path in run_files:
+            os.remove(path)
+        run_files = merged
+        merge_pass += 1
+    return _merge_runs(run_files, output_file, keep_sort_key=False)
+
+def transform_csv_chunked(input_file: str, output_file: str, method: str = 'vectorized',
+                          chunksize: int = DEFAULT_CHUNKSIZE, temp_dir: Optional[str] = None,
+                          fan_in: int = DEFAULT_MERGE_FAN_IN) -> int:
+    """
+    Out-of-core version of transform_data for scrapes larger than memory.
+
+    The input is read with read_csv(chunksize=...) and every chunk is cleaned
+    on its own. Duplicates are dropped through an incremental index of row
+    hashes (RowHashIndex, 8 bytes per distinct row instead of the rows
+    themselves). When the data has a Timestamp column each chunk is sorted
+    and spilled to a temporary run file, and the runs are combined with an
+    external merge sort, so only one chunk plus one row per run is held in
+    memory. The columns are read with SCRAPED_DTYPES like the in-memory
+    transform_data: a chunk that happens to contain only numeric-looking
+    ratings must be cleaned the same as any other chunk and as the whole file.
+
     Args:
         input_file: Path to input CSV file
         output_file: Path to output CSV file
+        method: Cleaning implementation, see clean_dataframe
+        chunksize: Rows per chunk
+        temp_dir: Parent directory for the sorted runs (default: system temp dir)
+        fan_in: Maximum number of runs merged at once
+
+    Returns:
+        Number of rows written to output_file
+    """
+    if file_format(input_file) != 'csv' or file_format(output_file) != 'csv':
+        raise ValueError("Mode chunked hanya mendukung file CSV")
+
+    seen = RowHashIndex()
+    run_dir = tempfile.mkdtemp(prefix='transform-runs-', dir=temp_dir)
+    try:
+        run_files: List[str] = []
+        columns = None
+        row_count = 0
+        for chunk in pd.read_csv(input_file, chunksize=chunksize, dtype=SCRAPED_DTYPES):
+            columns = chunk.columns
+            df = drop_seen_duplicates(clean_dataframe(chunk, method=method), seen)
+            if 'Timestamp' not in df.columns:
+                # Tanpa Timestamp tidak ada pengurutan: chunk langsung ditulis ke output
+                df.to_csv(output_file, mode='w' if row_count == 0 else 'a', header=row_count == 0, index=False)
+                row_count += len(df)
+                continue
+            if df.empty:
+                continue
+            df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
+            path = os.path.join(run_dir, f'run-{len(run_files)}.csv')
+            _write_sorted_run(df, path)
+            run_files.append(path)
+
+        if run_files:
+            return external_sort_runs(run_files, output_file, run_dir, fan_in)
+        if row_count == 0:
+            pd.DataFrame(columns=columns).to_csv(output_file, index=False)
+        return row_count
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+def finalize_dataframe(df: pd.DataFrame, verbose: bool = False) -> pd.DataFrame:
+    """
+    Frame-level transform steps after clean_dataframe: deduplicate and order by Timestamp.
+
+    Args:
+        df: Cleaned data
+        verbose: Print a progress message for every step
+
+    Returns:
+        Deduplicated DataFrame, newest Timestamp first
+    """
+    log = print if verbose else (lambda message: None)
+
+    log("Menghapus data produk yang duplikat")
+    row_count = len(df)
+    df = df.drop_duplicates()
+    get_registry().inc('transform_rows_dropped_total', row_count - len(df), rule='duplicate')
+    
+    if 'Timestamp' in df.columns:
+        log("Mengubah tipe kolom Timestamp menjadi datetime")
+        df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
+        df = df.sort_values('Timestamp', ascending=False)
+
+    return df
+
+def transform_dataframe(df: pd.DataFrame, verbose: bool = False, method: str = 'vectorized') -> pd.DataFrame:
+    """
+    In-memory transform stage: clean, deduplicate and order by Timestamp.
+
+    This is what transform_data does between reading and writing the CSV, so
+    a pipeline can pass the scraped frame straight to the load stage without
+    a CSV round-trip.
+
+    Args:
+        df: Raw scraped data
+        verbose: Print a progress message for every step
+        method: Cleaning implementation, see clean_dataframe
+
+    Returns:
+        Transformed DataFrame, newest Timestamp first
+    """
+    return finalize_dataframe(clean_dataframe(df, verbose=verbose, method=method), verbose=verbose)
+
+def transform_data(input_file: str, output_file: str, method: str = 'vectorized',
+                   chunksize: Optional[int] = None) -> bool:
+    """
+    Args:
+        input_file: Path to input file (.csv, .parquet, .feather or .arrow)
+        output_file: Path to output file; Parquet/Arrow outputs are written
+            with the typed schema utils.storage.TRANSFORMED_DTYPES
+        method: Cleaning implementation, see clean_dataframe
+        chunksize: Process the file in chunks of this many rows with bounded
+            memory (see transform_csv_chunked, CSV only); None loads the whole file
         
     Returns:
         True if transformation was successful, False otherwise
     """
     try:
+        if chunksize:
+            print(f"Membaca data dari {input_file} per {chunksize} baris")
+            with get_registry().stage('transform') as stage:
+                row_count = transform_csv_chunked(input_file, output_file, method=method, chunksize=chunksize)
+                stage['rows_out'] = row_count
+            if method == 'memoized':
+                print_memo_stats()
+            print(f"Transformasi data selesai. File output memiliki {row_count} baris.")
+            return True
+
         print(f"Membaca data dari {input_file}")
-        df = pd.read_csv(input_file)
-        
-        print("Mengubah nilai harga menjadi Rupiah")
-        df['Price'] = df['Price'].apply(clean_price)
+        df = read_frame(input_file, SCRAPED_DTYPES)
         
-        print("Mengubah nilai rating menjadi format desimal")
-        df['Rating'] = df['Rating'].apply(clean_rating)
-        
-        print("Mengubah jumlah warna menjadi angka")
-        df['Color'] = df['Color'].apply(clean_colors)
-        
-        print("Mengubah tipe kolom Color menjadi integer")
-        df['Color'] = df['Color'].astype(pd.Int64Dtype())
-        
-        print("Membersihkan nilai ukuran")
-        df['Size'] = df['Size'].apply(clean_size)
-        
-        print("Membersihkan nilai gender")
-        df['Gender'] = df['Gender'].apply(clean_gender)
-        
-        print("Menghapus baris dengan judul tidak valid")
-        df = df[~df['Title'].isin(['Unknown Product', '']) & ~df['Title'].isna()]
-        
-        print("Menghapus baris dengan nilai kosong di kolom penting")
-        required_columns = ['Title', 'Price', 'Rating', 'Color', 'Size', 'Gender']
-        df = df.dropna(subset=required_columns)
-        
-        print("Menghapus data produk yang duplikat")
-        df = df.drop_duplicates()
-        
-        if 'Timestamp' in df.columns:
-            print("Mengubah tipe kolom Timestamp menjadi datetime")
-            df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
-            df = df.sort_values('Timestamp', ascending=False)
+        with get_registry().stage('transform', rows_in=len(df)) as stage:
+            df = transform_dataframe(df, verbose=True, method=method)
+            stage['rows_out'] = len(df)
+        if method == 'memoized':
+            print_memo_stats()
         
         print(f"Menyimpan data yang telah ditransformasi ke {output_file}")
-        df.to_csv(output_file, index=False)
+        write_frame(df, output_file, TRANSFORMED_DTYPES)
         
         row_count = len(df)
         print(f"Transformasi data selesai. File output memiliki {row_count} baris.")